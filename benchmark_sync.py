@@ -0,0 +1,341 @@
+"""
+Benchmark the hourly callsign auto-sync against offline stand-ins.
+
+Runs CallsignCog.auto_sync_loop over synthetic rosters with Google Sheets
+replaced by fake_sheets.FakeSpreadsheet, Bloxlink/Roblox by a local
+fake_bloxlink.FakeBloxlinkServer and Discord by in-memory guild/member
+objects, and reports API call counts and wall time per pass:
+
+    cold     first full pass: Bloxlink cache refresh, sheets filled from empty
+    full     full reconcile with a warm cache after some roster drift
+    partial  dirty-member pass after drift on a few members
+    idle     nothing changed (the pass should be skipped)
+
+The database is real: point --database-url (or BENCHMARK_DATABASE_URL) at an
+EMPTY scratch Postgres that has the bot's tables. The script refuses to run if
+the callsigns table holds anything but its own synthetic rows.
+
+    python benchmark_sync.py --sizes 100 1000 5000 --latency 0.05 --rate-limit-ratio 0.02
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from fake_bloxlink import FakeBloxlinkServer, fake_roblox_id, fake_roblox_username
+from fake_sheets import FakeSpreadsheet
+
+# Discord IDs owned by the benchmark (far beyond any real snowflake, still a bigint)
+SYNTHETIC_ID_BASE = 8_000_000_000_000_000_000
+BENCHMARK_GUILD_ID = 7_000_000_000_000_000_001
+BENCHMARK_BOT_ID = 7_000_000_000_000_000_002
+
+COMMAND_RATIO = 0.1
+NAUGHTY_RATIO = 0.02
+ABSENT_RATIO = 0.01  # Rows whose member has left the guild
+
+
+# === FAKE DISCORD ===
+class FakeRole:
+    def __init__(self, role_id: int, name: str = ''):
+        self.id = role_id
+        self.name = name or str(role_id)
+
+    def is_default(self) -> bool:
+        return False
+
+
+class FakePermissions:
+    administrator = False
+
+
+class FakeMember:
+    guild_permissions = FakePermissions()
+
+    def __init__(self, guild: "FakeGuild", user_id: int, name: str, roles: list, nick: str = None):
+        self.guild = guild
+        self.id = user_id
+        self.name = name
+        self.roles = roles
+        self.nick = nick
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def display_name(self) -> str:
+        return self.nick or self.name
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    async def edit(self, *, reason: str = None, **changes):
+        self.guild.edits += 1
+        if self.guild.latency:
+            await asyncio.sleep(self.guild.latency)
+        if 'nick' in changes:
+            self.nick = changes['nick']
+        if 'roles' in changes:
+            self.roles = list(changes['roles'])
+
+
+class FakeGuild:
+    def __init__(self, latency: float = 0.0):
+        self.id = BENCHMARK_GUILD_ID
+        self.name = "Benchmark Guild"
+        self.latency = latency
+        self.edits = 0
+        self._members = {}
+        self._roles = {}
+
+    @property
+    def members(self) -> list:
+        return list(self._members.values())
+
+    def get_member(self, user_id: int):
+        return self._members.get(user_id)
+
+    def get_role(self, role_id: int):
+        return self._roles.setdefault(role_id, FakeRole(role_id))
+
+    def add_member(self, member: FakeMember):
+        self._members[member.id] = member
+
+
+class FakeUser:
+    id = BENCHMARK_BOT_ID
+
+
+class FakeBot:
+    def __init__(self, guild: FakeGuild):
+        self.guilds = [guild]
+        self.user = FakeUser()
+
+    def get_channel(self, channel_id: int):
+        return None  # Sync log embeds are skipped
+
+
+# === BENCHMARK ===
+class SyncBenchmark:
+    def __init__(self, args):
+        self.args = args
+        self.results = []
+        self.server = FakeBloxlinkServer(latency=args.latency, rate_limit_ratio=args.rate_limit_ratio,
+                                         unlinked_ratio=args.unlinked_ratio, seed=args.seed)
+
+    async def setup(self):
+        await self.server.start()
+        # Module-level config in cogs.callsign is read at import time
+        os.environ['DATABASE_URL'] = self.database_url
+        os.environ['BLOXLINK_API_KEY'] = 'benchmark'
+        os.environ['BLOXLINK_API_BASE'] = self.server.bloxlink_base
+        os.environ['ROBLOX_USERS_API'] = self.server.roblox_base
+
+        global db, callsign, sheets_manager, sync_tracker, bloxlink_limiter, TokenBucket
+        from database import db
+        from cogs import callsign
+        from google_sheets_integration import sheets_manager
+        from sync_tracker import sync_tracker
+        from bloxlink_limiter import bloxlink_limiter, TokenBucket
+
+        if not await db.connect():
+            raise SystemExit("❌ Could not connect to the benchmark database")
+
+        async with db.pool.acquire() as conn:
+            foreign = await conn.fetchval('SELECT COUNT(*) FROM callsigns WHERE discord_user_id < $1',
+                                          SYNTHETIC_ID_BASE)
+        if foreign:
+            raise SystemExit(f"❌ callsigns has {foreign} non-benchmark rows - use an empty scratch database")
+
+        # Bloxlink budget for the fake server (the real limit is 50/minute)
+        bloxlink_limiter._seeded = True
+        bloxlink_limiter.minute = TokenBucket(self.args.bloxlink_rpm / 6, self.args.bloxlink_rpm / 60)
+
+    @property
+    def database_url(self) -> str:
+        return self.args.database_url or os.getenv('BENCHMARK_DATABASE_URL')
+
+    async def cleanup(self):
+        async with db.pool.acquire() as conn:
+            for table in ('callsigns', 'bloxlink_cache', 'naughty_roles'):
+                await conn.execute(f'DELETE FROM {table} WHERE discord_user_id >= $1', SYNTHETIC_ID_BASE)
+            await conn.execute("DELETE FROM bot_config WHERE config_key = 'bloxlink_sync'")
+
+    async def teardown(self):
+        if db.pool:
+            await self.cleanup()
+            await db.close()
+        await self.server.stop()
+
+    # === ROSTER ===
+    def build_roster(self, size: int, guild: FakeGuild, rng: random.Random) -> list:
+        """Members in the guild plus their callsigns rows (nicknames already in sync)"""
+        non_command = [(role_id, prefix) for role_id, (_, prefix, _) in callsign.NON_COMMAND_RANKS.items()]
+        command = [(role_id, prefix) for role_id, (_, prefix) in callsign.COMMAND_RANKS.items()]
+        naughty = list(callsign.NAUGHTY_ROLES.items())
+        next_number = Counter()
+        rows = []
+
+        for i in range(size):
+            user_id = SYNTHETIC_ID_BASE + i
+            role_id, prefix = rng.choice(command if rng.random() < COMMAND_RATIO else non_command)
+            next_number[prefix] += 1
+            number = str(next_number[prefix])
+            roblox_id = fake_roblox_id(user_id)
+            roblox_username = fake_roblox_username(roblox_id) if self.server.is_linked(user_id) else f"user{i}"
+            name = f"member{i}"
+
+            roles = [FakeRole(role_id)]
+            if rng.random() < NAUGHTY_RATIO:
+                roles.append(FakeRole(*rng.choice(naughty)))
+
+            if rng.random() >= ABSENT_RATIO:
+                nick = callsign.format_nickname(prefix, number, '', roblox_username)
+                guild.add_member(FakeMember(guild, user_id, name, roles, nick))
+
+            rows.append((number, user_id, name, str(roblox_id), roblox_username, prefix, '',
+                         BENCHMARK_BOT_ID, 'Benchmark', '[]'))
+        return rows
+
+    async def seed(self, rows: list):
+        await self.cleanup()
+        async with db.pool.acquire() as conn:
+            await conn.executemany(
+                '''INSERT INTO callsigns
+                   (callsign, discord_user_id, discord_username, roblox_user_id, roblox_username,
+                    fenz_prefix, hhstj_prefix, approved_by_id, approved_by_name, callsign_history)
+                   VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)''',
+                rows
+            )
+
+    def drift(self, guild: FakeGuild, count: int, rng: random.Random) -> set:
+        """Promote or rename `count` members, as role/nick edits between passes would"""
+        promotions = {'RFF': 'QFF', 'QFF': 'SFF'}
+        role_for = {prefix: role_id for role_id, (_, prefix) in callsign.FENZ_RANK_MAP.items()}
+        changed = set()
+        for member in rng.sample(guild.members, min(count, len(guild.members))):
+            prefix = callsign.get_fenz_prefix_from_roles(member.roles)
+            if prefix in promotions and rng.random() < 0.5:
+                member.roles = [r for r in member.roles if r.id != role_for[prefix]] + \
+                               [FakeRole(role_for[promotions[prefix]])]
+            else:
+                member.nick = f"stale{member.id % 10_000}"
+            changed.add(member.id)
+        return changed
+
+    # === PASSES ===
+    async def run_pass(self, size: int, label: str, cog, guild: FakeGuild, spreadsheet: FakeSpreadsheet):
+        spreadsheet.reset_counters()
+        self.server.reset_counters()
+        guild.edits = 0
+
+        output = contextlib.nullcontext() if self.args.verbose else contextlib.redirect_stdout(io.StringIO())
+        started = time.perf_counter()
+        with output:
+            await cog.auto_sync_loop()
+        elapsed = time.perf_counter() - started
+
+        self.results.append({
+            'size': size,
+            'pass': label,
+            'seconds': elapsed,
+            'sheets': spreadsheet.total_calls,
+            'sheets_detail': dict(spreadsheet.calls),
+            'sheet_requests': sum(spreadsheet.requests.values()),
+            'bloxlink': self.server.requests['bloxlink'],
+            'bloxlink_429': self.server.requests['bloxlink_429'],
+            'roblox': self.server.requests['roblox_user'] + self.server.requests['roblox_users_batch'],
+            'discord_edits': guild.edits,
+        })
+        print(f"   ✅ {label:<8} {elapsed:8.2f}s  sheets={spreadsheet.total_calls}  "
+              f"bloxlink={self.server.requests['bloxlink']}  edits={guild.edits}")
+
+    async def run_size(self, size: int):
+        print(f"\n📊 Roster of {size} members")
+        rng = random.Random(self.args.seed + size)
+
+        guild = FakeGuild(latency=self.args.discord_latency)
+        spreadsheet = FakeSpreadsheet.callsign_template(latency=self.args.sheets_latency)
+        sheets_manager.client = sheets_manager.spreadsheet = spreadsheet
+        sheets_manager._cached_validations, sheets_manager._validations_loaded = {}, False
+        sheets_manager._last_rows = {}
+
+        await self.seed(self.build_roster(size, guild, rng))
+        cog = callsign.CallsignCog(FakeBot(guild))
+        drift_count = max(1, int(size * self.args.drift))
+
+        sync_tracker.take()
+        sync_tracker.request_full('benchmark: cold pass')
+        await self.run_pass(size, 'cold', cog, guild, spreadsheet)
+
+        self.drift(guild, drift_count, rng)
+        sync_tracker.request_full('benchmark: full pass')
+        await self.run_pass(size, 'full', cog, guild, spreadsheet)
+
+        sync_tracker.mark(*self.drift(guild, drift_count, rng))
+        await self.run_pass(size, 'partial', cog, guild, spreadsheet)
+
+        await self.run_pass(size, 'idle', cog, guild, spreadsheet)
+
+    def report(self):
+        print(f"\n{'=' * 96}")
+        print(f"{'Roster':>7} {'Pass':<8} {'Wall (s)':>9} {'Sheets':>7} {'Sheet reqs':>11} "
+              f"{'Bloxlink':>9} {'429s':>5} {'Roblox':>7} {'Discord':>8}")
+        print(f"{'-' * 96}")
+        for r in self.results:
+            print(f"{r['size']:>7} {r['pass']:<8} {r['seconds']:>9.2f} {r['sheets']:>7} {r['sheet_requests']:>11} "
+                  f"{r['bloxlink']:>9} {r['bloxlink_429']:>5} {r['roblox']:>7} {r['discord_edits']:>8}")
+        print(f"{'=' * 96}")
+        if self.args.verbose:
+            for r in self.results:
+                print(f"{r['size']:>7} {r['pass']:<8} {r['sheets_detail']}")
+
+    async def run(self):
+        await self.setup()
+        try:
+            for size in self.args.sizes:
+                await self.run_size(size)
+        finally:
+            await self.teardown()
+        self.report()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the callsign auto-sync against offline fakes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000], help="Roster sizes")
+    parser.add_argument('--database-url', help="Scratch Postgres URL (default: $BENCHMARK_DATABASE_URL)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Fake Bloxlink/Roblox latency (s)")
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help="Fraction of Bloxlink calls that 429")
+    parser.add_argument('--unlinked-ratio', type=float, default=0.02, help="Fraction of members without Roblox")
+    parser.add_argument('--sheets-latency', type=float, default=0.0, help="Fake Sheets latency per call (s)")
+    parser.add_argument('--discord-latency', type=float, default=0.0, help="Fake member.edit latency (s)")
+    parser.add_argument('--bloxlink-rpm', type=float, default=6000, help="Limiter rate for the fake server")
+    parser.add_argument('--drift', type=float, default=0.01, help="Fraction of members changed between passes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="Show sync output and per-call breakdown")
+    return parser.parse_args(argv)
+
+
+async def main():
+    args = parse_args()
+    if not (args.database_url or os.getenv('BENCHMARK_DATABASE_URL')):
+        print("❌ Set --database-url or BENCHMARK_DATABASE_URL to an empty scratch database")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    await SyncBenchmark(args).run()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
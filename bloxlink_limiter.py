@@ -0,0 +1,194 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Mapping, Optional
+
+from database import db
+from metrics import metrics
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+BLOXLINK_REQUESTS_PER_MINUTE = 50
+BLOXLINK_BURST = 5
+BLOXLINK_DAILY_QUOTA = 500
+LIMITER_CHECKPOINT_SECONDS = 60
+
+BLOXLINK_LIMITER_WAIT_SECONDS = metrics.histogram('bloxlink_limiter_wait_seconds',
+                                                  'Time spent waiting for a Bloxlink request slot')
+
+
+class TokenBucket:
+    """Classic token bucket: capacity tokens, refilled continuously at rate per second"""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float = None) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def pause_until(self, until: float):
+        """Drain the bucket so nothing is issued before `until` (monotonic)"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, -(until - now) * self.rate + 1)
+
+
+class BloxlinkLimiter:
+    """
+    Process-wide limiter for Bloxlink API calls.
+
+    A per-minute token bucket smooths request bursts, and a daily bucket
+    (refilled all at once when the quota window resets) tracks the API key's
+    daily quota. The daily count is seeded from bloxlink_api_usage on first
+    use and checkpointed back periodically, and X-RateLimit-* headers from
+    each response correct both buckets. Every Bloxlink request must acquire().
+    """
+
+    def __init__(self, per_minute: int = BLOXLINK_REQUESTS_PER_MINUTE, burst: int = BLOXLINK_BURST,
+                 daily_quota: int = BLOXLINK_DAILY_QUOTA):
+        self.minute = TokenBucket(burst, per_minute / 60)
+        self.daily_limit = daily_quota
+        self.daily_used = 0
+        self.reset_at: Optional[datetime] = None  # Naive UTC
+        self.remaining_header: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._seeded = False
+        self._dirty = False
+
+    # === QUOTA WINDOW ===
+    def _roll_window(self):
+        now = datetime.utcnow()
+        if self.reset_at is None:
+            self.reset_at = now + timedelta(days=1)
+        elif now >= self.reset_at:
+            logger.info("✅ Bloxlink quota window reset - restoring daily budget")
+            self.daily_used = 0
+            self.remaining_header = None
+            self.reset_at = now + timedelta(days=1)
+            self._dirty = True
+
+    @property
+    def daily_remaining(self) -> int:
+        self._roll_window()
+        return max(0, self.daily_limit - self.daily_used)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.daily_remaining <= 0
+
+    @property
+    def reset_timestamp(self) -> Optional[float]:
+        """Quota reset as a Unix timestamp (for <t:...> formatting)"""
+        if self.reset_at is None:
+            return None
+        return (self.reset_at - datetime(1970, 1, 1)).total_seconds()
+
+    async def seed(self):
+        """Load today's usage from the database (once per process)"""
+        if self._seeded or not db.pool:
+            return
+        self._seeded = True
+        try:
+            usage = await db.get_api_usage()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load Bloxlink API usage: {e}")
+            return
+
+        self.daily_used = max(self.daily_used, usage.get('calls') or 0)
+        reset_time = usage.get('reset_time')
+        if reset_time and reset_time > datetime.utcnow():
+            self.reset_at = reset_time
+        logger.info(f"📊 Bloxlink quota seeded: {self.daily_used}/{self.daily_limit} used today")
+
+    async def checkpoint(self):
+        """Persist the daily count if it changed since the last checkpoint"""
+        if not self._dirty or not db.pool:
+            return
+        self._dirty = False
+        try:
+            await db.set_api_usage(self.daily_used, self.reset_at)
+        except Exception as e:
+            self._dirty = True
+            logger.warning(f"⚠️ Could not checkpoint Bloxlink API usage: {e}")
+
+    # === ACQUIRE ===
+    async def acquire(self) -> bool:
+        """
+        Wait for a request slot and count it against the daily quota.
+        Returns False (without waiting) if the daily quota is exhausted.
+        """
+        await self.seed()
+        started = time.monotonic()
+
+        async with self._lock:
+            while True:
+                if self.exhausted:
+                    return False
+                wait = self.minute.delay()
+                if wait <= 0:
+                    break
+                if wait >= 5:
+                    logger.warning(f"⏸️ Hit rate limit ceiling, waiting {wait:.1f}s...")
+                await asyncio.sleep(wait)
+
+            self.minute.take()
+            self.daily_used += 1
+            self._dirty = True
+
+        BLOXLINK_LIMITER_WAIT_SECONDS.observe(time.monotonic() - started)
+        return True
+
+    def record_response(self, status: int, headers: Mapping[str, str]):
+        """Adjust the buckets from a response's X-RateLimit-* / Retry-After headers"""
+        try:
+            if 'X-RateLimit-Limit' in headers:
+                self.daily_limit = int(headers['X-RateLimit-Limit'])
+            if 'X-RateLimit-Remaining' in headers:
+                self.remaining_header = int(headers['X-RateLimit-Remaining'])
+                # The server's count is authoritative (other keys' users, other processes)
+                self.daily_used = max(0, self.daily_limit - self.remaining_header)
+                self._dirty = True
+            if 'X-RateLimit-Reset' in headers:
+                self.reset_at = datetime.utcfromtimestamp(int(float(headers['X-RateLimit-Reset'])))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring malformed Bloxlink rate limit headers: {e}")
+
+        if status == 429:
+            retry_after = headers.get('Retry-After')
+            try:
+                delay = float(retry_after) if retry_after else 2.0
+            except ValueError:
+                delay = 2.0
+            self.minute.pause_until(time.monotonic() + delay)
+
+    def stats(self) -> Dict:
+        return {
+            'used': self.daily_used,
+            'limit': self.daily_limit,
+            'remaining': self.daily_remaining,
+            'remaining_header': self.remaining_header,
+            'reset_at': self.reset_at,
+            'exhausted': self.exhausted,
+            'minute_tokens': round(self.minute.tokens, 2),
+        }
+
+
+# === GLOBAL BLOXLINK LIMITER INSTANCE ===
+bloxlink_limiter = BloxlinkLimiter()
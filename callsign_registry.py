@@ -0,0 +1,196 @@
+import asyncio
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from database import db
+from metrics import metrics
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+CALLSIGN_MIN = 1
+CALLSIGN_MAX = 999  # Callsigns are 1-3 digits
+NON_UNIQUE_CALLSIGNS = ("BLANK", "Not Assigned")
+
+CALLSIGN_REGISTRY_ENTRIES = metrics.gauge('callsign_registry_entries', 'Unique callsigns held in the registry')
+
+
+def normalize_callsign(callsign: str) -> str:
+    """
+    Normalize callsign by stripping leading zeros
+    Examples: '01' -> '1', '001' -> '1', '10' -> '10', '100' -> '100'
+    Returns normalized callsign or original if not numeric
+    """
+    if not callsign or not callsign.isdigit():
+        return callsign
+
+    # Convert to int and back to string to strip leading zeros
+    # This preserves '10' and '100' while converting '01' to '1'
+    return str(int(callsign))
+
+
+class IntervalSet:
+    """Sorted, disjoint [start, end] ranges of taken numbers"""
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+
+    def __contains__(self, number: int) -> bool:
+        i = bisect_right(self.starts, number) - 1
+        return i >= 0 and number <= self.ends[i]
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+    def add(self, number: int):
+        i = bisect_right(self.starts, number) - 1
+        if i >= 0 and number <= self.ends[i]:
+            return
+
+        joins_left = i >= 0 and self.ends[i] == number - 1
+        joins_right = i + 1 < len(self.starts) and self.starts[i + 1] == number + 1
+        if joins_left and joins_right:
+            self.ends[i] = self.ends[i + 1]
+            del self.starts[i + 1], self.ends[i + 1]
+        elif joins_left:
+            self.ends[i] = number
+        elif joins_right:
+            self.starts[i + 1] = number
+        else:
+            self.starts.insert(i + 1, number)
+            self.ends.insert(i + 1, number)
+
+    def discard(self, number: int):
+        i = bisect_right(self.starts, number) - 1
+        if i < 0 or number > self.ends[i]:
+            return
+
+        start, end = self.starts[i], self.ends[i]
+        if start == end:
+            del self.starts[i], self.ends[i]
+        elif number == start:
+            self.starts[i] = number + 1
+        elif number == end:
+            self.ends[i] = number - 1
+        else:
+            self.ends[i] = number - 1
+            self.starts.insert(i + 1, number + 1)
+            self.ends.insert(i + 1, end)
+
+    def free(self, low: int, high: int, count: int = 1) -> List[int]:
+        """Up to `count` numbers in [low, high] not in the set, lowest first"""
+        found = []
+        candidate = low
+        i = max(0, bisect_right(self.starts, low) - 1)
+        while candidate <= high and len(found) < count:
+            if i < len(self.starts) and self.starts[i] <= candidate:
+                candidate = max(candidate, self.ends[i] + 1)
+                i += 1
+                continue
+            gap_end = min(high, self.starts[i] - 1) if i < len(self.starts) else high
+            take = min(count - len(found), gap_end - candidate + 1)
+            found.extend(range(candidate, candidate + take))
+            candidate = gap_end + 1
+        return found
+
+
+class CallsignRegistry:
+    """
+    In-memory index of assigned callsigns, keyed by (fenz_prefix, normalized callsign).
+
+    Loaded once from the callsigns table and updated by every write path in
+    the callsign cog, so collision checks and "next free number" lookups
+    never touch the database. BLANK / Not Assigned are not unique and are
+    not tracked. The database stays authoritative: add_callsign_to_database
+    still checks for conflicts inside its transaction.
+    """
+
+    def __init__(self):
+        self._owners: Dict[Tuple[str, str], int] = {}
+        self._by_user: Dict[int, Tuple[str, str]] = {}
+        self._taken: Dict[str, IntervalSet] = {}
+        self._lock = asyncio.Lock()
+        self.loaded = False
+
+    @staticmethod
+    def key(fenz_prefix: Optional[str], callsign: str) -> Tuple[str, str]:
+        return (fenz_prefix or '', normalize_callsign(callsign))
+
+    # === LOADING ===
+    async def ensure_loaded(self):
+        """Load the registry from the database on first use"""
+        if self.loaded:
+            return
+        async with self._lock:
+            if self.loaded:
+                return
+            async with db.pool.acquire() as conn:
+                rows = await conn.fetch('SELECT discord_user_id, callsign, fenz_prefix FROM callsigns')
+            self.rebuild(rows)
+            logger.info(f"✅ Callsign registry loaded: {len(self._owners)} unique callsigns")
+
+    def rebuild(self, rows: Iterable[Mapping]):
+        """Replace the registry contents with the given callsigns rows"""
+        self._owners.clear()
+        self._by_user.clear()
+        self._taken.clear()
+        for row in rows:
+            self._add(row['discord_user_id'], row['fenz_prefix'], row['callsign'])
+        self.loaded = True
+        CALLSIGN_REGISTRY_ENTRIES.set(len(self._owners))
+
+    def invalidate(self):
+        """Force a reload on next use (after a failed or out-of-band write)"""
+        self.loaded = False
+
+    # === WRITES ===
+    def _add(self, discord_user_id: int, fenz_prefix: Optional[str], callsign: Optional[str]):
+        if not callsign or callsign in NON_UNIQUE_CALLSIGNS:
+            return
+        key = self.key(fenz_prefix, callsign)
+        self._owners[key] = discord_user_id
+        self._by_user[discord_user_id] = key
+        if key[1].isdigit():
+            self._taken.setdefault(key[0], IntervalSet()).add(int(key[1]))
+
+    def release(self, discord_user_id: int):
+        """Forget a user's callsign (row deleted or reset to Not Assigned)"""
+        key = self._by_user.pop(discord_user_id, None)
+        if key is None:
+            return
+        if self._owners.get(key) == discord_user_id:
+            del self._owners[key]
+            if key[1].isdigit() and key[0] in self._taken:
+                self._taken[key[0]].discard(int(key[1]))
+        CALLSIGN_REGISTRY_ENTRIES.set(len(self._owners))
+
+    def assign(self, discord_user_id: int, fenz_prefix: Optional[str], callsign: Optional[str]):
+        """Record a user's current callsign, replacing any previous one"""
+        self.release(discord_user_id)
+        self._add(discord_user_id, fenz_prefix, callsign)
+        CALLSIGN_REGISTRY_ENTRIES.set(len(self._owners))
+
+    # === READS ===
+    def owner(self, fenz_prefix: Optional[str], callsign: str) -> Optional[int]:
+        """Discord ID holding this prefix/callsign, or None if it is free"""
+        return self._owners.get(self.key(fenz_prefix, callsign))
+
+    def next_free(self, fenz_prefix: Optional[str], low: int = CALLSIGN_MIN, high: int = CALLSIGN_MAX,
+                  count: int = 1) -> List[str]:
+        """Lowest unassigned callsign numbers for a prefix within [low, high]"""
+        taken = self._taken.get(fenz_prefix or '')
+        if taken is None:
+            return [str(n) for n in range(low, min(high, low + count - 1) + 1)]
+        return [str(n) for n in taken.free(low, high, count)]
+
+    def stats(self) -> Dict:
+        return {
+            'loaded': self.loaded,
+            'entries': len(self._owners),
+            'prefixes': {prefix: len(taken) for prefix, taken in self._taken.items()},
+        }
+
+
+# === GLOBAL CALLSIGN REGISTRY INSTANCE ===
+callsign_registry = CallsignRegistry()
@@ -2,6 +2,10 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+queue_logger = logger.child('queue')  # Per-message events, sampled
 
 # ============================
 # CONFIGURATION
@@ -72,13 +76,13 @@ class AutoPublishCog(commands.Cog):
     async def cog_load(self):
         """Start the background task when cog loads"""
         self.processing_task = asyncio.create_task(self.process_publish_queue())
-        print("<:Accepted:1426930333789585509> Auto-Publish: Started background processing task")
+        logger.info("<:Accepted:1426930333789585509> Auto-Publish: Started background processing task")
 
     def cog_unload(self):
         """Stop the background task when cog unloads"""
         if self.processing_task:
             self.processing_task.cancel()
-        print("🛑 Auto-Publish: Stopped background processing task")
+        logger.info("🛑 Auto-Publish: Stopped background processing task")
 
     async def process_publish_queue(self):
         """Background task to process the publish queue with rate limiting"""
@@ -88,14 +92,16 @@ class AutoPublishCog(commands.Cog):
 
                 try:
                     await message.publish()
-                    print(f"📢 Auto-Published message in #{message.channel.name} (ID: {message.id})")
+                    queue_logger.info(f"📢 Auto-Published message in #{message.channel.name} (ID: {message.id})",
+                                      guild=message.guild)
                 except discord.HTTPException as e:
                     if e.code == 50033:  # Invalid Form Body (already published)
-                        print(f"ℹ️ Message {message.id} already published")
+                        queue_logger.info(f"ℹ️ Message {message.id} already published", guild=message.guild)
                     else:
-                        print(f"<:Denied:1426930694633816248> Failed to publish message {message.id}: {e}")
+                        logger.error(f"<:Denied:1426930694633816248> Failed to publish message {message.id}: {e}",
+                                     guild=message.guild)
                 except Exception as e:
-                    print(f"<:Denied:1426930694633816248> Unexpected error publishing message {message.id}: {e}")
+                    logger.error(f"<:Denied:1426930694633816248> Unexpected error publishing message {message.id}: {e}")
 
                 # Rate limit: wait 1 second between publishes to avoid hitting Discord limits
                 await asyncio.sleep(1)
@@ -103,7 +109,7 @@ class AutoPublishCog(commands.Cog):
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                print(f"<:Denied:1426930694633816248> Error in publish queue processor: {e}")
+                logger.error(f"<:Denied:1426930694633816248> Error in publish queue processor: {e}")
                 await asyncio.sleep(5)  # Wait before retrying
 
     def is_error_message(self, message: discord.Message) -> bool:
@@ -158,7 +164,8 @@ class AutoPublishCog(commands.Cog):
         """Listen for new messages in log channels"""
         if self.should_publish(message):
             await self.publish_queue.put(message)
-            print(f"📝 Queued message for publishing in #{message.channel.name}")
+            queue_logger.info(f"📝 Queued message for publishing in #{message.channel.name}",
+                              guild=message.guild, user=message.author)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
@@ -169,7 +176,8 @@ class AutoPublishCog(commands.Cog):
         # Only process if the message wasn't already published
         if not before.flags.crossposted and self.should_publish(after):
             await self.publish_queue.put(after)
-            print(f"📝 Queued edited message for publishing in #{after.channel.name}")
+            queue_logger.info(f"📝 Queued edited message for publishing in #{after.channel.name}",
+                              guild=after.guild, user=after.author)
 
     # Admin commands for managing auto-publish
 
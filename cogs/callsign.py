@@ -1,18 +1,37 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
 import aiohttp
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from database import db
+from scheduler import scheduler
+from member_edits import member_edits
+from bloxlink_limiter import bloxlink_limiter, LIMITER_CHECKPOINT_SECONDS
+from callsign_registry import callsign_registry, normalize_callsign, CALLSIGN_MIN
 from dataclasses import dataclass
-from typing import Optional, Dict, Set, Tuple
+from typing import Optional, Dict, List, Set, Tuple
 import json
-from google_sheets_integration import sheets_manager, COMMAND_RANKS, NON_COMMAND_RANKS
+from google_sheets_integration import (sheets_manager, COMMAND_RANKS, NON_COMMAND_RANKS, STRIKES_ROLES,
+                                       QUALIFICATIONS_ROLES)
+from sync_tracker import sync_tracker
 import asyncio
 import functools
+import contextlib
+import time
 from asyncpg.exceptions import PostgresError
+from metrics import metrics
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+progress_logger = logger.child('progress')  # Bulk Bloxlink progress, sampled
+
+BLOXLINK_LOOKUPS = metrics.counter('bloxlink_lookups_total', 'Bloxlink lookups by source and result',
+                                   ['source', 'result'])
+BLOXLINK_REQUEST_SECONDS = metrics.histogram('bloxlink_request_seconds', 'Bloxlink HTTP request latency',
+                                             ['status'])
+BLOXLINK_QUOTA = metrics.gauge('bloxlink_quota', 'Bloxlink daily quota tracking', ['kind'])
 
 
 @dataclass
@@ -46,6 +65,23 @@ class BotConfig:
 config = BotConfig()
 
 BLOXLINK_API_KEY = os.getenv('BLOXLINK_API_KEY')
+# Overridable so benchmarks can point the bot at a local stand-in (fake_bloxlink.py)
+BLOXLINK_API_BASE = os.getenv('BLOXLINK_API_BASE', "https://api.blox.link/v4/public")
+ROBLOX_USERS_API = os.getenv('ROBLOX_USERS_API', "https://users.roblox.com/v1")
+BLOXLINK_FETCH_CONCURRENCY = 4  # Requests in flight during bulk checks (still bounded by bloxlink_limiter)
+ROBLOX_USERS_BATCH_SIZE = 100  # Max IDs per POST /v1/users
+
+# bloxlink_cache freshness per status; anything else (errors) gets the error TTL
+BLOXLINK_CACHE_TTLS = {'success': 86400, 'not_linked': 6 * 3600}
+BLOXLINK_ERROR_TTL_SECONDS = 600
+BLOXLINK_STALE_SECONDS = 7 * 86400  # Expired success/not_linked rows are still served this long
+BLOXLINK_REVALIDATE_INTERVAL_SECONDS = 900
+BLOXLINK_REVALIDATE_RESERVE = 50  # Daily calls kept back from background revalidation
+BLOXLINK_REVALIDATE_DAILY_BUDGET = 100  # Proactive refreshes per UTC day, whatever the roster size
+
+CALLSIGN_SEARCH_LIMIT = 25  # Also Discord's autocomplete option limit
+CALLSIGN_LOOKUP_FALLBACK_RESULTS = 3
+CALLSIGN_AUTOCOMPLETE_TIMEOUT_MS = 800  # Discord drops autocomplete responses after 3s
 
 SYNC_LOG_CHANNEL_ID = 1434770430505390221
 CALLSIGN_REQUEST_LOG_CHANNEL_ID = 1435318020619632851
@@ -144,6 +180,20 @@ HHSTJ_RANK_HIERARCHY = [
     "ECP", "PARA", "GPARA", "EMT", "FR"
 ]
 
+# Rank -> position lookups, so sorting never scans the hierarchy lists
+FENZ_RANK_INDEX = {prefix: index for index, prefix in enumerate(FENZ_RANK_HIERARCHY)}
+HHSTJ_RANK_INDEX = {prefix: index for index, prefix in enumerate(HHSTJ_RANK_HIERARCHY)}
+
+SHIFT_NICKNAME_PREFIXES = ("DUTY | ", "BRK | ", "LOA | ")
+
+# Role changes that can affect a member's callsign row, nickname or sheet entry
+SYNC_RELEVANT_ROLE_IDS = (
+        set(FENZ_RANK_MAP) | set(HHSTJ_RANK_MAP) | HIGH_COMMAND_RANKS | HHSTJ_HIGH_COMMAND_RANKS
+        | set(NAUGHTY_ROLES) | set(COMMAND_RANKS) | set(NON_COMMAND_RANKS) | set(STRIKES_ROLES)
+        | set(QUALIFICATIONS_ROLES) | {role_id for role_ids in SHIFT_ROLES.values() for role_id in role_ids}
+)
+NICKNAME_CACHE_SIZE = 4096
+
 # Sync role required
 SYNC_ROLE_ID = 1389550689113473024
 
@@ -279,10 +329,10 @@ def db_retry(max_attempts: int = 3, delay: float = 1.0):
                 except PostgresError as e:
                     last_exception = e
                     if attempt < max_attempts:
-                        print(f"⚠️ DB operation failed (attempt {attempt}/{max_attempts}): {e}")
+                        logger.warning(f"⚠️ DB operation failed (attempt {attempt}/{max_attempts}): {e}")
                         await asyncio.sleep(delay * attempt)
                     else:
-                        print(f"❌ DB operation failed after {max_attempts} attempts")
+                        logger.error(f"❌ DB operation failed after {max_attempts} attempts")
                         raise
 
             raise last_exception
@@ -292,19 +342,6 @@ def db_retry(max_attempts: int = 3, delay: float = 1.0):
     return decorator
 
 
-def normalize_callsign(callsign: str) -> str:
-    """
-    Normalize callsign by stripping leading zeros
-    Examples: '01' -> '1', '001' -> '1', '10' -> '10', '100' -> '100'
-    Returns normalized callsign or original if not numeric
-    """
-    if not callsign or not callsign.isdigit():
-        return callsign
-
-    # Convert to int and back to string to strip leading zeros
-    # This preserves '10' and '100' while converting '01' to '1'
-    return str(int(callsign))
-
 def get_embed_size(embed: discord.Embed) -> int:
     """Calculate total character count of an embed"""
     size = 0
@@ -326,9 +363,11 @@ def validate_embed_size(embed: discord.Embed, max_size: int = 5500) -> tuple[boo
     return (size <= max_size, size)
 
 
-async def safe_edit_nickname(member: discord.Member, nickname: str, max_retries: int = 3) -> tuple[bool, str]:
+async def safe_edit_nickname(member: discord.Member, nickname: str, max_retries: int = 3,
+                             debounce: float = 0) -> tuple[bool, str]:
     """
     Safely edit nickname with automatic fixing and truncation
+    One-shot edits skip the member_edits debounce window unless `debounce` is given
     Returns: (success: bool, final_nickname: str)
     """
 
@@ -344,7 +383,7 @@ async def safe_edit_nickname(member: discord.Member, nickname: str, max_retries:
         nickname = nickname[1:].strip()
 
     if not validate_nickname(nickname):
-        print(f"⚠️ Invalid nickname format: '{nickname}'")
+        logger.warning(f"⚠️ Invalid nickname format: '{nickname}'")
         return (False, nickname)
 
     # Try progressively shorter versions
@@ -368,26 +407,26 @@ async def safe_edit_nickname(member: discord.Member, nickname: str, max_retries:
             continue
 
         try:
-            await member.edit(nick=attempt_nick)
+            await member_edits.apply(member, nick=attempt_nick, debounce=debounce)
             if attempt_num > 1:
-                print(f"✅ Used fallback nickname: '{attempt_nick}'")
+                logger.info(f"✅ Used fallback nickname: '{attempt_nick}'")
             return (True, attempt_nick)
 
         except discord.HTTPException as e:
             last_error = e
             if e.code != 50035:  # Not a length error
-                print(f"❌ Discord HTTP error {e.code}: {e}")
+                logger.error(f"❌ Discord HTTP error {e.code}: {e}")
                 break
 
         except discord.Forbidden:
-            print(f"❌ Missing permissions to edit {member.id}")
+            logger.error(f"❌ Missing permissions to edit {member.id}")
             return (False, nickname)
 
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
+            logger.error(f"❌ Unexpected error: {e}")
             last_error = e
 
-    print(f"❌ All nickname attempts failed for {member.id}")
+    logger.error(f"❌ All nickname attempts failed for {member.id}")
     return (False, nickname)
 
 def get_rank_sort_key(fenz_prefix: str, hhstj_prefix: str) -> tuple:
@@ -396,9 +435,25 @@ def get_rank_sort_key(fenz_prefix: str, hhstj_prefix: str) -> tuple:
     Returns tuple: (fenz_rank_index, hhstj_rank_index)
     Lower index = higher rank
     """
-    fenz_index = FENZ_RANK_HIERARCHY.index(fenz_prefix) if fenz_prefix in FENZ_RANK_HIERARCHY else 999
-    hhstj_index = HHSTJ_RANK_HIERARCHY.index(hhstj_prefix) if hhstj_prefix in HHSTJ_RANK_HIERARCHY else 999
-    return (fenz_index, hhstj_index)
+    return (FENZ_RANK_INDEX.get(fenz_prefix, 999), HHSTJ_RANK_INDEX.get(hhstj_prefix, 999))
+
+
+def build_sheet_entry(record, member: discord.Member) -> dict:
+    """One callsigns row in the shape batch_update_callsigns expects, with role-derived fields"""
+    rank_type, rank_data = sheets_manager.determine_rank_type(member.roles)
+    is_command_rank = (rank_type == 'command')
+    return {
+        'fenz_prefix': record['fenz_prefix'] or '',
+        'hhstj_prefix': record['hhstj_prefix'] or '',
+        'callsign': record['callsign'],
+        'discord_user_id': record['discord_user_id'],
+        'discord_username': record['discord_username'],
+        'roblox_user_id': record['roblox_user_id'],
+        'roblox_username': record['roblox_username'],
+        'is_command': is_command_rank,
+        'strikes': sheets_manager.determine_strikes_value(member.roles),
+        'qualifications': sheets_manager.determine_qualifications(member.roles, is_command_rank)
+    }
 
 
 def validate_nickname(nickname: str) -> bool:
@@ -453,6 +508,7 @@ def try_format(parts: list) -> str:
 
     return None
 
+@functools.lru_cache(maxsize=NICKNAME_CACHE_SIZE)
 def calculate_rank_priority(fenz_prefix: str, hhstj_prefix: str) -> tuple[str, int, str]:
     """
     Calculate which rank should display first based on priority rules.
@@ -473,21 +529,7 @@ def calculate_rank_priority(fenz_prefix: str, hhstj_prefix: str) -> tuple[str, i
 
     # If HHStJ prefix is shortened, get the full version for priority lookup
     if hhstj_prefix and '-' in hhstj_prefix:
-        # Check if this is a shortened version by looking for it in the rank map
-        found_full_prefix = None
-        for role_id, (rank_name, full_prefix) in HHSTJ_RANK_MAP.items():
-            if full_prefix == hhstj_prefix:
-                found_full_prefix = full_prefix
-                break
-            # Check if current prefix is a shortened version of this rank
-            elif full_prefix and '-' in full_prefix:
-                versions = get_hhstj_shortened_versions(full_prefix)
-                if hhstj_prefix in versions:
-                    found_full_prefix = full_prefix
-                    break
-
-        if found_full_prefix:
-            hhstj_lookup_prefix = found_full_prefix
+        hhstj_lookup_prefix = HHSTJ_FULL_PREFIXES.get(hhstj_prefix, hhstj_prefix)
 
     hhstj_priority = HHSTJ_RANK_PRIORITY.get(hhstj_lookup_prefix, 0)
 
@@ -542,6 +584,7 @@ def calculate_rank_priority(fenz_prefix: str, hhstj_prefix: str) -> tuple[str, i
         return ("", 0, "")
 
 
+@functools.lru_cache(maxsize=NICKNAME_CACHE_SIZE)
 def format_nickname(fenz_prefix: str, callsign: str, hhstj_prefix: str, roblox_username: str) -> str:
     """
     Format nickname with priority-based system and proper truncation.
@@ -738,6 +781,29 @@ def should_update_nickname(member: discord.Member, db_fenz_prefix: str, db_calls
     return (True, expected_nickname)
 
 
+def find_nickname_updates(entries: list) -> list:
+    """
+    Batch form of should_update_nickname for a sync pass.
+    entries are (member, fenz_prefix, callsign, hhstj_prefix, roblox_username) tuples;
+    returns (member, expected_nickname) for members whose nickname must change.
+    Members already showing the (memoized) expected nickname with no shift
+    prefix are dropped with a single string comparison.
+    """
+    updates = []
+    for member, fenz_prefix, callsign, hhstj_prefix, roblox_username in entries:
+        current_nick = member.nick if member.nick else member.name
+        if current_nick == format_nickname(fenz_prefix, callsign, hhstj_prefix, roblox_username) \
+                and not current_nick.startswith(SHIFT_NICKNAME_PREFIXES):
+            continue
+
+        should_update, expected_nickname = should_update_nickname(
+            member, fenz_prefix, callsign, hhstj_prefix, roblox_username
+        )
+        if should_update:
+            updates.append((member, expected_nickname))
+    return updates
+
+
 async def smart_update_nickname(member: discord.Member, db_fenz_prefix: str, db_callsign: str,
                                 db_hhstj_prefix: str, db_roblox_username: str) -> bool:
     """
@@ -769,14 +835,14 @@ async def smart_update_nickname(member: discord.Member, db_fenz_prefix: str, db_
         success, final_nick = await safe_edit_nickname(member, final_nickname)
 
         if success:
-            print(f"✅ Updated nickname: {member.display_name} → '{final_nickname}'")
+            logger.info(f"✅ Updated nickname: {member.display_name} → '{final_nickname}'")
             return True
         else:
-            print(f"⚠️ Failed to update nickname for {member.id}")
+            logger.warning(f"⚠️ Failed to update nickname for {member.id}")
             return False
 
     except Exception as e:
-        print(f"❌ Error updating nickname for {member.display_name}: {e}")
+        logger.error(f"❌ Error updating nickname for {member.display_name}: {e}")
         return False
 
 def strip_shift_prefixes(nickname: str, member: discord.Member = None) -> tuple[str, str]:
@@ -796,11 +862,25 @@ def strip_shift_prefixes(nickname: str, member: discord.Member = None) -> tuple[
 @db_retry(max_attempts=3, delay=1.0)
 async def check_callsign_exists(callsign: str, fenz_prefix: str = None) -> dict:
     """Check if a callsign exists in the database with the same prefix"""
-    async with db.pool.acquire() as conn:
-        # BLANK and Not Assigned callsigns are allowed to be non-unique, skip check
-        if callsign in ["BLANK", "Not Assigned"]:
+    # BLANK and Not Assigned callsigns are allowed to be non-unique, skip check
+    if callsign in ["BLANK", "Not Assigned"]:
+        return None
+
+    if fenz_prefix:
+        # The registry answers "free" without a query; only a hit needs the row
+        await callsign_registry.ensure_loaded()
+        owner_id = callsign_registry.owner(fenz_prefix, callsign)
+        if owner_id is None:
             return None
+        async with db.pool.acquire() as conn:
+            row = await conn.fetchrow('SELECT * FROM callsigns WHERE discord_user_id = $1', owner_id)
+        if row and callsign_registry.key(row['fenz_prefix'], row['callsign']) == \
+                callsign_registry.key(fenz_prefix, callsign):
+            return dict(row)
+        # Registry was stale (written elsewhere) - reload next time and ask the database
+        callsign_registry.invalidate()
 
+    async with db.pool.acquire() as conn:
         # Check for same callsign WITH same prefix
         if fenz_prefix:
             row = await conn.fetchrow(
@@ -817,27 +897,35 @@ async def check_callsign_exists(callsign: str, fenz_prefix: str = None) -> dict:
         return dict(row) if row else None
 
 
+def get_fenz_prefix_from_roles(roles) -> Optional[str]:
+    """FENZ prefix of the first FENZ_RANK_MAP rank the member holds"""
+    role_ids = {role.id for role in roles}
+    for role_id, (rank_name, prefix) in FENZ_RANK_MAP.items():
+        if role_id in role_ids:
+            return prefix
+    return None
+
+
 def get_hhstj_prefix_from_roles(roles, stored_hhstj_prefix: str = None) -> str:
     """
     Get HHStJ prefix from roles, prioritizing management over clinical.
     If stored_hhstj_prefix is provided and is a valid shortened version, preserve it.
     """
+    role_ids = {role.id for role in roles}
 
     # First check for management roles (high command)
     full_prefix = None
     for role_id, (rank_name, prefix) in HHSTJ_RANK_MAP.items():
-        if role_id in HHSTJ_HIGH_COMMAND_RANKS:
-            if any(role.id == role_id for role in roles):
-                full_prefix = prefix
-                break
+        if role_id in HHSTJ_HIGH_COMMAND_RANKS and role_id in role_ids:
+            full_prefix = prefix
+            break
 
     # Then check for clinical roles if no management role found
     if not full_prefix:
         for role_id, (rank_name, prefix) in HHSTJ_RANK_MAP.items():
-            if role_id not in HHSTJ_HIGH_COMMAND_RANKS:
-                if any(role.id == role_id for role in roles):
-                    full_prefix = prefix
-                    break
+            if role_id not in HHSTJ_HIGH_COMMAND_RANKS and role_id in role_ids:
+                full_prefix = prefix
+                break
 
     # If no HHStJ role found, return empty
     if not full_prefix:
@@ -877,7 +965,7 @@ async def send_safe_embeds(self, channel, items: list, title_prefix: str, color,
             if max_per_embed > 1:
                 await self.send_safe_embeds(channel, chunk, title_prefix, color, formatter_func, max_per_embed // 2)
             else:
-                print(f"⚠️ Single item too large, skipping")
+                logger.warning(f"⚠️ Single item too large, skipping")
             continue
 
         await channel.send(embed=embed)
@@ -887,13 +975,18 @@ def get_hhstj_shortened_versions(hhstj_prefix: str) -> list:
     Get all shortened versions of an HHStJ callsign
     Returns list of versions in order: [full, shortened, prefix-only]
     """
+    return list(_hhstj_shortened_versions(hhstj_prefix))
+
+
+@functools.lru_cache(maxsize=256)
+def _hhstj_shortened_versions(hhstj_prefix: str) -> tuple:
     if not hhstj_prefix or '-' not in hhstj_prefix:
-        return [hhstj_prefix] if hhstj_prefix else []
+        return (hhstj_prefix,) if hhstj_prefix else ()
 
     # Split the callsign (e.g., "WOM-MIKE30" -> "WOM", "MIKE30")
     parts = hhstj_prefix.split('-', 1)
     if len(parts) != 2:
-        return [hhstj_prefix]
+        return (hhstj_prefix,)
 
     prefix = parts[0]  # e.g., "WOM"
     phonetic_number = parts[1]  # e.g., "MIKE30"
@@ -925,7 +1018,14 @@ def get_hhstj_shortened_versions(hhstj_prefix: str) -> list:
     version1 = hhstj_prefix  # Full version
     version3 = prefix  # Prefix only
 
-    return [version1, version2, version3]
+    return (version1, version2, version3)
+
+
+# Every full or shortened HHStJ prefix -> the full rank prefix (first rank in HHSTJ_RANK_MAP wins)
+HHSTJ_FULL_PREFIXES = {}
+for _rank_name, _full_prefix in HHSTJ_RANK_MAP.values():
+    for _version in _hhstj_shortened_versions(_full_prefix):
+        HHSTJ_FULL_PREFIXES.setdefault(_version, _full_prefix)
 
 
 def test_hhstj_versions_fit(fenz_prefix: str, callsign: str, hhstj_versions: list,
@@ -952,6 +1052,17 @@ def test_hhstj_versions_fit(fenz_prefix: str, callsign: str, hhstj_versions: lis
 
     return results
 
+def suggest_free_callsigns(fenz_prefix: str, near: str = None, count: int = 3) -> list:
+    """Free callsign numbers for a prefix, starting at `near` and wrapping to the lowest"""
+    if not callsign_registry.loaded:
+        return []
+    low = int(near) if near and near.isdigit() else CALLSIGN_MIN
+    free = callsign_registry.next_free(fenz_prefix, low=low, count=count)
+    if len(free) < count and low > CALLSIGN_MIN:
+        free += callsign_registry.next_free(fenz_prefix, high=low - 1, count=count - len(free))
+    return free
+
+
 def format_duplicate_callsign_message(callsign: str, existing_data: dict) -> str:
     """Format a user-friendly message when a callsign is already taken"""
     # Build the full callsign display
@@ -974,7 +1085,11 @@ def format_duplicate_callsign_message(callsign: str, existing_data: dict) -> str
 
     # What to do next
     message += f"\n'**What to do:**\n"
-    message += f"Try a different callsign number\n"
+    free = suggest_free_callsigns(existing_data['fenz_prefix'], callsign)
+    if free:
+        message += f"Try a free callsign: {', '.join(f'**{number}**' for number in free)}\n"
+    else:
+        message += "Try a different callsign number\n"
     message += f"Use `/callsign lookup callsign:{callsign}` to verify\n"
     message += f"Contact an admin if you believe this is an error"
 
@@ -1039,87 +1154,210 @@ async def add_callsign_to_database(callsign: str, discord_user_id: int, discord_
                 json.dumps(history)
             )
 
+    callsign_registry.assign(discord_user_id, fenz_prefix, callsign)
+    sync_tracker.mark(discord_user_id)
+
+
+@db_retry(max_attempts=3, delay=1.0)
+async def add_callsigns_to_database_bulk(assignments: List[Dict], approved_by_id: int,
+                                         approved_by_name: str) -> List[Dict]:
+    """
+    Add many callsigns in one transaction (same semantics as add_callsign_to_database).
+    Each assignment has the add_callsign_to_database fields; any whose callsign
+    is already held by another user is skipped and returned.
+    """
+    if not assignments:
+        return []
+
+    async with db.pool.acquire() as conn:
+        async with conn.transaction():
+            taken = await conn.fetch(
+                '''SELECT callsign, fenz_prefix, discord_user_id
+                   FROM callsigns
+                   WHERE (callsign, fenz_prefix) IN (SELECT * FROM unnest($1::text[], $2::text[]))''',
+                [a['callsign'] for a in assignments], [a['fenz_prefix'] for a in assignments]
+            )
+            holders = {(row['callsign'], row['fenz_prefix']): row['discord_user_id'] for row in taken}
+            conflicts = [a for a in assignments
+                         if holders.get((a['callsign'], a['fenz_prefix']), a['discord_user_id']) != a['discord_user_id']]
+            conflicted_ids = {a['discord_user_id'] for a in conflicts}
+            assignments = [a for a in assignments if a['discord_user_id'] not in conflicted_ids]
+            user_ids = [a['discord_user_id'] for a in assignments]
+
+            # Store history of previous callsigns
+            history: Dict[int, list] = {user_id: [] for user_id in user_ids}
+            replaced_at = int(datetime.utcnow().timestamp())
+            for old_data in await conn.fetch('SELECT * FROM callsigns WHERE discord_user_id = ANY($1::bigint[])',
+                                             user_ids):
+                history[old_data['discord_user_id']].append({
+                    "callsign": old_data.get("callsign"),
+                    "fenz_prefix": old_data.get("fenz_prefix"),
+                    "hhstj_prefix": old_data.get("hhstj_prefix"),
+                    "approved_at": old_data.get("approved_at").isoformat() if old_data.get("approved_at") else None,
+                    "replaced_at": replaced_at
+                })
+
+            await conn.execute('DELETE FROM callsigns WHERE discord_user_id = ANY($1::bigint[])', user_ids)
+            await conn.executemany(
+                '''INSERT INTO callsigns
+                   (callsign, discord_user_id, discord_username, roblox_user_id, roblox_username,
+                    fenz_prefix, hhstj_prefix, approved_by_id, approved_by_name, callsign_history)
+                   VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)''',
+                [(a['callsign'], a['discord_user_id'], a['discord_username'], a['roblox_user_id'],
+                  a['roblox_username'], a['fenz_prefix'], a['hhstj_prefix'], approved_by_id, approved_by_name,
+                  json.dumps(history[a['discord_user_id']])) for a in assignments]
+            )
+
+    for a in assignments:
+        callsign_registry.assign(a['discord_user_id'], a['fenz_prefix'], a['callsign'])
+    sync_tracker.mark(*(a['discord_user_id'] for a in assignments))
+    return conflicts
+
 class BloxlinkAPI:
     """Enhanced Bloxlink API handler with PostgreSQL-backed 24-hour caching"""
 
-    # ✅ Keep class-level tracking variables
-    _api_calls_made = 0
-    _quota_limit = 500
-    _quota_reset_time = None
     _cache_duration = 86400  # 24 hours in seconds
-    _quota_exhausted = False
+    _revalidating: Set[int] = set()  # Discord IDs with a background refresh in flight
+    _revalidate_slots = asyncio.Semaphore(BLOXLINK_FETCH_CONCURRENCY)
+    _revalidated_today = (None, 0)  # (UTC date, proactive refreshes started that day)
 
     def __init__(self):
-        self.base_url = "https://api.blox.link/v4/public"
-        self.rate_limit_delay = 0.75
-        self.last_request_time = 0
+        # Rate limiting and quota live in the process-wide bloxlink_limiter, so
+        # every instance shares one budget
+        self.base_url = BLOXLINK_API_BASE
         self.max_retries = 3
         self.timeout = 15
-        self.requests_this_minute = 0
-        self.minute_start = asyncio.get_event_loop().time()
-        self.max_requests_per_minute = 50
+        metrics.register_collector('bloxlink_quota', BloxlinkAPI.collect_quota_metrics)
 
-    async def _check_daily_quota(self) -> bool:
+    async def _get_cached_data(self, discord_user_id: int,
+                               revalidate_guild_id: int = None) -> Optional[Tuple[str, int, str]]:
         """
-        Check if we have API quota remaining. Returns True if we can make calls.
-        Automatically resets quota tracking after 24 hours.
+        Get cached Bloxlink data from the database (stale-while-revalidate).
+        Returns (username, user_id, status) or None if not cached.
+
+        Fresh rows are returned as-is. Expired success/not_linked rows are
+        still returned for BLOXLINK_STALE_SECONDS; if revalidate_guild_id is
+        given a background refresh is queued for them.
         """
-        # Check if quota reset time has passed
-        if BloxlinkAPI._quota_reset_time:
-            current_time = asyncio.get_event_loop().time()
-            if current_time >= BloxlinkAPI._quota_reset_time:
-                print("✅ 24-hour quota period expired - resetting counters")
-                BloxlinkAPI._api_calls_made = 0
-                BloxlinkAPI._quota_exhausted = False
-                BloxlinkAPI._quota_reset_time = None
-
-        # Check if we're at or over the limit
-        if BloxlinkAPI._api_calls_made >= BloxlinkAPI._quota_limit:
-            if not BloxlinkAPI._quota_exhausted:
-                BloxlinkAPI._quota_exhausted = True
-
-                # Set reset time to 24 hours from now if not already set
-                if not BloxlinkAPI._quota_reset_time:
-                    BloxlinkAPI._quota_reset_time = asyncio.get_event_loop().time() + 86400
-                    reset_datetime = datetime.utcnow() + timedelta(seconds=86400)
-                    print(
-                        f"🚫 Daily API quota exhausted ({BloxlinkAPI._api_calls_made}/{BloxlinkAPI._quota_limit} calls used)")
-                    print(f"⏰ Quota will reset at: {reset_datetime.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+        async with db.pool.acquire() as conn:
+            result = await conn.fetchrow(
+                '''SELECT roblox_username, roblox_user_id, status, expires_at <= NOW() AS stale
+                   FROM bloxlink_cache
+                   WHERE discord_user_id = $1
+                     AND (expires_at > NOW()
+                       OR (status IN ('success', 'not_linked')
+                           AND expires_at > NOW() - make_interval(secs => $2::int)))''',
+                discord_user_id, BLOXLINK_STALE_SECONDS
+            )
+
+        if not result:
+            return None
+
+        if result['stale'] and revalidate_guild_id:
+            self.queue_revalidation(discord_user_id, revalidate_guild_id)
 
+        return (
+            result['roblox_username'],
+            int(result['roblox_user_id']) if result['roblox_user_id'] and result[
+                'roblox_user_id'] != 'None' else None,
+            result['status']
+        )
+
+    def queue_revalidation(self, discord_user_id: int, guild_id: int) -> bool:
+        """Refresh one cache entry in the background (deduplicated, keeps a quota reserve)"""
+        if discord_user_id in BloxlinkAPI._revalidating:
+            return False
+        if bloxlink_limiter.daily_remaining <= BLOXLINK_REVALIDATE_RESERVE:
             return False
 
+        BloxlinkAPI._revalidating.add(discord_user_id)
+        asyncio.create_task(self._revalidate(discord_user_id, guild_id))
         return True
 
-    async def _get_cached_data(self, discord_user_id: int) -> Optional[Tuple[str, int, str]]:
+    async def _revalidate(self, discord_user_id: int, guild_id: int):
+        status = None
+        try:
+            async with BloxlinkAPI._revalidate_slots:
+                result = await self._fetch_bloxlink_data(discord_user_id, guild_id)
+                status = result[2]
+                BLOXLINK_LOOKUPS.inc(source='revalidate', result=status)
+        except Exception as e:
+            logger.warning(f"⚠️ Background Bloxlink refresh failed for {discord_user_id}: {e}")
+        finally:
+            BloxlinkAPI._revalidating.discard(discord_user_id)
+
+        if status not in BLOXLINK_CACHE_TTLS:
+            await self._record_revalidate_attempt(discord_user_id)
+
+    async def _record_revalidate_attempt(self, discord_user_id: int):
+        """
+        Failed refreshes keep the cached row as-is; bump cached_at so
+        revalidate_due_entries moves on to other rows instead of retrying
+        the same ones every run.
+        """
+        try:
+            async with db.pool.acquire() as conn:
+                await conn.execute(
+                    '''UPDATE bloxlink_cache
+                       SET cached_at = NOW()
+                       WHERE discord_user_id = $1
+                         AND status IN ('success', 'not_linked')''',
+                    discord_user_id
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record Bloxlink refresh attempt for {discord_user_id}: {e}")
+
+    async def revalidate_due_entries(self, guild_id: int, interval: int = BLOXLINK_REVALIDATE_INTERVAL_SECONDS) -> int:
         """
-        Get cached Bloxlink data from database if not expired
-        Returns (username, user_id, status) or None if not cached/expired
+        Proactively refresh entries that are already stale or will expire
+        before the next run, least recently attempted first. Each run takes an even share of
+        BLOXLINK_REVALIDATE_DAILY_BUDGET; anything left over is refreshed on
+        read (stale-while-revalidate) instead.
         """
+        if bloxlink_limiter.daily_remaining <= BLOXLINK_REVALIDATE_RESERVE:
+            return 0
+
+        today = datetime.utcnow().date()
+        day, spent = BloxlinkAPI._revalidated_today
+        if day != today:
+            spent = 0
+
+        runs_per_day = max(1, 86400 // interval)
+        budget = min(-(-BLOXLINK_REVALIDATE_DAILY_BUDGET // runs_per_day),
+                     BLOXLINK_REVALIDATE_DAILY_BUDGET - spent,
+                     bloxlink_limiter.daily_remaining - BLOXLINK_REVALIDATE_RESERVE)
+        if budget <= 0:
+            return 0
+
         async with db.pool.acquire() as conn:
-            result = await conn.fetchrow(
-                '''SELECT roblox_username, roblox_user_id, status, expires_at
+            rows = await conn.fetch(
+                '''SELECT discord_user_id
                    FROM bloxlink_cache
-                   WHERE discord_user_id = $1
-                     AND expires_at > NOW()''',
-                discord_user_id
+                   WHERE status IN ('success', 'not_linked')
+                     AND expires_at <= NOW() + make_interval(secs => $1::int)
+                     AND expires_at > NOW() - make_interval(secs => $2::int)
+                   ORDER BY cached_at
+                   LIMIT $3''',
+                interval, BLOXLINK_STALE_SECONDS, budget
             )
 
-            if result:
-                # Only log on failure or first few hits for debugging
-                return (
-                    result['roblox_username'],
-                    int(result['roblox_user_id']) if result['roblox_user_id'] and result[
-                        'roblox_user_id'] != 'None' else None,
-                    result['status']
-                )
+        refreshes = []
+        for row in rows:
+            discord_user_id = row['discord_user_id']
+            if discord_user_id in BloxlinkAPI._revalidating:
+                continue
+            BloxlinkAPI._revalidating.add(discord_user_id)
+            refreshes.append(self._revalidate(discord_user_id, guild_id))
 
-            return None
+        BloxlinkAPI._revalidated_today = (today, spent + len(refreshes))
+        await asyncio.gather(*refreshes)
+        return len(refreshes)
 
     async def _cache_data(self, discord_user_id: int, roblox_username: Optional[str],
                           roblox_user_id: Optional[int], status: str):
         """
-        Store Bloxlink data in database cache with 24-hour expiry
-        Only overwrites existing cache if new data is successful
+        Store Bloxlink data in database cache with a TTL tiered by status
+        (BLOXLINK_CACHE_TTLS). Errors never overwrite a success/not_linked row.
         """
         # Check if this is an error status
         error_statuses = ['rate_limited', 'timeout', 'quota_exhausted', 'api_error',
@@ -1138,30 +1376,31 @@ class BloxlinkAPI:
 
                 if existing and existing['status'] in ['success', 'not_linked']:
                     # We have valid cached data, don't overwrite with error
-                    print(f"⚠️ Preserving existing cache for {discord_user_id} - API returned {status}")
+                    logger.warning(f"⚠️ Preserving existing cache for {discord_user_id} - API returned {status}")
                     return
 
             # Either no existing cache, or new data is successful - update normally
             await conn.execute(
                 '''INSERT INTO bloxlink_cache
                    (discord_user_id, roblox_username, roblox_user_id, status, cached_at, expires_at)
-                   VALUES ($1, $2, $3, $4, NOW(), NOW() + INTERVAL '24 hours') ON CONFLICT (discord_user_id) 
+                   VALUES ($1, $2, $3, $4, NOW(), NOW() + make_interval(secs => $5::int)) ON CONFLICT (discord_user_id) 
                    DO
                 UPDATE SET
                     roblox_username = EXCLUDED.roblox_username,
                     roblox_user_id = EXCLUDED.roblox_user_id,
                     status = EXCLUDED.status,
                     cached_at = NOW(),
-                    expires_at = NOW() + INTERVAL '24 hours' ''',
+                    expires_at = EXCLUDED.expires_at ''',
                 discord_user_id,
                 roblox_username,
                 str(roblox_user_id) if roblox_user_id else None,
-                status
+                status,
+                BLOXLINK_CACHE_TTLS.get(status, BLOXLINK_ERROR_TTL_SECONDS)
             )
 
         # Only log cache failures
         if is_error:
-            print(f"❌ Failed to cache data for {discord_user_id}: {status}")
+            logger.error(f"❌ Failed to cache data for {discord_user_id}: {status}")
 
     async def get_bloxlink_data(
             self,
@@ -1179,25 +1418,38 @@ class BloxlinkAPI:
             return (None, None, "no_guild_id")
 
         if not BLOXLINK_API_KEY:
-            print("❌ CRITICAL: BLOXLINK_API_KEY is not set!")
+            logger.error("❌ CRITICAL: BLOXLINK_API_KEY is not set!")
             return (None, None, "no_api_key")
 
-        # ✅ CHECK DATABASE CACHE FIRST
-        cached = await self._get_cached_data(discord_user_id)
+        # ✅ CHECK DATABASE CACHE FIRST (stale entries are served and refreshed in the background)
+        cached = await self._get_cached_data(discord_user_id, revalidate_guild_id=guild_id)
         if cached:
+            BLOXLINK_LOOKUPS.inc(source='cache', result=cached[2])
             return cached
 
-        # Cache miss - fetch from API
-        print(f"🌐 Cache MISS for {discord_user_id}, fetching from API...")
+        result = await self._fetch_bloxlink_data(discord_user_id, guild_id)
+        BLOXLINK_LOOKUPS.inc(source='api', result=result[2])
+        return result
+
+    async def _fetch_bloxlink_data(self, discord_user_id: int, guild_id: int,
+                                   session: aiohttp.ClientSession = None,
+                                   resolve_username: bool = True) -> Tuple[Optional[str], Optional[int], str]:
+        """
+        Cache miss path: call the Bloxlink API with retries.
+
+        With resolve_username=False a success returns (None, roblox_id, "success")
+        uncached, for callers that resolve usernames in batches and cache themselves.
+        """
 
-        # 🚫 NEW: Check if we have quota remaining before making API call
-        if not await self._check_daily_quota():
-            print(f"🚫 Quota exhausted - cannot fetch data for {discord_user_id}")
-            return (None, None, "quota_exhausted")
+        # Cache miss - fetch from API
+        logger.info(f"🌐 Cache MISS for {discord_user_id}, fetching from API...")
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                await self._enforce_rate_limit()
+                # Each attempt is a billable request: wait for a slot in the shared budget
+                if not await bloxlink_limiter.acquire():
+                    logger.error(f"🚫 Quota exhausted - cannot fetch data for {discord_user_id}")
+                    return (None, None, "quota_exhausted")
 
                 urls_to_try = [
                     f"{self.base_url}/guilds/{guild_id}/discord-to-roblox/{discord_user_id}",
@@ -1210,21 +1462,25 @@ class BloxlinkAPI:
                     'User-Agent': 'HNZRP-Callsign-Bot/1.0'
                 }
 
-                async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with contextlib.AsyncExitStack() as stack:
+                    http = session or await stack.enter_async_context(aiohttp.ClientSession())
                     for url_index, url in enumerate(urls_to_try):
-                        async with session.get(url, headers=headers) as response:
-
-                            if 'X-RateLimit-Remaining' in response.headers:
-                                remaining = int(response.headers['X-RateLimit-Remaining'])
-                                print(f"📊 API Quota: {remaining} calls remaining")
+                        request_start = time.perf_counter()
+                        async with http.get(url, headers=headers, timeout=timeout) as response:
+                            BLOXLINK_REQUEST_SECONDS.observe(time.perf_counter() - request_start,
+                                                             status=str(response.status))
 
-                            if 'X-RateLimit-Reset' in response.headers:
-                                BloxlinkAPI._quota_reset_time = int(response.headers['X-RateLimit-Reset'])
+                            bloxlink_limiter.record_response(response.status, response.headers)
+                            if bloxlink_limiter.remaining_header is not None:
+                                logger.info(f"📊 API Quota: {bloxlink_limiter.remaining_header} calls remaining")
 
                             if response.status == 200:
                                 data = await response.json()
                                 roblox_id = data.get('robloxID')
 
+                                if roblox_id and not resolve_username:
+                                    return (None, int(roblox_id), "success")
+
                                 if roblox_id:
                                     username = await self._get_roblox_username(roblox_id)
                                     result = (username, int(roblox_id), "success")
@@ -1241,7 +1497,7 @@ class BloxlinkAPI:
                             elif response.status == 429:
                                 if attempt < self.max_retries:
                                     wait_time = (2 ** attempt) * 2
-                                    print(
+                                    logger.info(
                                         f"⏳ Rate limited, waiting {wait_time}s (attempt {attempt}/{self.max_retries})")
                                     await asyncio.sleep(wait_time)
                                     continue
@@ -1275,9 +1531,17 @@ class BloxlinkAPI:
 
         return (None, None, "max_retries_exceeded")
 
+    @staticmethod
+    def collect_quota_metrics():
+        stats = bloxlink_limiter.stats()
+        BLOXLINK_QUOTA.set(stats['used'], kind='used')
+        BLOXLINK_QUOTA.set(stats['limit'], kind='limit')
+        BLOXLINK_QUOTA.set(1 if stats['exhausted'] else 0, kind='exhausted')
+        BLOXLINK_QUOTA.set(stats['remaining'], kind='remaining')
+
     async def _get_roblox_username(self, roblox_id: int) -> Optional[str]:
         """Fetch Roblox username from Roblox API (does NOT count against Bloxlink quota)"""
-        url = f"https://users.roblox.com/v1/users/{roblox_id}"
+        url = f"{ROBLOX_USERS_API}/users/{roblox_id}"
 
         for attempt in range(1, 3):
             try:
@@ -1299,30 +1563,32 @@ class BloxlinkAPI:
 
         return 'Unknown'
 
-    async def _enforce_rate_limit(self):
-        """Ensure we don't exceed rate limits"""
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
+    async def _get_roblox_usernames(self, roblox_ids: List[int],
+                                    session: aiohttp.ClientSession = None) -> Dict[int, str]:
+        """Resolve many Roblox IDs with the multi-user endpoint (100 per request)"""
+        names = {}
+        timeout = aiohttp.ClientTimeout(total=10)
 
-        if current_time - self.minute_start >= 60:
-            self.requests_this_minute = 0
-            self.minute_start = current_time
-
-        if self.requests_this_minute >= self.max_requests_per_minute:
-            wait_time = 60 - (current_time - self.minute_start)
-            if wait_time > 0:
-                print(f"⏸️ Hit rate limit ceiling, waiting {wait_time:.1f}s...")
-                await asyncio.sleep(wait_time)
-                self.requests_this_minute = 0
-                self.minute_start = asyncio.get_event_loop().time()
-
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
+        async with contextlib.AsyncExitStack() as stack:
+            http = session or await stack.enter_async_context(aiohttp.ClientSession())
+            for start in range(0, len(roblox_ids), ROBLOX_USERS_BATCH_SIZE):
+                chunk = roblox_ids[start:start + ROBLOX_USERS_BATCH_SIZE]
+                try:
+                    async with http.post(f'{ROBLOX_USERS_API}/users', timeout=timeout,
+                                         json={'userIds': chunk, 'excludeBannedUsers': False}) as response:
+                        if response.status == 200:
+                            data = await response.json()
+                            names.update({int(user['id']): user['name'] for user in data.get('data', [])})
+                        else:
+                            logger.warning(f"⚠️ Roblox batch username lookup returned {response.status}")
+                except Exception as e:
+                    logger.warning(f"⚠️ Roblox batch username lookup failed: {e}")
 
-        self.last_request_time = asyncio.get_event_loop().time()
-        self.requests_this_minute += 1
-        BloxlinkAPI._api_calls_made += 1
+        # Anything the batch missed falls back to single lookups
+        for roblox_id in roblox_ids:
+            if roblox_id not in names:
+                names[roblox_id] = await self._get_roblox_username(roblox_id)
+        return names
 
     async def get_cache_stats(self) -> dict:
         """Get cache statistics from database"""
@@ -1351,9 +1617,10 @@ class BloxlinkAPI:
             'total_cached': valid_count + expired_count,
             'valid_entries': valid_count,
             'expired_entries': expired_count,
-            'api_calls_made': BloxlinkAPI._api_calls_made,
-            'quota_remaining': max(0, BloxlinkAPI._quota_limit - BloxlinkAPI._api_calls_made),
-            'quota_reset_time': BloxlinkAPI._quota_reset_time,
+            'api_calls_made': bloxlink_limiter.daily_used,
+            'quota_remaining': bloxlink_limiter.daily_remaining,
+            'quota_limit': bloxlink_limiter.daily_limit,
+            'quota_reset_time': bloxlink_limiter.reset_timestamp,
             'oldest_cache': oldest,
             'newest_cache': newest
         }
@@ -1385,7 +1652,7 @@ class BloxlinkAPI:
         max_consecutive_failures = 10
         max_total_failures = 30
 
-        print(f"🔍 Starting bulk Bloxlink check for {total} users...")
+        logger.info(f"🔍 Starting bulk Bloxlink check for {total} users...")
 
         # ✅ BATCH 1: Get cached results from DATABASE
         cached_ids = []
@@ -1412,91 +1679,139 @@ class BloxlinkAPI:
                 uncached_ids.append(discord_id)
 
         if cached_ids:
-            print(f"📦 Retrieved {len(cached_ids)} entries from cache")
+            logger.info(f"📦 Retrieved {len(cached_ids)} entries from cache")
         if uncached_ids:
-            print(f"🌐 Need to fetch {len(uncached_ids)} from API...")
-
-        # ✅ BATCH 2: Fetch only uncached users
-        for i, discord_id in enumerate(uncached_ids, 1):
-            username, roblox_id, status = await self.get_bloxlink_data(discord_id, guild_id)
-
-            results[discord_id] = {
-                'roblox_username': username,
-                'roblox_user_id': roblox_id,
-                'status': status
-            }
-
-            # 🚫 NEW: Stop if quota is exhausted
-            if status == 'quota_exhausted':
-                print(f"\n🚫 STOPPING: Daily API quota exhausted")
-                print(f"   Processed {i}/{len(uncached_ids)} uncached users before hitting limit")
-                print(f"   Cached users: {len(cached_ids)}")
-                print(f"   ⏰ Quota will reset in ~24 hours")
-                # Return results with what we have so far
-                return results
-
-            # Track status
-            if status in ['rate_limited', 'timeout', 'max_retries_exceeded'] or 'api_error' in status:
-                consecutive_failures += 1
-            else:
-                consecutive_failures = 0
-
-            if status == 'rate_limited':
-                status_counts['rate_limited'] += 1
-            elif status == 'timeout':
-                status_counts['timeout'] += 1
-            elif 'api_error' in status:
-                status_counts['api_error'] += 1
-            elif status == 'success':
-                status_counts['success'] += 1
-            elif status == 'not_linked':
-                status_counts['not_linked'] += 1
-            else:
-                status_counts['other'] += 1
-
-            total_failures = status_counts['rate_limited'] + status_counts['timeout'] + status_counts['api_error']
-
-            # Safety checks
-            if consecutive_failures >= max_consecutive_failures:
-                print(f"\n❌ TERMINATING: Hit {consecutive_failures} consecutive failures!")
-                return None
-
-            if total_failures >= max_total_failures:
-                print(f"\n❌ TERMINATING: Hit {total_failures} total failures!")
-                return None
-
-            # Progress callback
-            if progress_callback:
-                await progress_callback(len(cached_ids) + i, total, status_counts)
+            logger.info(f"🌐 Need to fetch {len(uncached_ids)} from API...")
+
+        # ✅ BATCH 2: Fetch uncached users with a bounded worker pool (the shared
+        # limiter still paces requests). Results are handled as they complete and
+        # Roblox usernames are resolved in batches before caching.
+        pending = asyncio.Queue()
+        for discord_id in uncached_ids:
+            pending.put_nowait(discord_id)
+        completed = asyncio.Queue()
+        unresolved = {}  # discord_id -> roblox_id still needing a username
+
+        async def fetch_worker(session):
+            while True:
+                try:
+                    discord_id = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    result = await self._fetch_bloxlink_data(discord_id, guild_id, session=session,
+                                                             resolve_username=False)
+                except Exception as e:
+                    result = (None, None, f"error_{type(e).__name__}")
+                BLOXLINK_LOOKUPS.inc(source='api', result=result[2])
+                await completed.put((discord_id, result))
 
-            if i % 10 == 0 or i == len(uncached_ids):
-                print(f"Progress: {len(cached_ids) + i}/{total} | "
-                      f"📦 Cached: {status_counts['cached']} | "
-                      f"✅ Success: {status_counts['success']} | "
-                      f"❌ Not Linked: {status_counts['not_linked']}")
+        async def resolve_usernames(session):
+            if not unresolved:
+                return
+            batch = dict(unresolved)
+            unresolved.clear()
+            names = await self._get_roblox_usernames(sorted(set(batch.values())), session=session)
+            for discord_id, roblox_id in batch.items():
+                username = names.get(roblox_id, 'Unknown')
+                results[discord_id]['roblox_username'] = username
+                await self._cache_data(discord_id, username, roblox_id, "success")
+
+        async with aiohttp.ClientSession() as session:
+            workers = [asyncio.create_task(fetch_worker(session))
+                       for _ in range(min(BLOXLINK_FETCH_CONCURRENCY, len(uncached_ids)))]
+            try:
+                for i in range(1, len(uncached_ids) + 1):
+                    discord_id, (username, roblox_id, status) = await completed.get()
 
-        print(f"\n✅ Bulk check complete!")
+                    results[discord_id] = {
+                        'roblox_username': username,
+                        'roblox_user_id': roblox_id,
+                        'status': status
+                    }
+                    if status == 'success' and roblox_id:
+                        unresolved[discord_id] = roblox_id
+                        if len(unresolved) >= ROBLOX_USERS_BATCH_SIZE:
+                            await resolve_usernames(session)
+
+                    # 🚫 NEW: Stop if quota is exhausted
+                    if status == 'quota_exhausted':
+                        logger.error(f"\n🚫 STOPPING: Daily API quota exhausted")
+                        logger.info(f"   Processed {i}/{len(uncached_ids)} uncached users before hitting limit")
+                        logger.info(f"   Cached users: {len(cached_ids)}")
+                        logger.info(f"   ⏰ Quota will reset in ~24 hours")
+                        # Return results with what we have so far
+                        return results
+
+                    # Track status
+                    if status in ['rate_limited', 'timeout', 'max_retries_exceeded'] or 'api_error' in status:
+                        consecutive_failures += 1
+                    else:
+                        consecutive_failures = 0
+
+                    if status == 'rate_limited':
+                        status_counts['rate_limited'] += 1
+                    elif status == 'timeout':
+                        status_counts['timeout'] += 1
+                    elif 'api_error' in status:
+                        status_counts['api_error'] += 1
+                    elif status == 'success':
+                        status_counts['success'] += 1
+                    elif status == 'not_linked':
+                        status_counts['not_linked'] += 1
+                    else:
+                        status_counts['other'] += 1
+
+                    total_failures = status_counts['rate_limited'] + status_counts['timeout'] + status_counts['api_error']
+
+                    # Safety checks
+                    if consecutive_failures >= max_consecutive_failures:
+                        logger.error(f"\n❌ TERMINATING: Hit {consecutive_failures} consecutive failures!")
+                        return None
+
+                    if total_failures >= max_total_failures:
+                        logger.error(f"\n❌ TERMINATING: Hit {total_failures} total failures!")
+                        return None
+
+                    # Progress callback
+                    if progress_callback:
+                        await progress_callback(len(cached_ids) + i, total, status_counts)
+
+                    if i % 10 == 0 or i == len(uncached_ids):
+                        progress_logger.info(f"Progress: {len(cached_ids) + i}/{total} | "
+                                             f"📦 Cached: {status_counts['cached']} | "
+                                             f"✅ Success: {status_counts['success']} | "
+                                             f"❌ Not Linked: {status_counts['not_linked']}")
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                # Successes already paid for are named and cached even when stopping early
+                await resolve_usernames(session)
+
+        logger.info(f"\n✅ Bulk check complete!")
         if cached_ids:
-            print(f"   📦 Used cache: {len(cached_ids)} entries (0 API calls)")
+            logger.info(f"   📦 Used cache: {len(cached_ids)} entries (0 API calls)")
         if uncached_ids:
-            print(f"   🌐 Fetched fresh: {len(uncached_ids)} entries ({len(uncached_ids)} API calls)")
-        print(f"   ✅ Total Success: {status_counts['success']}")
+            logger.info(f"   🌐 Fetched fresh: {len(uncached_ids)} entries ({len(uncached_ids)} API calls)")
+        logger.info(f"   ✅ Total Success: {status_counts['success']}")
         if status_counts['cached'] > 0:
-            print(f"   💾 Cache Efficiency: {(status_counts['cached'] / total) * 100:.1f}%")
+            logger.info(f"   💾 Cache Efficiency: {(status_counts['cached'] / total) * 100:.1f}%")
 
         return results
     async def cleanup_expired_cache(self):
         """
-        Remove expired cache entries from database
+        Remove cache entries past the stale-while-revalidate window
         Run this periodically (e.g., daily) to keep database clean
         """
         async with db.pool.acquire() as conn:
             deleted = await conn.execute(
-                'DELETE FROM bloxlink_cache WHERE expires_at <= NOW()'
+                'DELETE FROM bloxlink_cache WHERE expires_at <= NOW() - make_interval(secs => $1::int)',
+                BLOXLINK_STALE_SECONDS
             )
             count = int(deleted.split()[-1])  # Extract count from "DELETE X"
 
-        print(f"🧹 Cleaned up {count} expired cache entries")
+        logger.info(f"🧹 Cleaned up {count} expired cache entries")
         return count
 
 class PaginatedEmbedView(discord.ui.View):
@@ -1575,23 +1890,20 @@ class CallsignCog(commands.Cog):
         self.bloxlink_api = BloxlinkAPI()
         self.last_bloxlink_sync = None
         self.bloxlink_sync_interval = 86400  # 1 hour in seconds
-        self.auto_sync_loop.start()
-        self.cleanup_cache_loop.start()
         self.db_ready = False
 
     def cog_unload(self):
         """Stop all background tasks when cog is unloaded"""
-        print("🛑 Unloading CallsignCog...")
-
-        if self.auto_sync_loop.is_running():
-            self.auto_sync_loop.cancel()
-            print("   ✅ Auto-sync loop stopped")
+        logger.info("🛑 Unloading CallsignCog...")
 
-        if self.cleanup_cache_loop.is_running():
-            self.cleanup_cache_loop.cancel()
-            print("   ✅ Cache cleanup loop stopped")
+        scheduler.unregister('callsign.auto_sync')
+        scheduler.unregister('callsign.cleanup_cache')
+        scheduler.unregister('callsign.bloxlink_quota_checkpoint')
+        scheduler.unregister('callsign.bloxlink_revalidate')
+        asyncio.create_task(bloxlink_limiter.checkpoint())
+        logger.info("   ✅ Scheduled jobs stopped")
 
-        print("✅ CallsignCog unloaded")
+        logger.info("✅ CallsignCog unloaded")
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -1599,7 +1911,7 @@ class CallsignCog(commands.Cog):
         if self.db_ready:
             return  # Already initialized
 
-        print("🔄 CallsignCog initializing...")
+        logger.info("🔄 CallsignCog initializing...")
 
         # Wait for database with timeout
         max_wait_time = 60
@@ -1611,56 +1923,70 @@ class CallsignCog(commands.Cog):
                     async with db.pool.acquire() as conn:
                         await conn.fetchval('SELECT 1')
 
-                    print("✅ Database connection verified")
+                    logger.info("✅ Database connection verified")
                     self.db_ready = True
                     break
                 except Exception as e:
-                    print(f"⚠️ Database connection test failed: {e}")
+                    logger.warning(f"⚠️ Database connection test failed: {e}")
 
             elapsed = asyncio.get_event_loop().time() - start_time
             if elapsed > max_wait_time:
-                print("❌ Database failed to connect within 60 seconds")
-                print("⚠️ COG LOADED WITHOUT DATABASE - Some features may not work!")
+                logger.error("❌ Database failed to connect within 60 seconds")
+                logger.warning("⚠️ COG LOADED WITHOUT DATABASE - Some features may not work!")
                 self.db_ready = False
                 return
 
-            print(f"⏳ Waiting for database connection... ({int(elapsed)}s/{max_wait_time}s)")
+            logger.info(f"⏳ Waiting for database connection... ({int(elapsed)}s/{max_wait_time}s)")
             await asyncio.sleep(5)
 
         # Start background tasks only if database is ready
         if self.db_ready:
-            print("🚀 Starting background tasks...")
+            logger.info("🚀 Starting background tasks...")
+
+            await scheduler.register(
+                'callsign.auto_sync', self.auto_sync_loop,
+                interval=self.sync_interval * 60, jitter=60, lock_timeout=3600
+            )
+            logger.info("   ✅ Auto-sync job registered")
 
-            if not self.auto_sync_loop.is_running():
-                self.auto_sync_loop.start()
-                print("   ✅ Auto-sync loop started")
+            await scheduler.register(
+                'callsign.cleanup_cache', self.cleanup_cache_loop,
+                interval=86400, jitter=600, run_immediately=False
+            )
+            logger.info("   ✅ Cache cleanup job registered")
 
-            if not self.cleanup_cache_loop.is_running():
-                self.cleanup_cache_loop.start()
-                print("   ✅ Cache cleanup loop started")
+            await bloxlink_limiter.seed()
+            await scheduler.register(
+                'callsign.bloxlink_quota_checkpoint', bloxlink_limiter.checkpoint,
+                interval=LIMITER_CHECKPOINT_SECONDS, durable=False, run_immediately=False
+            )
+            await scheduler.register(
+                'callsign.bloxlink_revalidate', self.revalidate_bloxlink_cache_loop,
+                interval=BLOXLINK_REVALIDATE_INTERVAL_SECONDS, jitter=60, run_immediately=False
+            )
 
             try:
                 await self.reload_data()
-                print("   ✅ Initial data loaded")
+                logger.info("   ✅ Initial data loaded")
             except Exception as e:
-                print(f"   ⚠️ Error loading initial data: {e}")
+                logger.warning(f"   ⚠️ Error loading initial data: {e}")
         else:
-            print("⚠️ Background tasks NOT started - database unavailable")
+            logger.warning("⚠️ Background tasks NOT started - database unavailable")
 
-        print("✅ CallsignCog ready")
+        logger.info("✅ CallsignCog ready")
 
     async def reload_data(self):
         """Reload data from database"""
         if not self.db_ready:
-            print("⚠️ Cannot reload data - database not ready")
+            logger.warning("⚠️ Cannot reload data - database not ready")
             return
 
         try:
             async with db.pool.acquire() as conn:
                 self.active_watches = await conn.fetch("SELECT * FROM callsigns;")
-            print(f"✅ Reloaded {len(self.active_watches)} callsigns from database")
+            logger.info(f"✅ Reloaded {len(self.active_watches)} callsigns from database")
         except Exception as e:
-            print(f"❌ Error reloading data: {e}")
+            logger.error(f"❌ Error reloading data: {e}")
             raise
 
     @staticmethod
@@ -1741,6 +2067,7 @@ class CallsignCog(commands.Cog):
                                 'DELETE FROM callsigns WHERE discord_user_id = $1',
                                 record['discord_user_id']
                             )
+                        callsign_registry.release(record['discord_user_id'])
                         await sheets_manager.remove_callsign_from_sheets(record['discord_user_id'])
                         stats['removed_inactive'] += 1
 
@@ -1761,7 +2088,7 @@ class CallsignCog(commands.Cog):
                 )
 
                 if not result or not result['last_sync_at']:
-                    print("ℹ️ No previous Bloxlink sync found - will perform initial sync")
+                    logger.info("ℹ️ No previous Bloxlink sync found - will perform initial sync")
                     return True
 
                 last_sync = result['last_sync_at']
@@ -1770,13 +2097,13 @@ class CallsignCog(commands.Cog):
                 # Sync every 24 hours (86400 seconds)
                 if time_since_sync >= 86400:
                     hours_since = int(time_since_sync / 3600)
-                    print(f"🔄 Bloxlink cache expired ({hours_since}h old) - refresh needed")
+                    logger.info(f"🔄 Bloxlink cache expired ({hours_since}h old) - refresh needed")
                     return True
                 else:
                     return False
 
         except Exception as e:
-            print(f"⚠️ Error checking sync status: {e}")
+            logger.warning(f"⚠️ Error checking sync status: {e}")
             # If error, assume sync is needed to be safe
             return True
 
@@ -1790,9 +2117,9 @@ class CallsignCog(commands.Cog):
                        DO
                     UPDATE SET last_sync_at = NOW()'''
                 )
-            print("✅ Recorded Bloxlink sync time to database")
+            logger.info("✅ Recorded Bloxlink sync time to database")
         except Exception as e:
-            print(f"⚠️ Error recording sync time: {e}")
+            logger.warning(f"⚠️ Error recording sync time: {e}")
 
     async def _get_sync_schedule_info(self) -> tuple[int, int]:
         """
@@ -1819,22 +2146,38 @@ class CallsignCog(commands.Cog):
         except:
             return (0, 0)
 
-    @tasks.loop(hours=1)
     async def auto_sync_loop(self):
         """Enhanced background task with intelligent Bloxlink caching"""
         if db.pool is None:
-            print("⚠️ Auto-sync skipped: database not connected")
+            logger.warning("⚠️ Auto-sync skipped: database not connected")
             return
 
-        print(f"\n{'=' * 60}")
-        print(f"🔄 Auto-sync started at {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC")
-        print(f"{'=' * 60}")
+        logger.info(f"\n{'=' * 60}")
+        logger.info(f"🔄 Auto-sync started at {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC")
+        logger.info(f"{'=' * 60}")
 
         needs_bloxlink_sync = await self._check_bloxlink_sync_needed()
 
+        # Change-detection gate: only dirty members are reconciled unless a full pass is due
+        sheet_revision = await sheets_manager.get_revision()
+        full_reason = 'Bloxlink cache refresh' if needs_bloxlink_sync else sync_tracker.full_reason(sheet_revision)
+        dirty = sync_tracker.take()
+        if not full_reason and not dirty:
+            logger.info("⏭️ Auto-sync skipped: no members, roles, callsigns or sheet edits changed")
+            sync_tracker.record_pass('skipped')
+            return
+
+        full_sync = bool(full_reason)
+        if full_sync:
+            logger.info(f"🔄 Full reconcile ({full_reason})")
+        else:
+            logger.info(f"🔄 Reconciling {len(dirty)} changed member(s)")
+        sync_failed = False
+        sheet_written = False
+
         for guild in self.bot.guilds:
             if guild.id in EXCLUDED_GUILDS:
-                print(f"⭐️ Skipping auto-sync for excluded guild: {guild.name} ({guild.id})")
+                logger.info(f"⭐️ Skipping auto-sync for excluded guild: {guild.name} ({guild.id})")
                 continue
 
             try:
@@ -1842,21 +2185,25 @@ class CallsignCog(commands.Cog):
 
                 # Phase 1 - Bloxlink Cache Refresh
                 if needs_bloxlink_sync:
-                    print(f"🔄 Starting 24-hour Bloxlink cache refresh for {guild.name}...")
+                    logger.info(f"🔄 Starting 24-hour Bloxlink cache refresh for {guild.name}...")
                     await self._refresh_bloxlink_cache(guild)
                     await self._record_bloxlink_sync_time()
-                    print(f"✅ Bloxlink cache refreshed - valid for next 24 hours")
+                    logger.info(f"✅ Bloxlink cache refreshed - valid for next 24 hours")
 
-                    if BloxlinkAPI._quota_exhausted:
-                        print(f"⚠️ Warning: API quota exhausted during cache refresh")
+                    if bloxlink_limiter.exhausted:
+                        logger.warning(f"⚠️ Warning: API quota exhausted during cache refresh")
                 else:
                     hours_since, hours_until = await self._get_sync_schedule_info()
-                    print(
+                    logger.info(
                         f"📦 Using cached Bloxlink data (refreshed {hours_since}h ago, next refresh in {hours_until}h)")
 
                 # Phase 2: Regular hourly sync using CACHED Bloxlink data
                 async with db.pool.acquire() as conn:
                     callsigns = await conn.fetch('SELECT * FROM callsigns ORDER BY callsign')
+                # Re-anchor the registry on the full table each sync
+                callsign_registry.rebuild(callsigns)
+                # Rows this pass reconciles (everything on a full pass)
+                work = callsigns if full_sync else [r for r in callsigns if r['discord_user_id'] in dirty]
 
                 stats = {
                     'total_callsigns': len(callsigns),
@@ -1888,7 +2235,8 @@ class CallsignCog(commands.Cog):
                 mismatches = await self.detect_database_mismatches(
                     guild=guild,
                     progress_callback=None,
-                    bloxlink_cache={}
+                    bloxlink_cache={},
+                    user_ids=None if full_sync else dirty
                 )
 
                 mismatch_fixes = 0
@@ -1944,7 +2292,8 @@ class CallsignCog(commands.Cog):
                 stats['database_mismatches_fixed'] = mismatch_fixes
 
                 # ✅ NOW process each callsign with centralized logic
-                for record in callsigns:
+                nickname_entries = []
+                for record in work:
                     try:
                         record = dict(record)
                         member = guild.get_member(record['discord_user_id'])
@@ -1953,11 +2302,7 @@ class CallsignCog(commands.Cog):
                             continue
 
                         # Get current ranks from ROLES
-                        current_fenz_prefix = None
-                        for role_id, (rank_name, prefix) in FENZ_RANK_MAP.items():
-                            if any(role.id == role_id for role in member.roles):
-                                current_fenz_prefix = prefix
-                                break
+                        current_fenz_prefix = get_fenz_prefix_from_roles(member.roles)
 
                         stored_hhstj_prefix = record.get('hhstj_prefix', '')
                         current_hhstj_prefix = get_hhstj_prefix_from_roles(member.roles, stored_hhstj_prefix)
@@ -1986,6 +2331,7 @@ class CallsignCog(commands.Cog):
                                                 'UPDATE callsigns SET callsign = $1, fenz_prefix = $2 WHERE discord_user_id = $3',
                                                 "Not Assigned", current_fenz_prefix, member.id
                                             )
+                                        callsign_registry.release(member.id)
 
                                         stats['callsigns_reset'].append({
                                             'member': member,
@@ -2004,6 +2350,7 @@ class CallsignCog(commands.Cog):
                                                 'UPDATE callsigns SET fenz_prefix = $1 WHERE discord_user_id = $2',
                                                 current_fenz_prefix, member.id
                                             )
+                                        callsign_registry.assign(member.id, current_fenz_prefix, db_callsign)
 
                                         db_fenz_prefix = current_fenz_prefix
                                         record['fenz_prefix'] = current_fenz_prefix
@@ -2054,56 +2401,56 @@ class CallsignCog(commands.Cog):
                                 rank_changed = True
                                 stats['rank_updates'] += 1
 
-                        # Check if nickname needs updating
-                        should_update, expected_nickname = should_update_nickname(
+                        # Nicknames are checked in one pass once ranks are settled
+                        nickname_entries.append((
                             member,
                             record.get('fenz_prefix', ''),
                             record.get('callsign', ''),
                             record.get('hhstj_prefix', ''),
                             record.get('roblox_username', '')
-                        )
-
-                        if should_update:
-                            try:
-                                shift_prefix = ""
-                                if member.nick:
-                                    for prefix in ["DUTY | ", "BRK | ", "LOA | "]:
-                                        if member.nick.startswith(prefix):
-                                            shift_prefix = prefix
-                                            break
-
-                                final_nickname = shift_prefix + expected_nickname
-
-                                success, final_nick = await safe_edit_nickname(member, final_nickname)
-
-                                if success:
-                                    current_nick = strip_shift_prefixes(member.nick) if member.nick else member.name
-                                    stats['nickname_changes'].append({
-                                        'member': member,
-                                        'old': current_nick,
-                                        'new': expected_nickname
-                                    })
-                                    stats['nickname_updates'] += 1
-                            except discord.Forbidden:
-                                stats['permission_errors'].append(member)
-                            except Exception as e:
-                                stats['errors'].append({
-                                    'member': member,
-                                    'username': str(member),
-                                    'error': str(e)
-                                })
+                        ))
 
                     except Exception as e:
-                        print(f"Error processing {record.get('discord_username', 'Unknown')}: {e}")
+                        logger.error(f"Error processing {record.get('discord_username', 'Unknown')}: {e}")
                         stats['errors'].append({
                             'member': member if 'member' in locals() else None,
                             'username': record.get('discord_username', 'Unknown'),
                             'error': str(e)
                         })
 
+                for member, expected_nickname in find_nickname_updates(nickname_entries):
+                    try:
+                        shift_prefix = ""
+                        if member.nick:
+                            for prefix in SHIFT_NICKNAME_PREFIXES:
+                                if member.nick.startswith(prefix):
+                                    shift_prefix = prefix
+                                    break
+
+                        final_nickname = shift_prefix + expected_nickname
+
+                        success, final_nick = await safe_edit_nickname(member, final_nickname)
+
+                        if success:
+                            current_nick = strip_shift_prefixes(member.nick) if member.nick else member.name
+                            stats['nickname_changes'].append({
+                                'member': member,
+                                'old': current_nick,
+                                'new': expected_nickname
+                            })
+                            stats['nickname_updates'] += 1
+                    except discord.Forbidden:
+                        stats['permission_errors'].append(member)
+                    except Exception as e:
+                        stats['errors'].append({
+                            'member': member,
+                            'username': str(member),
+                            'error': str(e)
+                        })
+
                 # Continue with batch processing for inactive users, naughty roles, etc.
                 stats, naughty_role_data = await self._process_sync_batch(
-                    guild, callsigns, stats, naughty_role_data
+                    guild, work, stats, naughty_role_data
                 )
 
                 # Sync naughty roles to database (KEEP ALL EXISTING CODE)
@@ -2116,6 +2463,9 @@ class CallsignCog(commands.Cog):
                         current_set = {(r['discord_user_id'], r['role_id']) for r in naughty_role_data}
                         to_add = current_set - stored_set
                         to_remove = stored_set - current_set
+                        if not full_sync:
+                            # Only the reconciled members were scanned
+                            to_remove = {(user_id, role_id) for user_id, role_id in to_remove if user_id in dirty}
 
                         for user_id, role_id in to_add:
                             role_info = next(r for r in naughty_role_data if
@@ -2168,7 +2518,8 @@ class CallsignCog(commands.Cog):
                 # Sync to Google Sheets (KEEP ALL EXISTING CODE)
                 if callsigns:
                     callsign_data = []
-                    sheet_callsigns = await sheets_manager.get_all_callsigns_from_sheets()
+                    # Unchanged sheet revision means no hand-added rows to import
+                    sheet_callsigns = await sheets_manager.get_all_callsigns_from_sheets() if full_sync else []
                     sheet_map = {cs['discord_user_id']: cs for cs in sheet_callsigns}
                     db_map = {record['discord_user_id']: dict(record) for record in callsigns}
 
@@ -2202,36 +2553,51 @@ class CallsignCog(commands.Cog):
                                     stats['added_users'].append({'member': member, 'callsign': callsign_display})
                                     stats['added_from_sheets'] += 1
                                 else:
-                                    print(f"⚠️ Auto-sync: Could not get Bloxlink for {member.id}: {status}")
+                                    logger.warning(f"⚠️ Auto-sync: Could not get Bloxlink for {member.id}: {status}")
 
                     if stats['added_from_sheets'] > 0:
                         async with db.pool.acquire() as conn:
                             callsigns = await conn.fetch('SELECT * FROM callsigns ORDER BY callsign')
                         stats['total_callsigns'] = len(callsigns)
 
-                    for record in callsigns:
-                        member = guild.get_member(record['discord_user_id'])
-                        if not member:
-                            continue
-
-                        rank_type, rank_data = sheets_manager.determine_rank_type(member.roles)
-                        is_command_rank = (rank_type == 'command')
-
-                        callsign_data.append({
-                            'fenz_prefix': record['fenz_prefix'] or '',
-                            'hhstj_prefix': record['hhstj_prefix'] or '',
-                            'callsign': record['callsign'],
-                            'discord_user_id': record['discord_user_id'],
-                            'discord_username': record['discord_username'],
-                            'roblox_user_id': record['roblox_user_id'],
-                            'roblox_username': record['roblox_username'],
-                            'is_command': is_command_rank,
-                            'strikes': sheets_manager.determine_strikes_value(member.roles),
-                            'qualifications': sheets_manager.determine_qualifications(member.roles, is_command_rank)
-                        })
+                    write_sheet = full_sync
+                    if not full_sync:
+                        # Only rewrite the sheet if a reconciled member's row would change
+                        async with db.pool.acquire() as conn:
+                            dirty_records = await conn.fetch(
+                                'SELECT * FROM callsigns WHERE discord_user_id = ANY($1::bigint[])', list(dirty)
+                            )
+                        dirty_rows = dict.fromkeys(dirty)
+                        for record in dirty_records:
+                            member = guild.get_member(record['discord_user_id'])
+                            if member:
+                                dirty_rows[record['discord_user_id']] = tuple(build_sheet_entry(record, member).values())
 
-                    callsign_data.sort(key=lambda x: get_rank_sort_key(x['fenz_prefix'], x['hhstj_prefix']))
-                    await sheets_manager.batch_update_callsigns(callsign_data)
+                        write_sheet = sync_tracker.sheet_rows_changed(dirty_rows)
+                        if write_sheet:
+                            # Ranks and callsigns may have been updated earlier in this pass
+                            async with db.pool.acquire() as conn:
+                                callsigns = await conn.fetch('SELECT * FROM callsigns ORDER BY callsign')
+                        else:
+                            logger.info("⏭️ Sheets unchanged for the reconciled members - skipping sheet write")
+
+                    if write_sheet:
+                        sheet_rows = {}
+                        for record in callsigns:
+                            member = guild.get_member(record['discord_user_id'])
+                            if not member:
+                                continue
+
+                            entry = build_sheet_entry(record, member)
+                            callsign_data.append(entry)
+                            sheet_rows[record['discord_user_id']] = tuple(entry.values())
+
+                        callsign_data.sort(key=lambda x: get_rank_sort_key(x['fenz_prefix'], x['hhstj_prefix']))
+                        sheet_written = True
+                        if await sheets_manager.batch_update_callsigns(callsign_data):
+                            sync_tracker.sheet_rows_written(sheet_rows)
+                        else:
+                            sync_tracker.sheet_rows_written(None)
 
                     # ✅ NEW: Track cache efficiency
                     cache_stats_after = await self.bloxlink_api.get_cache_stats()
@@ -2244,48 +2610,47 @@ class CallsignCog(commands.Cog):
                     # ✅ MODIFIED: Enhanced logging with cache stats
                     await self.send_detailed_sync_log(self.bot, guild.name, stats, sync_duration)
 
-                    print(f"✅ Auto-sync completed for guild {guild.name}:")
-                    print(f"    📊 {stats['total_callsigns']} callsigns synced")
-                    print(f"    👥 {stats['members_found']} members found / {stats['members_not_found']} not in server")
-                    print(
+                    logger.info(f"✅ Auto-sync completed for guild {guild.name}:")
+                    logger.info(f"    📊 {stats['total_callsigns']} callsigns synced")
+                    logger.info(f"    👥 {stats['members_found']} members found / {stats['members_not_found']} not in server")
+                    logger.info(
                         f"    📦 Bloxlink cache hits: {stats['bloxlink_cache_hits']} (API calls: {stats['bloxlink_api_calls']})")
                     if stats['bloxlink_api_calls'] == 0:
-                        print(f"    ✅ Zero API calls - using 100% cached data!")
+                        logger.info(f"    ✅ Zero API calls - using 100% cached data!")
                         # Show quota status
-                    if BloxlinkAPI._quota_exhausted:
-                        print(f"    🚫 API QUOTA EXHAUSTED - waiting for reset")
-                        if BloxlinkAPI._quota_reset_time:
-                            reset_time = datetime.utcfromtimestamp(BloxlinkAPI._quota_reset_time)
-                            print(f"    ⏰ Resets at: {reset_time.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+                    if bloxlink_limiter.exhausted:
+                        logger.error(f"    🚫 API QUOTA EXHAUSTED - waiting for reset")
+                        if bloxlink_limiter.reset_at:
+                            reset_time = bloxlink_limiter.reset_at
+                            logger.info(f"    ⏰ Resets at: {reset_time.strftime('%Y-%m-%d %H:%M:%S')} UTC")
                     else:
-                        remaining = max(0, BloxlinkAPI._quota_limit - BloxlinkAPI._api_calls_made)
-                        print(f"    📊 API Quota remaining: {remaining}/{BloxlinkAPI._quota_limit}")
+                        logger.info(f"    📊 API Quota remaining: "
+                                    f"{bloxlink_limiter.daily_remaining}/{bloxlink_limiter.daily_limit}")
                     if stats['nickname_updates'] > 0:
-                        print(f"    🏷️ {stats['nickname_updates']} nicknames updated")
+                        logger.info(f"    🏷️ {stats['nickname_updates']} nicknames updated")
                     if stats['added_from_sheets'] > 0:
-                        print(f"    ➕ {stats['added_from_sheets']} added from sheets")
+                        logger.info(f"    ➕ {stats['added_from_sheets']} added from sheets")
                     if stats['removed_inactive'] > 0:
-                        print(f"    🗑️ {stats['removed_inactive']} removed (inactive 7+ days)")
+                        logger.info(f"    🗑️ {stats['removed_inactive']} removed (inactive 7+ days)")
                     if stats['callsigns_reset']:
-                        print(f"    🔄 {len(stats['callsigns_reset'])} callsigns reset due to rank changes")
+                        logger.info(f"    🔄 {len(stats['callsigns_reset'])} callsigns reset due to rank changes")
                     if stats['naughty_roles_found'] > 0:
-                        print(f"    🚨 {stats['naughty_roles_found']} naughty roles found")
-                        print(f"    💾 {stats['naughty_roles_stored']} new naughty roles stored")
-                        print(f"    ✂️ {stats['naughty_roles_removed']} naughty roles removed")
+                        logger.info(f"    🚨 {stats['naughty_roles_found']} naughty roles found")
+                        logger.info(f"    💾 {stats['naughty_roles_stored']} new naughty roles stored")
+                        logger.info(f"    ✂️ {stats['naughty_roles_removed']} naughty roles removed")
                     if stats['permission_errors']:
-                        print(f"    ⚠️ {len(stats['permission_errors'])} permission errors")
+                        logger.warning(f"    ⚠️ {len(stats['permission_errors'])} permission errors")
                     if stats['errors']:
                         non_perm_errors = [e for e in stats['errors'] if e['error'] != 'Missing permissions']
                         if non_perm_errors:
-                            print(f"    ⚠️ {len(non_perm_errors)} other errors occurred")
+                            logger.warning(f"    ⚠️ {len(non_perm_errors)} other errors occurred")
                     if stats.get('database_mismatches_fixed', 0) > 0:
-                        print(f"    🔧 {stats['database_mismatches_fixed']} database mismatches fixed")
-                    print(f"    ⏱️ Completed in {sync_duration:.2f}s")
+                        logger.info(f"    🔧 {stats['database_mismatches_fixed']} database mismatches fixed")
+                    logger.info(f"    ⏱️ Completed in {sync_duration:.2f}s")
 
             except Exception as e:
-                print(f"❌ Error during auto-sync for {guild.name}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"❌ Error during auto-sync for {guild.name}: {e}")
+                sync_failed = True
 
                 try:
                     await self.send_sync_log(
@@ -2300,44 +2665,39 @@ class CallsignCog(commands.Cog):
 
                 try:
                     stats, naughty_role_data = await self._process_sync_batch(
-                        guild, callsigns, stats, naughty_role_data
+                        guild, work, stats, naughty_role_data
                     )
                 except Exception as recovery_error:
-                    print(f"❌ Error during error recovery: {recovery_error}")
-
+                    logger.error(f"❌ Error during error recovery: {recovery_error}")
 
-    @auto_sync_loop.before_loop
-    async def before_auto_sync(self):
-        """Wait for bot AND database to be ready before starting auto-sync"""
-        await self.bot.wait_until_ready()
-
-        # Wait for database connection with timeout
-        max_wait = 60  # Maximum 60 seconds wait
-        waited = 0
-        while db.pool is None and waited < max_wait:
-            print(f"⏳ Auto-sync waiting for database connection... ({waited}s)")
-            await asyncio.sleep(5)
-            waited += 5
-
-        if db.pool is None:
-            print("❌ Auto-sync failed to start: Database not connected after 60s")
+        if sync_failed:
+            # Retry the same members next pass, and the full reconcile if this was one
+            sync_tracker.mark(*dirty)
+            if full_sync:
+                sync_tracker.request_full('previous full pass failed')
         else:
-            print("✅ Auto-sync ready - database connected")
+            if full_sync:
+                sync_tracker.full_done()
+            # Our own sheet writes bump the revision; don't mistake them for a manual edit
+            sync_tracker.sheet_written(await sheets_manager.get_revision() if sheet_written else sheet_revision)
+        sync_tracker.record_pass('full' if full_sync else 'partial')
 
-    @tasks.loop(hours=24)
     async def cleanup_cache_loop(self):
         """Clean up expired cache entries daily"""
         await self.bloxlink_api.cleanup_expired_cache()
 
-    @cleanup_cache_loop.before_loop
-    async def before_cleanup_cache(self):
-        """Wait for bot and database to be ready before cleanup"""
-        if not self.db_ready:
-            print("⚠️ Cache cleanup skipped - database not ready")
-            self.cleanup_cache_loop.cancel()
+    async def revalidate_bloxlink_cache_loop(self):
+        """Refresh this slice of soon-to-expire Bloxlink cache entries"""
+        if db.pool is None or not BLOXLINK_API_KEY:
             return
 
-        await asyncio.sleep(1)
+        guild = next((g for g in self.bot.guilds if g.id not in EXCLUDED_GUILDS), None)
+        if guild is None:
+            return
+
+        refreshed = await self.bloxlink_api.revalidate_due_entries(guild.id)
+        if refreshed:
+            logger.info(f"🔄 Revalidated {refreshed} Bloxlink cache entries")
 
     async def _refresh_bloxlink_cache(self, guild: discord.Guild):
         """
@@ -2352,17 +2712,17 @@ class CallsignCog(commands.Cog):
             discord_ids = [record['discord_user_id'] for record in user_ids]
 
             if not discord_ids:
-                print("ℹ️ No users in database to cache")
+                logger.info("ℹ️ No users in database to cache")
                 return
 
-            print(f"🔄 Starting 24-hour Bloxlink cache refresh for {len(discord_ids)} users...")
-            print(f"⏰ This will take a few minutes but ensures fresh data for the next 24 hours")
+            logger.info(f"🔄 Starting 24-hour Bloxlink cache refresh for {len(discord_ids)} users...")
+            logger.info(f"⏰ This will take a few minutes but ensures fresh data for the next 24 hours")
 
             # Use bulk check with progress tracking
             async def cache_progress(current, total, status_counts):
                 if current % 25 == 0 or current == total:
-                    print(f"   📦 Caching progress: {current}/{total} "
-                          f"(✅ {status_counts['success']} | ❌ {status_counts['not_linked']} | 📦 {status_counts.get('cached', 0)} from cache)")
+                    progress_logger.info(f"   📦 Caching progress: {current}/{total} "
+                                         f"(✅ {status_counts['success']} | ❌ {status_counts['not_linked']} | 📦 {status_counts.get('cached', 0)} from cache)")
 
             results = await self.bloxlink_api.bulk_check_bloxlink(
                 discord_ids,
@@ -2371,30 +2731,28 @@ class CallsignCog(commands.Cog):
             )
 
             if results is None:
-                print("⚠️ Bloxlink cache refresh failed - API issues detected")
-                print("   Will retry in next auto-sync cycle")
+                logger.warning("⚠️ Bloxlink cache refresh failed - API issues detected")
+                logger.info("   Will retry in next auto-sync cycle")
                 return
 
             # Cache is automatically updated by bulk_check_bloxlink
             cache_stats = await self.bloxlink_api.get_cache_stats()
-            print(f"✅ 24-hour cache refresh complete:")
-            print(f"   📦 Total cached: {cache_stats['total_cached']}")
-            print(f"   ✅ Valid entries: {cache_stats['valid_entries']}")
-            print(f"   🌐 API calls made: {cache_stats['api_calls_made']}")
-            print(f"   ⏰ Next refresh: 24 hours from now")
-            print(f"   💡 All hourly syncs will use this cached data (0 API calls)")
+            logger.info(f"✅ 24-hour cache refresh complete:")
+            logger.info(f"   📦 Total cached: {cache_stats['total_cached']}")
+            logger.info(f"   ✅ Valid entries: {cache_stats['valid_entries']}")
+            logger.info(f"   🌐 API calls made: {cache_stats['api_calls_made']}")
+            logger.info(f"   ⏰ Next refresh: 24 hours from now")
+            logger.info(f"   💡 All hourly syncs will use this cached data (0 API calls)")
 
         except Exception as e:
-            print(f"❌ Error refreshing Bloxlink cache: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Error refreshing Bloxlink cache: {e}")
 
     async def send_detailed_sync_log(self, bot, guild_name: str, stats: dict, sync_duration: float):
         """Send detailed sync logs with specific changes to designated channel"""
         try:
             channel = bot.get_channel(SYNC_LOG_CHANNEL_ID)
             if not channel:
-                print(f"⚠️ Could not find sync log channel {SYNC_LOG_CHANNEL_ID}")
+                logger.warning(f"⚠️ Could not find sync log channel {SYNC_LOG_CHANNEL_ID}")
                 return
 
             # Main summary embed
@@ -2427,10 +2785,10 @@ class CallsignCog(commands.Cog):
                 )
 
                 # Quota status warning if exhausted
-                if BloxlinkAPI._quota_exhausted:
+                if bloxlink_limiter.exhausted:
                     quota_text = "<:No:1437788507111428228> **API QUOTA EXHAUSTED**\n"
-                    if BloxlinkAPI._quota_reset_time:
-                        quota_text += f"Resets: <t:{int(BloxlinkAPI._quota_reset_time)}:R>"
+                    if bloxlink_limiter.reset_timestamp:
+                        quota_text += f"Resets: <t:{int(bloxlink_limiter.reset_timestamp)}:R>"
                     else:
                         quota_text += "Will reset in ~24 hours"
 
@@ -2524,7 +2882,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     await channel.send(embed=embed)
@@ -2555,7 +2913,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     await channel.send(embed=embed)
@@ -2591,7 +2949,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     await channel.send(embed=embed)
@@ -2642,7 +3000,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     await channel.send(embed=embed)
@@ -2667,7 +3025,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     await channel.send(embed=embed)
@@ -2692,7 +3050,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     await channel.send(embed=embed)
@@ -2722,9 +3080,23 @@ class CallsignCog(commands.Cog):
                     await channel.send(embed=embed)
 
         except Exception as e:
-            print(f"❌ Error sending detailed sync log: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Error sending detailed sync log: {e}")
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Mark members for the next auto-sync when sync-relevant roles or their nickname change"""
+        if after.guild.id in EXCLUDED_GUILDS:
+            return
+
+        changed_roles = {role.id for role in before.roles} ^ {role.id for role in after.roles}
+        if before.nick != after.nick or changed_roles & SYNC_RELEVANT_ROLE_IDS:
+            sync_tracker.mark(after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        """Leavers are reconciled (last seen / inactive removal) on the next auto-sync"""
+        if member.guild.id not in EXCLUDED_GUILDS:
+            sync_tracker.mark(member.id)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -2733,6 +3105,8 @@ class CallsignCog(commands.Cog):
         if member.guild.id in EXCLUDED_GUILDS:
             return
 
+        sync_tracker.mark(member.id)
+
         try:
             async with db.pool.acquire() as conn:
                 # Get all active naughty roles for this user
@@ -2804,9 +3178,7 @@ class CallsignCog(commands.Cog):
                     await channel.send(embed=embed)
 
         except Exception as e:
-            print(f"Error restoring naughty roles for {member.id}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error restoring naughty roles for {member.id}: {e}")
 
     @staticmethod
     async def send_callsign_request_log(bot, user: discord.Member, callsign: str, fenz_prefix: str,
@@ -2815,7 +3187,7 @@ class CallsignCog(commands.Cog):
         try:
             channel = bot.get_channel(CALLSIGN_REQUEST_LOG_CHANNEL_ID)
             if not channel:
-                print(f"Could not find callsign request log channel {CALLSIGN_REQUEST_LOG_CHANNEL_ID}")
+                logger.error(f"Could not find callsign request log channel {CALLSIGN_REQUEST_LOG_CHANNEL_ID}")
                 return
 
             embed = discord.Embed(
@@ -2845,23 +3217,14 @@ class CallsignCog(commands.Cog):
 
             await channel.send(embed=embed)
         except Exception as e:
-            print(f"<:Denied:1426930694633816248> Error sending callsign request log: {e}")
-
-    @auto_sync_loop.before_loop
-    async def before_auto_sync(self):
-        """
-        This still runs before each loop iteration, but we've already
-        verified the database in cog_load(), so just do a simple check.
-        """
-        if not self.db_ready:
-            print("⚠️ Auto-sync skipped - database not ready")
-            self.auto_sync_loop.cancel()
-            return
+            logger.error(f"<:Denied:1426930694633816248> Error sending callsign request log: {e}")
 
-        # Optional: Add a small delay to ensure everything is truly ready
-        await asyncio.sleep(1)
+    async def search_callsign_database(self, query: str, search_type: str,
+                                       limit: int = CALLSIGN_SEARCH_LIMIT) -> list:
+        if search_type == 'any':
+            # Ranked, bounded search over callsign, Roblox and Discord names (trigram indexes)
+            return await db.search_callsigns(query, limit=limit)
 
-    async def search_callsign_database(self, query: str, search_type: str) -> list:
         async with db.pool.acquire() as conn:
             if search_type == 'discord_id':
                 rows = await conn.fetch(
@@ -3127,7 +3490,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     embeds.append(embed)
@@ -3154,7 +3517,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     embeds.append(embed)
@@ -3187,7 +3550,7 @@ class CallsignCog(commands.Cog):
                         )
 
                     if get_embed_size(embed) > 5500:
-                        print(f"⚠️ Embed too large, skipping")
+                        logger.warning(f"⚠️ Embed too large, skipping")
                         continue
 
                     embeds.append(embed)
@@ -3221,8 +3584,7 @@ class CallsignCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error during sync: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in sync_callsigns")
 
 
     @cs_group.command(name="assign", description="Assign a callsign to a user")
@@ -3399,7 +3761,7 @@ class CallsignCog(commands.Cog):
                 )
 
             try:
-                await user.edit(nick=new_nickname)
+                await member_edits.apply(user, nick=new_nickname, debounce=0)
             except discord.Forbidden:
                 await interaction.followup.send(
                     f"Callsign assigned but couldn't update nickname (lacking permissions). "
@@ -3439,8 +3801,7 @@ class CallsignCog(commands.Cog):
 
         except Exception as e:
             await interaction.followup.send(f"❌ Error assigning callsign: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in assign_callsign")
 
     @callsign_group.command(name="lookup", description="Look up a callsign")
     @app_commands.describe(user="The user to lookup the callsign for")
@@ -3461,6 +3822,7 @@ class CallsignCog(commands.Cog):
 
         try:
             results = []
+            closest_matches = False
 
             if callsign:
                 # Handle BLANK callsign lookups
@@ -3471,12 +3833,20 @@ class CallsignCog(commands.Cog):
                     )
                     return
 
-                callsign = normalize_callsign(callsign)
+                # Autocomplete values (and typed input) may be PREFIX-NUMBER
+                prefix, _, number = callsign.strip().rpartition('-')
+                if prefix and number:
+                    result = await check_callsign_exists(normalize_callsign(number), prefix.upper())
+                else:
+                    result = await check_callsign_exists(normalize_callsign(callsign))
 
-                # Search by callsign
-                result = await check_callsign_exists(callsign)
                 if result:
                     results = [result]
+                else:
+                    # No exact match - fall back to the best ranked matches
+                    results = await self.search_callsign_database(callsign, 'any',
+                                                                  limit=CALLSIGN_LOOKUP_FALLBACK_RESULTS)
+                    closest_matches = True
             elif user:
                 # Search by Discord user
                 results = await self.search_callsign_database(str(user.id), 'discord_id')
@@ -3489,6 +3859,10 @@ class CallsignCog(commands.Cog):
                 await interaction.followup.send("<:Denied:1426930694633816248> No callsign found.")
                 return
 
+            if closest_matches:
+                await interaction.followup.send(
+                    f"<:Warn:1437771973970104471> No exact match for `{callsign}` — closest matches:")
+
             # Display results
             for result in results:
                 # Format title based on callsign type
@@ -3632,7 +4006,7 @@ class CallsignCog(commands.Cog):
                                 inline=False
                             )
                     except Exception as e:
-                        print(f"⚠️ Error parsing callsign history: {e}")
+                        logger.warning(f"⚠️ Error parsing callsign history: {e}")
 
                 # ✅ NEW: Current Nickname (from Discord)
                 member = interaction.guild.get_member(result['discord_user_id'])
@@ -3654,13 +4028,39 @@ class CallsignCog(commands.Cog):
                 if member:
                     embed.set_thumbnail(url=member.display_avatar.url)
 
-                await interaction.delete_original_response()
+                if result is results[0]:
+                    await interaction.delete_original_response()
                 await interaction.followup.send(embed=embed, ephemeral=True)
 
         except Exception as e:
             await interaction.followup.send(f"<:Denied:1426930694633816248> Error looking up callsign: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in lookup_callsign")
+
+    @lookup_callsign.autocomplete('callsign')
+    async def lookup_callsign_autocomplete(
+            self,
+            interaction: discord.Interaction,
+            current: str
+    ) -> list[app_commands.Choice[str]]:
+        """Ranked callsign / username matches for the lookup command"""
+        if db.pool is None or not current.strip():
+            return []
+
+        try:
+            rows = await db.search_callsigns(current, limit=CALLSIGN_SEARCH_LIMIT,
+                                             timeout_ms=CALLSIGN_AUTOCOMPLETE_TIMEOUT_MS)
+        except Exception as e:
+            logger.warning(f"⚠️ Callsign autocomplete failed: {e}")
+            return []
+
+        choices = []
+        for row in rows:
+            if row['callsign'] in ("BLANK", "Not Assigned"):
+                continue
+            value = f"{row['fenz_prefix']}-{row['callsign']}" if row['fenz_prefix'] else row['callsign']
+            label = f"{value} • {row['roblox_username'] or row['discord_username'] or row['discord_user_id']}"
+            choices.append(app_commands.Choice(name=label[:100], value=value[:100]))
+        return choices
 
     @cs_group.command(name="remove", description="Remove a callsign from a user")
     @app_commands.check(lambda interaction: any(role.id in UPPER_LEAD for role in interaction.user.roles))
@@ -3704,6 +4104,8 @@ class CallsignCog(commands.Cog):
                     'DELETE FROM callsigns WHERE discord_user_id = $1',
                     user.id
                 )
+            callsign_registry.release(user.id)
+            sync_tracker.mark(user.id)
 
             # Reset nickname to just Roblox username (or get from Bloxlink if needed)
             try:
@@ -3731,7 +4133,7 @@ class CallsignCog(commands.Cog):
             try:
                 await sheets_manager.remove_callsign_from_sheets(user.id)
             except Exception as e:
-                print(f"Warning: Could not remove from sheets: {e}")
+                logger.warning(f"Warning: Could not remove from sheets: {e}")
 
             # Build confirmation message
             embed = discord.Embed(
@@ -3809,8 +4211,7 @@ class CallsignCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error removing callsign: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in remove_callsign")
 
     @callsign_group.command(name="request", description="Request a callsign for yourself")
     @app_commands.describe(callsign="The numeric callsign you want (e.g., 1, 42, 123)")
@@ -3991,27 +4392,27 @@ class CallsignCog(commands.Cog):
 
             success, final_nick = await safe_edit_nickname(interaction.user, new_nickname)
             if not success:
-                print(f"⚠️ Failed to set nickname for {member.id}")
+                logger.warning(f"⚠️ Failed to set nickname for {member.id}")
 
         except discord.HTTPException as e:
             if e.code == 50035:  # Invalid Form Body
-                print(f"⚠️ Nickname too long for {member.id}: '{new_nickname}' ({len(new_nickname)} chars)")
+                logger.warning(f"⚠️ Nickname too long for {member.id}: '{new_nickname}' ({len(new_nickname)} chars)")
                 # Try again with just roblox username
                 success, final_nick = await safe_edit_nickname(interaction.user, new_nickname)
                 if not success:
-                    print(f"⚠️ Failed to set nickname for {member.id}")
+                    logger.warning(f"⚠️ Failed to set nickname for {member.id}")
             else:
                 raise
 
             try:
-                await interaction.user.edit(nick=new_nickname)
+                await member_edits.apply(interaction.user, nick=new_nickname, debounce=0)
             except discord.HTTPException as e:
                 if e.code == 50035:  # Invalid Form Body
-                    print(
+                    logger.warning(
                         f"<:Warn:1437771973970104471> Nickname too long for {interaction.user.id}: '{new_nickname}' ({len(new_nickname)} chars)")
                     # Try with just roblox username
                     try:
-                        await interaction.user.edit(nick=roblox_username[:32])
+                        await member_edits.apply(interaction.user, nick=roblox_username[:32], debounce=0)
                     except:
                         pass
                 else:
@@ -4071,8 +4472,7 @@ class CallsignCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error processing request: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in request_callsign")
 
     @csa_group.command(name="audit",
                             description="Check all users to identify missing or inconsistent data in the Bot's Database")
@@ -4401,18 +4801,21 @@ class CallsignCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error during audit: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in audit_callsigns")
 
     async def detect_database_mismatches(self, guild: discord.Guild, progress_callback=None,
-                                         bloxlink_cache: dict = None):
-        """Detect mismatches with optimized bulk Bloxlink checking"""
+                                         bloxlink_cache: dict = None, user_ids: Set[int] = None):
+        """Detect mismatches with optimized bulk Bloxlink checking (optionally for user_ids only)"""
 
         if bloxlink_cache is None:
             bloxlink_cache = {}
 
         async with db.pool.acquire() as conn:
-            db_callsigns = await conn.fetch('SELECT * FROM callsigns')
+            if user_ids is None:
+                db_callsigns = await conn.fetch('SELECT * FROM callsigns')
+            else:
+                db_callsigns = await conn.fetch('SELECT * FROM callsigns WHERE discord_user_id = ANY($1::bigint[])',
+                                                list(user_ids))
 
         # Collect all uncached IDs upfront
         uncached_ids = [
@@ -4553,8 +4956,8 @@ class CallsignCog(commands.Cog):
 
             # Format quota reset time if available
             quota_reset_text = ""
-            if BloxlinkAPI._quota_exhausted and BloxlinkAPI._quota_reset_time:
-                reset_timestamp = int(BloxlinkAPI._quota_reset_time)
+            if bloxlink_limiter.exhausted and bloxlink_limiter.reset_timestamp:
+                reset_timestamp = int(bloxlink_limiter.reset_timestamp)
                 quota_reset_text = f"\n**Resets:** <t:{reset_timestamp}:R>"
 
             # ✅ NEW: Show last sync time and schedule
@@ -4583,7 +4986,7 @@ class CallsignCog(commands.Cog):
                     inline=True
                 )
 
-            if BloxlinkAPI._quota_exhausted:
+            if bloxlink_limiter.exhausted:
                 quota_status = "<:No:1437788507111428228> EXHAUSTED - Waiting for reset"
             else:
                 quota_status = "🟢 Healthy" if quota_remaining > 250 else "🟡 Moderate" if quota_remaining > 100 else "🔴 Critical"
@@ -4591,7 +4994,7 @@ class CallsignCog(commands.Cog):
             embed.add_field(
                 name="API Usage",
                 value=f"**Calls Made:** {api_calls}\n"
-                      f"**Quota Remaining:** {quota_remaining}/500\n"
+                      f"**Quota Remaining:** {quota_remaining}/{stats['quota_limit']}\n"
                       f"**Status:** {quota_status}{quota_reset_text}",
                 inline=True
             )
@@ -4599,13 +5002,16 @@ class CallsignCog(commands.Cog):
             # Cache settings
             embed.add_field(
                 name="Cache Settings",
-                value=f"**Expiration:** 24 hours\n"
-                      f"**Full Refresh:** Every 1 hour\n"
+                value=f"**Expiration:** {BLOXLINK_CACHE_TTLS['success'] // 3600}h linked / "
+                      f"{BLOXLINK_CACHE_TTLS['not_linked'] // 3600}h not linked\n"
+                      f"**Stale Served:** up to {BLOXLINK_STALE_SECONDS // 86400} days\n"
+                      f"**Revalidation:** every {BLOXLINK_REVALIDATE_INTERVAL_SECONDS // 60} min "
+                      f"(max {BLOXLINK_REVALIDATE_DAILY_BUDGET}/day)\n"
                       f"**Rate Limit:** 50 req/min",
                 inline=True
             )
 
-            if BloxlinkAPI._quota_exhausted:
+            if bloxlink_limiter.exhausted:
                 embed.add_field(
                     name="<:No:1437788507111428228> Quota Exhausted",
                     value="• All API calls are blocked until reset\n"
@@ -4633,9 +5039,10 @@ class CallsignCog(commands.Cog):
                 )
 
             # Check if quota is already exhausted before starting
-            if not await self.bloxlink_api._check_daily_quota():
-                print("🚫 Cannot refresh cache - API quota exhausted")
-                print("   Will use existing cache and retry in next cycle")
+            await bloxlink_limiter.seed()
+            if bloxlink_limiter.exhausted:
+                logger.error("🚫 Cannot refresh cache - API quota exhausted")
+                logger.info("   Will use existing cache and retry in next cycle")
                 return
 
             await interaction.followup.send(embed=embed, ephemeral=True)
@@ -4645,8 +5052,7 @@ class CallsignCog(commands.Cog):
                 f"❌ Error fetching cache stats: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in cache_stats")
 
     @csa_group.command(name="bulk-assign", description="Assign callsigns to all unassigned users")
     @app_commands.describe(database_scan="Check and fix database mismatches before assigning (default: False)")
@@ -4779,8 +5185,7 @@ class CallsignCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in bulk_assign")
 
     async def start_bulk_assign(self, interaction: discord.Interaction, bloxlink_cache: dict = None):
         """Streamlined bulk assign with proper Bloxlink handling"""
@@ -4847,7 +5252,7 @@ class CallsignCog(commands.Cog):
                 nonlocal last_update_time
                 current_time = asyncio.get_event_loop().time()
 
-                print(f"📊 Progress callback called: {current}/{total}")
+                progress_logger.info(f"📊 Progress callback called: {current}/{total}")
 
                 # Only update every 5 members OR every 3 seconds to avoid rate limits
                 if current % 5 == 0 or (current_time - last_update_time) >= 3 or current == total:
@@ -4928,7 +5333,7 @@ class CallsignCog(commands.Cog):
                 # Get from cache (guaranteed to exist now)
                 roblox_username, roblox_id, status = bloxlink_cache[member.id]
 
-                print(f"Bloxlink Result for {member.display_name} ({member.id}): {status}")
+                logger.info(f"Bloxlink Result for {member.display_name} ({member.id}): {status}")
 
                 # Initialize data
                 has_issues = []
@@ -4937,20 +5342,20 @@ class CallsignCog(commands.Cog):
                 if status == 'success' and roblox_id and roblox_username:
                     # Check if username is valid (not Unknown or empty)
                     if roblox_username == 'Unknown' or not roblox_username:
-                        print(f"   ⚠️ Invalid Roblox username for {member.display_name}")
+                        logger.warning(f"   ⚠️ Invalid Roblox username for {member.display_name}")
                         roblox_username = 'MISSING'
                         roblox_id = 'MISSING'
                         has_issues.append('Invalid/deleted Roblox account')
                     else:
-                        print(f"   ✅ Roblox: {roblox_username} (ID: {roblox_id})")
+                        logger.info(f"   ✅ Roblox: {roblox_username} (ID: {roblox_id})")
                 elif status == 'not_linked':
-                    print(f"   ❌ No Bloxlink for {member.display_name}")
+                    logger.error(f"   ❌ No Bloxlink for {member.display_name}")
                     roblox_username = 'MISSING'
                     roblox_id = 'MISSING'
                     has_issues.append('Not linked to Bloxlink')
                 else:
                     # API failure
-                    print(f"   🔴 API failure for {member.display_name}: {status}")
+                    logger.warning(f"   🔴 API failure for {member.display_name}: {status}")
                     roblox_username = 'MISSING'
                     roblox_id = 'MISSING'
                     has_issues.append(f'API Error: {status}')
@@ -4963,17 +5368,17 @@ class CallsignCog(commands.Cog):
                         break
 
                 if not fenz_prefix:
-                    print(f"   ⚠️ No FENZ role for {member.display_name}")
+                    logger.warning(f"   ⚠️ No FENZ role for {member.display_name}")
                     fenz_prefix = 'MISSING'
                     has_issues.append('No valid FENZ rank role')
                 else:
-                    print(f"   ✅ FENZ Rank: {fenz_prefix}")
+                    logger.info(f"   ✅ FENZ Rank: {fenz_prefix}")
 
                 # Add everyone (even with issues for reporting)
                 if has_issues:
-                    print(f"   ⚠️ Adding with issues: {', '.join(has_issues)}")
+                    logger.warning(f"   ⚠️ Adding with issues: {', '.join(has_issues)}")
                 else:
-                    print(f"   ✅ PERFECT: No issues found")
+                    logger.info(f"   ✅ PERFECT: No issues found")
 
                 users_without_callsigns.append({
                     'member': member,
@@ -4989,24 +5394,24 @@ class CallsignCog(commands.Cog):
             await interaction.edit_original_response(embed=status_embed)
 
             # Print summary
-            print("\n" + "=" * 60)
-            print("BLOXLINK CHECK SUMMARY:")
-            print("=" * 60)
-            print(f"Total scanned: {len(members_without_callsigns)}")
+            logger.info("\n" + "=" * 60)
+            logger.info("BLOXLINK CHECK SUMMARY:")
+            logger.info("=" * 60)
+            logger.info(f"Total scanned: {len(members_without_callsigns)}")
 
             eligible = [u for u in users_without_callsigns if not u['has_issues']]
             with_issues = [u for u in users_without_callsigns if u['has_issues']]
 
-            print(f"✅ Eligible (no issues): {len(eligible)}")
-            print(f"⚠️ With issues: {len(with_issues)}")
-            print("=" * 60)
+            logger.info(f"✅ Eligible (no issues): {len(eligible)}")
+            logger.warning(f"⚠️ With issues: {len(with_issues)}")
+            logger.info("=" * 60)
 
             if with_issues:
-                print("\nUsers with issues:")
+                logger.info("\nUsers with issues:")
                 for user_data in with_issues[:10]:
-                    print(f"  - {user_data['member'].display_name}: {', '.join(user_data['has_issues'])}")
+                    logger.info(f"  - {user_data['member'].display_name}: {', '.join(user_data['has_issues'])}")
                 if len(with_issues) > 10:
-                    print(f"  ... and {len(with_issues) - 10} more")
+                    logger.info(f"  ... and {len(with_issues) - 10} more")
 
             # Show summary and start interactive assignment
             summary_embed = discord.Embed(
@@ -5041,8 +5446,7 @@ class CallsignCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in start_bulk_assign")
 
 
 class HHStJVersionModal(discord.ui.Modal):
@@ -5119,7 +5523,7 @@ class HHStJVersionModal(discord.ui.Modal):
             try:
                 success, final_nick = await safe_edit_nickname(self.user, new_nickname)
                 if not success:
-                    print(f"⚠️ Failed to set nickname for {self.user.id}")
+                    logger.warning(f"⚠️ Failed to set nickname for {self.user.id}")
             except discord.Forbidden:
                 pass
 
@@ -5176,8 +5580,7 @@ class HHStJVersionModal(discord.ui.Modal):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in HHStJVersionModal.on_submit")
 
 class HighCommandPrefixChoice(discord.ui.View):
     def __init__(self, interaction_user_id: int, cog, original_interaction, user, callsign,
@@ -5236,7 +5639,7 @@ class HighCommandPrefixChoice(discord.ui.View):
         )
 
         try:
-            await self.user.edit(nick=new_nickname)
+            await member_edits.apply(self.user, nick=new_nickname, debounce=0)
         except discord.Forbidden:
             pass
 
@@ -5309,7 +5712,7 @@ class HighCommandPrefixChoice(discord.ui.View):
             self.roblox_username
         )
         try:
-            await self.user.edit(nick=new_nickname)
+            await member_edits.apply(self.user, nick=new_nickname, debounce=0)
         except discord.Forbidden:
             pass
 
@@ -5398,7 +5801,7 @@ class HighCommandPrefixChoice(discord.ui.View):
                     ephemeral=True
                 )
             except Exception as e:
-                print(f"Error in timeout handler: {e}")
+                logger.error(f"Error in timeout handler: {e}")
 
 
 class DatabaseMismatchView(discord.ui.View):
@@ -5575,7 +5978,8 @@ class BulkAssignView(discord.ui.View):
         )
 
         embed.set_footer(
-            text="Click 'Assign' to enter a callsign, 'NIL' to set Not Assigned, 'Skip' to skip, or 'Finish' to end")
+            text="Click 'Assign' to enter a callsign, 'NIL' to set Not Assigned, 'Skip' to skip, "
+                 "'Auto-Assign Rest' to give everyone left the next free number, or 'Finish' to end")
 
         # Always edit the original response (works for all users after the first followup)
         try:
@@ -5715,7 +6119,7 @@ class BulkAssignView(discord.ui.View):
             try:
                 success, final_nick = await safe_edit_nickname(member, new_nickname)
                 if not success:
-                    print(f"⚠️ Failed to set nickname for {member.id}")
+                    logger.warning(f"⚠️ Failed to set nickname for {member.id}")
             except discord.Forbidden:
                 pass
 
@@ -5738,8 +6142,7 @@ class BulkAssignView(discord.ui.View):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in BulkAssignView.nil_button")
 
     @discord.ui.button(label="Skip", style=discord.ButtonStyle.secondary, emoji="<:RightSkip:1434962167660281926>")
     async def skip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -5751,6 +6154,106 @@ class BulkAssignView(discord.ui.View):
         await interaction.delete_original_response()
         await self.show_current_user()
 
+    @discord.ui.button(label="Auto-Assign Rest", style=discord.ButtonStyle.secondary, emoji="⚡")
+    async def auto_assign_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Give every remaining user the lowest free callsign for their rank in one batch"""
+        await interaction.response.send_message(
+            content="<a:Load:1430912797469970444> Auto-Assigning Remaining Callsigns",
+            ephemeral=True
+        )
+
+        try:
+            await callsign_registry.ensure_loaded()
+
+            # In-memory pass: allocate numbers (reserving them in the registry as we go)
+            assignments = []
+            skipped = 0
+            for user_data in self.users_data[self.current_index:]:
+                member = user_data['member']
+                fenz_prefix = user_data['fenz_prefix']
+                if 'MISSING' in (fenz_prefix, user_data['roblox_username'], user_data['roblox_id']):
+                    skipped += 1
+                    continue
+
+                free = callsign_registry.next_free(fenz_prefix)
+                if not free:
+                    skipped += 1
+                    continue
+                callsign = free[0]
+                callsign_registry.assign(member.id, fenz_prefix, callsign)
+
+                hhstj_prefix = get_hhstj_prefix_from_roles(member.roles, user_data.get('hhstj_prefix', ''))
+                is_fenz_high_command = any(role.id in HIGH_COMMAND_RANKS for role in member.roles)
+                is_hhstj_high_command = any(role.id in HHSTJ_HIGH_COMMAND_RANKS for role in member.roles)
+                if is_hhstj_high_command and hhstj_prefix and '-' in hhstj_prefix:
+                    # Same as /callsign assign: shortest version that fits
+                    hhstj_versions = get_hhstj_shortened_versions(hhstj_prefix)
+                    version_tests = test_hhstj_versions_fit(
+                        fenz_prefix, callsign, hhstj_versions,
+                        user_data['roblox_username'], is_fenz_high_command, is_hhstj_high_command
+                    )
+                    valid_versions = [v['version'] for v in version_tests if v['fits']]
+                    hhstj_prefix = valid_versions[-1] if valid_versions else hhstj_versions[-1]
+
+                assignments.append({
+                    'member': member,
+                    'callsign': callsign,
+                    'discord_user_id': member.id,
+                    'discord_username': str(member),
+                    'roblox_user_id': user_data['roblox_id'],
+                    'roblox_username': user_data['roblox_username'],
+                    'fenz_prefix': fenz_prefix,
+                    'hhstj_prefix': hhstj_prefix or '',
+                })
+
+            # One batched write
+            conflicts = await add_callsigns_to_database_bulk(
+                assignments, interaction.user.id, interaction.user.display_name
+            )
+            if conflicts:
+                # Someone else holds a number the registry thought was free
+                callsign_registry.invalidate()
+            conflicted_ids = {a['discord_user_id'] for a in conflicts}
+
+            for a in assignments:
+                if a['discord_user_id'] in conflicted_ids:
+                    continue
+                new_nickname = format_nickname(a['fenz_prefix'], a['callsign'], a['hhstj_prefix'],
+                                               a['roblox_username'])
+                try:
+                    success, final_nick = await safe_edit_nickname(a['member'], new_nickname)
+                    if not success:
+                        logger.warning(f"⚠️ Failed to set nickname for {a['member'].id}")
+                except discord.Forbidden:
+                    pass
+
+                self.assigned_count += 1
+                self.assignment_log.append({
+                    'type': 'assigned',
+                    'member': a['member'],
+                    'callsign': f"{a['fenz_prefix']}-{a['callsign']}",
+                    'nickname': new_nickname
+                })
+
+            self.skipped_count += skipped + len(conflicts)
+            self.current_index = len(self.users_data)
+
+            await interaction.followup.send(
+                f"<:Accepted:1426930333789585509> Auto-assigned {len(assignments) - len(conflicts)} callsigns"
+                f" ({skipped + len(conflicts)} skipped)",
+                ephemeral=True
+            )
+            await interaction.delete_original_response()
+            await self.finish()
+
+        except Exception as e:
+            callsign_registry.invalidate()
+            await interaction.followup.send(
+                f"<:Denied:1426930694633816248> Error: {str(e)}",
+                ephemeral=True
+            )
+            logger.exception("Error in BulkAssignView.auto_assign_button")
+
     @discord.ui.button(label="Finish", style=discord.ButtonStyle.danger, emoji="🏁")
     async def finish_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """End bulk assignment"""
@@ -5767,9 +6270,14 @@ class BulkAssignModal(discord.ui.Modal):
         self.view = view
         self.user_data = user_data
 
+        # Prefill the lowest free number for this rank
+        free = suggest_free_callsigns(user_data['fenz_prefix'], count=1) \
+            if user_data['fenz_prefix'] != 'MISSING' else []
+
         self.callsign_input = discord.ui.TextInput(
             label="Callsign Number",
             placeholder="Enter 1-3 digit number (e.g., 1, 42, 123)",
+            default=free[0] if free else None,
             required=True,
             max_length=3
         )
@@ -5821,8 +6329,10 @@ class BulkAssignModal(discord.ui.Modal):
             # NOW check if callsign exists (with the correct prefix)
             existing = await check_callsign_exists(callsign, self.user_data['fenz_prefix'])
             if existing:
+                free = suggest_free_callsigns(self.user_data['fenz_prefix'], callsign)
                 await interaction.followup.send(
-                    f"<:Denied:1426930694633816248> Callsign {self.user_data['fenz_prefix']}-{callsign} is already taken by <@{existing['discord_user_id']}>!",
+                    f"<:Denied:1426930694633816248> Callsign {self.user_data['fenz_prefix']}-{callsign} is already taken by <@{existing['discord_user_id']}>!"
+                    + (f"\nFree: {', '.join(free)}" if free else ""),
                     ephemeral=True
                 )
                 return
@@ -5921,7 +6431,7 @@ class BulkAssignModal(discord.ui.Modal):
             try:
                 success, final_nick = await safe_edit_nickname(member, new_nickname)
                 if not success:
-                    print(f"⚠️ Failed to set nickname for {member.id}")
+                    logger.warning(f"⚠️ Failed to set nickname for {member.id}")
             except discord.Forbidden:
                 pass
 
@@ -5951,8 +6461,7 @@ class BulkAssignModal(discord.ui.Modal):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in BulkAssignModal.on_submit")
 
 async def setup(bot):
     await bot.add_cog(CallsignCog(bot))
\ No newline at end of file
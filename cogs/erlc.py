@@ -1,14 +1,16 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import aiohttp
 import asyncio
 import json
 from datetime import datetime, timezone
 from typing import Optional, Literal
-import logging
 
-logger = logging.getLogger(__name__)
+from scheduler import scheduler
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class ERLC(commands.GroupCog, name="erlc"):
@@ -167,16 +169,16 @@ class ERLC(commands.GroupCog, name="erlc"):
 
         if not self.db or not self.db.pool:
             logger.error("<:Denied:1426930694633816248> Database not connected when ERLC cog loaded!")
-            print("<:Denied:1426930694633816248> ERLC: Database not available!")
+            logger.error("<:Denied:1426930694633816248> ERLC: Database not available!")
         else:
             logger.info("<:Accepted:1426930333789585509> ERLC: Database connection available")
 
         await self.load_all_configs()
-        self.log_monitor.start()
+        await scheduler.register('erlc.log_monitor', self.log_monitor, interval=self.log_check_interval)
 
     async def cog_unload(self):
         """Clean up the aiohttp session when cog unloads."""
-        self.log_monitor.cancel()
+        scheduler.unregister('erlc.log_monitor')
         if self.session:
             await self.session.close()
 
@@ -237,9 +239,7 @@ class ERLC(commands.GroupCog, name="erlc"):
                 logger.error(f"<:Denied:1426930694633816248> Failed to save ERLC config to database for guild {guild_id}")
             return success
         except Exception as e:
-            logger.error(f"<:Denied:1426930694633816248> Error saving ERLC config: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"<:Denied:1426930694633816248> Error saving ERLC config: {e}")
             return False
 
     def get_config(self, guild_id: int):
@@ -442,7 +442,6 @@ class ERLC(commands.GroupCog, name="erlc"):
 
         return filtered
 
-    @tasks.loop(seconds=30)
     async def log_monitor(self):
         """Monitor logs and post new entries to configured channels."""
         for guild_id, config in self.guild_configs.items():
@@ -474,17 +473,12 @@ class ERLC(commands.GroupCog, name="erlc"):
 
             await asyncio.sleep(1)
 
-    @log_monitor.before_loop
-    async def before_log_monitor(self):
-        """Wait until the bot is ready before starting the log monitor."""
-        await self.bot.wait_until_ready()
-
     def change_log_interval(self, seconds: int):
         """Change the log monitoring interval."""
         if seconds < 10:
             seconds = 10
         self.log_check_interval = seconds
-        self.log_monitor.change_interval(seconds=seconds)
+        scheduler.reschedule('erlc.log_monitor', seconds)
 
     async def process_join_logs(self, guild_id: int, logs: list):
         """Process and send join/leave logs."""
@@ -2,8 +2,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta
-import asyncio
 from database import db
+from scheduler import scheduler
 
 # Configuration
 VC_REQUEST_LOG_CHANNEL_ID = 1435489971342409809  # Replace with your log channel ID
@@ -21,8 +21,13 @@ class VCRequestCog(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        # Start checking for expired tracking on bot startup
-        self.bot.loop.create_task(self.check_expired_tracking())
+
+    async def cog_load(self):
+        """Check for expired tracking every 30 seconds via the shared scheduler"""
+        await scheduler.register('joinvc.check_expired_tracking', self.check_expired_tracking, interval=30)
+
+    async def cog_unload(self):
+        scheduler.unregister('joinvc.check_expired_tracking')
 
     @join_group.command(name="vc", description="Request a user to join a voice channel")
     @app_commands.describe(
@@ -174,22 +179,16 @@ class VCRequestCog(commands.Cog):
             traceback.print_exc()
 
     async def check_expired_tracking(self):
-        """Background task to check for expired tracking and post results"""
-        await self.bot.wait_until_ready()
-
-        while not self.bot.is_closed():
-            try:
-                # Get all expired tracking that hasn't been completed
-                expired = await db.get_expired_vc_requests()
-
-                for tracking in expired:
-                    await self.post_tracking_results(tracking)
+        """Scheduled job: check for expired tracking and post results"""
+        try:
+            # Get all expired tracking that hasn't been completed
+            expired = await db.get_expired_vc_requests()
 
-            except Exception as e:
-                print(f"Error checking expired tracking: {e}")
+            for tracking in expired:
+                await self.post_tracking_results(tracking)
 
-            # Check every 30 seconds
-            await asyncio.sleep(30)
+        except Exception as e:
+            print(f"Error checking expired tracking: {e}")
 
     async def post_tracking_results(self, tracking):
         """Post the tracking results to the log channel"""
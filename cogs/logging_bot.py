@@ -5,6 +5,13 @@ import traceback
 import json
 from datetime import datetime
 import sys
+from metrics import metrics
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+COMMAND_SECONDS = metrics.histogram('app_command_seconds', 'Slash command latency from interaction creation',
+                                    ['command', 'outcome'])
 
 # ==================== CONFIGURATION ====================
 # Channel IDs for different log types
@@ -68,7 +75,7 @@ class LoggingCog(commands.Cog):
             if channel:
                 await channel.send(content=content, embed=embed)
         except Exception as e:
-            print(f"Failed to send log to channel {channel_id}: {e}")
+            logger.error(f"Failed to send log to channel {channel_id}: {e}")
 
     async def _format_parameter_value(self, value) -> str:
         """Format a parameter value for logging display"""
@@ -158,6 +165,11 @@ class LoggingCog(commands.Cog):
     @commands.Cog.listener()
     async def on_app_command_completion(self, interaction: discord.Interaction, command: app_commands.Command):
         """Log slash command usage"""
+        latency = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        COMMAND_SECONDS.observe(latency, command=command.qualified_name, outcome='ok')
+        logger.info(f"/{command.qualified_name} completed", guild=interaction.guild_id, user=interaction.user,
+                    latency=latency)
+
         if not LOG_SLASH_COMMANDS or not COMMAND_LOG_CHANNEL_ID:
             return
 
@@ -340,6 +352,12 @@ class LoggingCog(commands.Cog):
 
     async def on_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
         """Log slash command errors to appropriate channels"""
+        latency = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        command_name = interaction.command.qualified_name if interaction.command else 'unknown'
+        COMMAND_SECONDS.observe(latency, command=command_name, outcome='error')
+        logger.error(f"/{command_name} failed: {type(error).__name__}: {error}", guild=interaction.guild_id,
+                     user=interaction.user, latency=latency)
+
         if not LOG_ERRORS:
             return
 
@@ -3,17 +3,25 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timedelta, time
 import pytz
-from discord.ext import commands, tasks
 from typing import Optional
 from database import db, ensure_database_connected
+from scheduler import scheduler
+from member_edits import member_edits
 
 import asyncio
 import math
-import json
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
 
 CACHE_TTL_SECONDS = 300
 LONG_BREAK_THRESHOLD_SECONDS = 1200
 LONG_BREAK_THRESHOLD_MINUTES = LONG_BREAK_THRESHOLD_SECONDS / 60
+MODIFICATION_LOG_DELAY_SECONDS = 300
+WEEKLY_RESET_MAX_LAG_SECONDS = 7200  # Must still run before Sunday midnight NZST
+MEMBER_CLEANUP_CONCURRENCY = 4  # Parallel member edits during the weekly reset
+LEADERBOARD_SIZE = 25
+LEADERBOARD_WARM_INTERVAL_SECONDS = 300
 SHIFT_LIST_ITEMS_PER_PAGE = 4
 
 OWNER_USER_ID = 678475709257089057
@@ -108,6 +116,16 @@ SHIFT_LOGS_CHANNELS = [
 ]
 PING_ROLES = [1285474077556998196, 1389113393511923863, 1389550689113473024]
 
+# Permission groups backed by the member role bitmap index
+ROLE_GROUPS = {
+    'admin': ADMIN_ROLES,
+    'senior_admin': SENIOR_ADMIN_ROLES,
+    'super_admin': SUPER_ADMIN_ROLES,
+    'quota_admin': QUOTA_ADMIN_ROLES,
+    'leaderboard': LEADERBOARD_ROLES,
+    'reset': RESET_ROLES,
+}
+
 
 def validate_time_input(hours: int, minutes: int, seconds: int = 0) -> tuple[bool, str]:
     """Validate time input values"""
@@ -119,6 +137,57 @@ def validate_time_input(hours: int, minutes: int, seconds: int = 0) -> tuple[boo
         return False, "Hours cannot exceed 999"
     return True, ""
 
+class RoleIndex:
+    """
+    Member -> role bitmap index for permission checks.
+
+    Only roles that appear in a permission group get a bit, so a member's
+    mask is a small int and each check is one bitwise AND against a
+    precomputed group mask. Entries are refreshed from member update events
+    rather than expiring, so promotions and demotions apply immediately.
+    """
+
+    def __init__(self, groups: dict):
+        self._bits = {}
+        for role_ids in groups.values():
+            for role_id in role_ids:
+                self._bits.setdefault(role_id, 1 << len(self._bits))
+
+        self.masks = {name: self.mask_for(role_ids) for name, role_ids in groups.items()}
+        self._members = {}  # (guild_id, member_id) -> mask
+
+    def mask_for(self, role_ids) -> int:
+        """Bitmap for a collection of role IDs (untracked roles are ignored)"""
+        mask = 0
+        for role_id in role_ids:
+            mask |= self._bits.get(role_id, 0)
+        return mask
+
+    def refresh(self, member: discord.Member) -> int:
+        """Recompute and store a member's mask from their current roles"""
+        mask = self.mask_for(role.id for role in member.roles)
+        self._members[(member.guild.id, member.id)] = mask
+        return mask
+
+    def get(self, member: discord.Member) -> int:
+        mask = self._members.get((member.guild.id, member.id))
+        if mask is None:
+            mask = self.refresh(member)
+        return mask
+
+    def forget(self, guild_id: int, member_id: int):
+        self._members.pop((guild_id, member_id), None)
+
+    def clear(self):
+        self._members.clear()
+
+    def has_any(self, member: discord.Member, group: str) -> bool:
+        """True if the member holds any role in the named group"""
+        if not isinstance(member, discord.Member):
+            return False
+        return bool(self.get(member) & self.masks[group])
+
+
 class WeeklyShiftManager:
     """Manages weekly shift resets and leaderboard generation"""
 
@@ -151,6 +220,18 @@ class WeeklyShiftManager:
         """Returns Monday of the current week as naive UTC"""
         return WeeklyShiftManager.get_week_monday()
 
+    @staticmethod
+    def get_next_reset_time(after: datetime) -> datetime:
+        """Next Sunday 10 PM NZST strictly after the given time (timezone-aware)"""
+        local = after.astimezone(NZST)
+        days_until_sunday = (6 - local.weekday()) % 7
+        target_date = (local + timedelta(days=days_until_sunday)).date()
+        target = NZST.localize(datetime.combine(target_date, time(hour=22, minute=0)))
+
+        if target <= after:
+            target = NZST.localize(datetime.combine(target_date + timedelta(days=7), time(hour=22, minute=0)))
+        return target
+
     @staticmethod
     def get_previous_week_monday() -> datetime:
         """Returns Monday of last week as naive UTC"""
@@ -163,64 +244,90 @@ class WeeklyShiftManager:
         current = WeeklyShiftManager.get_current_week_monday()
         return current - timedelta(days=14)
 
-    async def archive_current_week_to_wave(self):
-        """Archive current week shifts to next wave number"""
-        async with self.cog.db.pool.acquire() as conn:
-            current_week = self.get_current_week_monday()
-
-            # Get next wave number
-            max_wave = await conn.fetchval(
-                'SELECT MAX(wave_number) FROM shifts WHERE wave_number IS NOT NULL'
-            )
-            next_wave = (max_wave or 0) + 1
-
-            # Archive all current week shifts to wave number
-            archived = await conn.execute(
-                '''UPDATE shifts
-                   SET wave_number = $1
-                   WHERE week_identifier = $2
-                     AND wave_number IS NULL''',
-                next_wave, current_week
-            )
+    async def rollover_wave(self) -> tuple:
+        """Force-end active shifts and archive the current week into the next wave (one transaction)
 
-            print(f"Weekly reset: Archived {archived} shifts to wave {next_wave}")
+        Returns (wave_number, ended_shifts).
+        """
+        now = datetime.utcnow()
+        current_week = self.get_current_week_monday()
 
-    async def force_end_active_shifts(self, assign_to_wave: int):
-        """End all active shifts at the weekly reset and assign to wave"""
         async with self.cog.db.pool.acquire() as conn:
-            active_shifts = await conn.fetch(
-                'SELECT * FROM shifts WHERE end_time IS NULL'
-            )
+            async with conn.transaction():
+                # Serialise concurrent rollovers so two processes can't mint the same wave
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext('shift.weekly_rollover'))")
 
-            for shift in active_shifts:
-                # Calculate final pause duration
-                pause_duration = shift.get('pause_duration', 0)
-                if shift.get('pause_start'):
-                    pause_duration += (datetime.utcnow() - shift['pause_start']).total_seconds()
+                max_wave = await conn.fetchval(
+                    'SELECT MAX(wave_number) FROM shifts WHERE wave_number IS NOT NULL'
+                )
+                next_wave = (max_wave or 0) + 1
 
-                # End the shift and assign to current wave
-                await conn.execute(
+                # End every active shift (folding in any open break) and assign it to the wave
+                ended_shifts = await conn.fetch(
                     '''UPDATE shifts
                        SET end_time        = $1,
-                           pause_duration  = $2,
+                           pause_duration  = COALESCE(pause_duration, 0) + CASE
+                               WHEN pause_start IS NOT NULL
+                                   THEN EXTRACT(EPOCH FROM ($1::timestamp - pause_start))
+                               ELSE 0 END,
                            pause_start     = NULL,
-                           week_identifier = $3,
-                           wave_number     = $4
-                       WHERE id = $5''',
-                    datetime.utcnow(),
-                    pause_duration,
-                    self.get_current_week_monday(),
-                    assign_to_wave,
-                    shift['id']
+                           week_identifier = $2,
+                           wave_number     = $3
+                       WHERE end_time IS NULL
+                       RETURNING id, discord_user_id, guild_id, type''',
+                    now, current_week, next_wave
                 )
 
-                # Clean up roles/nicknames
-                member = self.bot.get_guild(shift.get('guild_id')).get_member(shift['discord_user_id'])
-                if member:
-                    await self.cog.update_nickname_for_shift_status(member, 'off')
-                    await self.cog.update_duty_roles(member, shift['type'], 'off')
+                if ended_shifts:
+                    await conn.execute(
+                        '''UPDATE shift_breaks
+                           SET ended_at = $2
+                           WHERE shift_id = ANY ($1)
+                             AND ended_at IS NULL''',
+                        [shift['id'] for shift in ended_shifts], now
+                    )
+
+                # Archive this week's completed shifts to the same wave
+                archived = await conn.execute(
+                    '''UPDATE shifts
+                       SET wave_number = $1
+                       WHERE week_identifier = $2
+                         AND wave_number IS NULL''',
+                    next_wave, current_week
+                )
+
+        logger.info(f"Weekly reset: Force-ended {len(ended_shifts)} active shifts, archived {archived} shifts to wave {next_wave}")
+        return next_wave, [dict(shift) for shift in ended_shifts]
+
+    async def cleanup_ended_members(self, ended_shifts: list):
+        """Reset nicknames/duty roles for force-ended shifts on a bounded worker pool"""
+        queue = asyncio.Queue()
+        for shift in ended_shifts:
+            self.cog.cancel_break_timer(shift['id'])
+
+            guild = self.bot.get_guild(shift.get('guild_id'))
+            member = guild.get_member(shift['discord_user_id']) if guild else None
+            if member:
+                queue.put_nowait((member, shift['type']))
+
+        if queue.empty():
+            return
+
+        async def worker():
+            # discord.py sleeps through 429s per route bucket; capping workers keeps us
+            # from stacking requests onto the same guild member-edit bucket
+            while True:
+                try:
+                    member, shift_type = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await self.cog.update_shift_status(member, shift_type, 'off', debounce=0)
+                except Exception as e:
+                    logger.error(f"Error cleaning up {member.display_name} after weekly reset: {e}")
 
-            print(f"Force-ended {len(active_shifts)} active shifts for wave {assign_to_wave}")
+        workers = min(MEMBER_CLEANUP_CONCURRENCY, queue.qsize())
+        await asyncio.gather(*(worker() for _ in range(workers)))
 
     async def generate_weekly_report(self, wave_number: int):
         """Generate and send weekly leaderboard report for a specific wave"""
@@ -242,9 +349,13 @@ class WeeklyShiftManager:
             )
 
             if not shifts:
-                print(f"No shifts found for wave {wave_number}")
+                logger.info(f"No shifts found for wave {wave_number}")
                 return
 
+            for row in await self.cog.db.get_break_stats([wave_number]):
+                logger.info(f"Wave {wave_number} breaks: {row['break_count']} taken, "
+                            f"mean {row['mean_seconds'] / 60:.1f}m, max {row['max_seconds'] / 60:.1f}m")
+
             # ✅ FIX: Get all quotas to find max period per shift type
             all_quotas = await conn.fetch(
                 'SELECT role_id, quota_seconds, type, quota_period_weeks FROM shift_quotas'
@@ -291,7 +402,7 @@ class WeeklyShiftManager:
                     break
 
             if not guild:
-                print("Could not find guild for weekly report")
+                logger.error("Could not find guild for weekly report")
                 return
 
             # Get all role quotas
@@ -451,17 +562,17 @@ class WeeklyShiftManager:
                             content=f"||{ping_mentions}||\n**Weekly Shift Report - Wave {wave_number}**",
                             embeds=embeds
                         )
-                        print(f"Sent weekly report to channel {channel_id} with {len(embeds)} embeds")
+                        logger.info(f"Sent weekly report to channel {channel_id} with {len(embeds)} embeds")
 
                         # ✅ NEW: Send quota information summary
                         await self.send_quota_summary(channel, wave_number, guild, quota_map, types)
 
                     except Exception as e:
-                        print(f"Failed to send weekly report to channel {channel_id}: {e}")
+                        logger.error(f"Failed to send weekly report to channel {channel_id}: {e}")
                 else:
-                    print(f"Warning: Channel {channel_id} not found")
+                    logger.warning(f"Warning: Channel {channel_id} not found")
         else:
-            print(f"No embeds generated for wave {wave_number}")
+            logger.info(f"No embeds generated for wave {wave_number}")
 
     async def send_quota_summary(self, channel, wave_number: int, guild, quota_map, types):
         """Send detailed quota information after the weekly report"""
@@ -630,9 +741,7 @@ class WeeklyShiftManager:
                 await channel.send(embed=embed)
 
         except Exception as e:
-            print(f"Error sending quota summary: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error sending quota summary: {e}")
 
 class QuotaTimeView(discord.ui.View):
     """View with button to trigger time input modal"""
@@ -768,8 +877,7 @@ class QuotaTimeModal(discord.ui.Modal):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in QuotaTimeModal.on_submit")
 
 class QuotaPeriodSelectView(discord.ui.View):
     """View for selecting quota period before setting time"""
@@ -857,11 +965,14 @@ class ShiftManagementCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = db
-        self._role_cache = {}
+        self.role_index = RoleIndex(ROLE_GROUPS)
         self._quota_cache = {}
         self._quota_cache_time = None
-        self._modification_cache = {}
-        self._modification_timers = {}
+        self._break_timers = {}  # shift_id -> asyncio.Task
+        self._leaderboard_cache = {}  # (type, wave or None) -> leaderboard entry
+        self._leaderboard_versions = {}  # (type, wave) -> bumped on invalidation
+        self._leaderboard_builds = {}  # (type, wave) -> in-flight build task
+        self._leaderboard_guilds = set()  # guilds whose quota icons we keep warm
         self.SHIFT_LOGS_CHANNEL = SHIFT_LOGS_CHANNEL
         self._cache_cleanup_task = None
         self.weekly_manager = WeeklyShiftManager(self)
@@ -880,104 +991,115 @@ class ShiftManagementCog(commands.Cog):
 
         while True:
             if await ensure_database_connected():
-                print("✅ Database ready")
+                logger.info("✅ Database ready")
                 break
 
             elapsed = asyncio.get_event_loop().time() - start_time
             if elapsed > max_wait_time:
-                print("❌ Database failed to connect within timeout")
+                logger.error("❌ Database failed to connect within timeout")
                 # Don't raise - let bot continue but log warning
-                print("⚠️ COG LOADED WITHOUT DATABASE - Some features may not work!")
+                logger.warning("⚠️ COG LOADED WITHOUT DATABASE - Some features may not work!")
                 break
 
-            print(f"⏳ Waiting for database... ({int(elapsed)}s)")
+            logger.info(f"⏳ Waiting for database... ({int(elapsed)}s)")
             await asyncio.sleep(5)
 
 
-        # Start weekly reset task
-        if not self.weekly_reset_task.is_running():
-            self.weekly_reset_task.start()
-
-        if not self.check_long_breaks.is_running():
-            self.check_long_breaks.start()
+        # Register timed work with the shared scheduler
+        await scheduler.register(
+            'shift.weekly_reset',
+            self.weekly_reset_task,
+            next_run=self.weekly_manager.get_next_reset_time,
+            run_immediately=False,
+            max_lag=WEEKLY_RESET_MAX_LAG_SECONDS,
+            lock_timeout=3600
+        )
+        # Safety net: re-arm break deadlines for breaks started by another process
+        await scheduler.register(
+            'shift.rebuild_break_timers', self.rebuild_break_timers, interval=900, durable=False,
+            run_immediately=False
+        )
+        await scheduler.register_handler('shift.modification_log', self._send_batched_modifications)
+        # Keep current-wave leaderboards (and their quota icons) pre-computed
+        await scheduler.register(
+            'shift.warm_leaderboards', self.warm_leaderboards,
+            interval=LEADERBOARD_WARM_INTERVAL_SECONDS, durable=False
+        )
 
         # Clean up stale shifts
         await self.cleanup_stale_shifts(self.bot)
 
-    @tasks.loop(time=time(hour=22, minute=0, tzinfo=pytz.timezone('Pacific/Auckland')))
+        # Re-arm auto-termination for any breaks still open
+        await self.rebuild_break_timers()
+
+    def cog_unload(self):
+        """Stop dispatching this cog's scheduled jobs"""
+        scheduler.unregister('shift.weekly_reset')
+        scheduler.unregister('shift.rebuild_break_timers')
+        scheduler.unregister('shift.warm_leaderboards')
+        for timer in self._break_timers.values():
+            timer.cancel()
+        self._break_timers.clear()
+        scheduler.unregister_handler('shift.modification_log')
+
     async def weekly_reset_task(self):
-        """Check if it's Sunday 10 PM NZST and run weekly reset"""
+        """Run the weekly reset (scheduled for Sunday 10 PM NZST)"""
         now = datetime.now(NZST)
 
         if now.weekday() == 6:  # Sunday (0=Monday, 6=Sunday)
-            print(f"Running weekly shift reset at {now}")
+            logger.info(f"Running weekly shift reset at {now}")
 
             try:
-                # Get next wave number ONCE
-                async with db.pool.acquire() as conn:
-                    max_wave = await conn.fetchval(
-                        'SELECT MAX(wave_number) FROM shifts WHERE wave_number IS NOT NULL'
-                    )
-                    next_wave = (max_wave or 0) + 1
-
-                # 1️⃣ Archive current week's completed shifts
-                await self.weekly_manager.archive_current_week_to_wave()
-
-                # 2️⃣ Force-end active shifts (they get archived by step 1)
-                await self.weekly_manager.force_end_active_shifts(next_wave)
-
-                # 3️⃣ Generate report for the completed wave
-                await self.weekly_manager.generate_weekly_report(next_wave)
+                # 1️⃣ End active shifts and archive the week in one transaction
+                next_wave, ended_shifts = await self.weekly_manager.rollover_wave()
+                for shift_type in typeS.values():
+                    self.invalidate_leaderboard(shift_type)
+
+                # 2️⃣ Clean up nicknames/roles and 3️⃣ generate the report side by side
+                await asyncio.gather(
+                    self.weekly_manager.cleanup_ended_members(ended_shifts),
+                    self.weekly_manager.generate_weekly_report(next_wave)
+                )
 
-                print(f"Weekly reset completed successfully - Wave {next_wave} created")
+                logger.info(f"Weekly reset completed successfully - Wave {next_wave} created")
 
             except Exception as e:
-                print(f"Error during weekly reset: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"Error during weekly reset: {e}")
 
-    @weekly_reset_task.before_loop
-    async def before_weekly_reset(self):
-        """Wait until bot is ready before starting the task"""
-        await self.bot.wait_until_ready()
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Keep the role index current when a member's roles change"""
+        if before.roles != after.roles:
+            self.role_index.refresh(after)
 
-    def get_user_role_ids(self, member: discord.Member) -> set:
-        """Cache user role IDs with TTL"""
-        cache_key = (member.guild.id, member.id)
-        current_time = datetime.utcnow()
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.role_index.forget(member.guild.id, member.id)
 
-        # Check cache
-        if cache_key in self._role_cache:
-            cached_data, timestamp = self._role_cache[cache_key]
-            # Cache valid for 5 minutes
-            if (current_time - timestamp).total_seconds() < 300:
-                return cached_data
-
-        # Update cache
-        role_ids = {role.id for role in member.roles}
-        self._role_cache[cache_key] = (role_ids, current_time)
-
-        # Cleanup old entries periodically
-        if len(self._role_cache) > 1000:
-            cutoff = current_time - timedelta(minutes=5)
-            self._role_cache = {
-                k: v for k, v in self._role_cache.items()
-                if v[1] > cutoff
-            }
-
-        return role_ids
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Role updates may have been missed while disconnected
+        self.role_index.clear()
 
     def has_admin_permission(self, member: discord.Member) -> bool:
-        """Check if user has admin permissions (cached)"""
-        return bool(self.get_user_role_ids(member) & set(ADMIN_ROLES))
+        """Check if user has admin permissions"""
+        return self.role_index.has_any(member, 'admin')
 
     def has_senior_admin_permission(self, member: discord.Member) -> bool:
-        """Check if user has senior admin permissions (cached)"""
-        return bool(self.get_user_role_ids(member) & set(SENIOR_ADMIN_ROLES))
+        """Check if user has senior admin permissions"""
+        return self.role_index.has_any(member, 'senior_admin')
 
     def has_super_admin_permission(self, member: discord.Member) -> bool:
-        """Check if user has super admin permissions (cached)"""
-        return bool(self.get_user_role_ids(member) & set(SUPER_ADMIN_ROLES))
+        """Check if user has super admin permissions"""
+        return self.role_index.has_any(member, 'super_admin')
+
+    def has_quota_admin_permission(self, member: discord.Member) -> bool:
+        """Check if user can manage quotas"""
+        return self.role_index.has_any(member, 'quota_admin')
+
+    def has_reset_permission(self, member: discord.Member) -> bool:
+        """Check if user can reset shifts"""
+        return self.role_index.has_any(member, 'reset')
 
     async def log_shift_event(self, guild: discord.Guild, event_type: str, member: discord.Member,
                               shift_data: dict, admin: discord.Member = None, details: str = None):
@@ -986,6 +1108,10 @@ class ShiftManagementCog(commands.Cog):
 
         event_type: 'start', 'end', 'pause', 'resume', 'modify', 'delete', 'clear'
         """
+        if event_type == 'end':
+            # A finished shift changes its wave's totals
+            self.invalidate_leaderboard(shift_data['type'], shift_data.get('wave_number'))
+
         # ✅ CHANGE: Get ALL log channels instead of just one
         log_channels = []
         for channel_id in [SHIFT_LOGS_CHANNEL, 1411662121531609130]:  # Add your second channel ID here
@@ -993,10 +1119,10 @@ class ShiftManagementCog(commands.Cog):
             if channel:
                 log_channels.append(channel)
             else:
-                print(f"Warning: Log channel {channel_id} not found")
+                logger.warning(f"Warning: Log channel {channel_id} not found")
 
         if not log_channels:
-            print(f"Warning: No valid log channels found")
+            logger.warning(f"Warning: No valid log channels found")
             return
 
         try:
@@ -1065,29 +1191,22 @@ class ShiftManagementCog(commands.Cog):
 
                 embed.add_field(name='', value='', inline=False)
 
-                break_sessions = shift_data.get('break_sessions')
-                if break_sessions:
-                    try:
-                        sessions = json.loads(break_sessions) if isinstance(break_sessions, str) else break_sessions
-                        if sessions:
-                            session_lines = []
-                            for i, session in enumerate(sessions, 1):
-                                if session.get('end'):
-                                    start_time = datetime.fromisoformat(session['start'])
-                                    end_time = datetime.fromisoformat(session['end'])
-                                    session_duration = timedelta(seconds=session['duration'])
-                                    session_lines.append(
-                                        f"`{i}.` <t:{int(start_time.timestamp())}:t> - <t:{int(end_time.timestamp())}:t> ({self.format_duration(session_duration)})"
-                                    )
+                if break_duration.total_seconds() > 0 and shift_data.get('id'):
+                    sessions = await db.get_break_sessions(shift_data['id'])
+                    session_lines = []
+                    for i, session in enumerate(sessions, 1):
+                        if session['ended_at']:
+                            session_duration = timedelta(seconds=session['duration'])
+                            session_lines.append(
+                                f"`{i}.` <t:{int(session['started_at'].timestamp())}:t> - <t:{int(session['ended_at'].timestamp())}:t> ({self.format_duration(session_duration)})"
+                            )
 
-                            if session_lines:
-                                embed.add_field(
-                                    name="Break Sessions",
-                                    value="\n".join(session_lines),
-                                    inline=False
-                                )
-                    except (json.JSONDecodeError, ValueError):
-                        pass
+                    if session_lines:
+                        embed.add_field(
+                            name="Break Sessions",
+                            value="\n".join(session_lines),
+                            inline=False
+                        )
 
                 embed.add_field(
                     name="Started",
@@ -1212,12 +1331,10 @@ class ShiftManagementCog(commands.Cog):
                 try:
                     await channel.send(embed=embed)
                 except Exception as e:
-                    print(f"Failed to send log to channel {channel.id}: {e}")
+                    logger.error(f"Failed to send log to channel {channel.id}: {e}")
 
         except Exception as e:
-            print(f"Error logging shift event: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error logging shift event: {e}")
 
     async def get_duty_roles_for_type(self, type: str) -> tuple:
         """Get duty and break role IDs for a shift type"""
@@ -1229,43 +1346,38 @@ class ShiftManagementCog(commands.Cog):
             return (CC_DUTY_ROLE, CC_BREAK_ROLE)
         return (None, None)
 
-    async def update_duty_roles(self, member: discord.Member, type: str, status: str):
-        """Update duty/break roles based on shift status"""
+    async def update_shift_status(self, member: discord.Member, type: str, status: str, debounce: float = None):
+        """
+        Apply the shift nickname prefix and duty/break roles for a status in one member edit
+        status can be: 'duty', 'break', 'off'
+        """
         duty_role_id, break_role_id = await self.get_duty_roles_for_type(type)
 
-        if not duty_role_id:
-            return
-
-        guild = member.guild
-        duty_role = guild.get_role(duty_role_id)
-        break_role = guild.get_role(break_role_id)
-
-        try:
+        add_roles, remove_roles = set(), set()
+        if duty_role_id:
             if status == 'duty':
-                # Add duty role, remove break role
-                if duty_role and duty_role not in member.roles:
-                    await member.add_roles(duty_role)
-                if break_role and break_role in member.roles:
-                    await member.remove_roles(break_role)
+                add_roles, remove_roles = {duty_role_id}, {break_role_id}
             elif status == 'break':
-                # Add break role, remove duty role
-                if break_role and break_role not in member.roles:
-                    await member.add_roles(break_role)
-                if duty_role and duty_role in member.roles:
-                    await member.remove_roles(duty_role)
+                add_roles, remove_roles = {break_role_id}, {duty_role_id}
             else:  # 'off'
-                # Remove both roles
-                roles_to_remove = []
-                if duty_role and duty_role in member.roles:
-                    roles_to_remove.append(duty_role)
-                if break_role and break_role in member.roles:
-                    roles_to_remove.append(break_role)
-                if roles_to_remove:
-                    await member.remove_roles(*roles_to_remove)
+                remove_roles = {duty_role_id, break_role_id}
+            # Some types share one role for duty and break
+            remove_roles -= add_roles
+
+        try:
+            await member_edits.apply(
+                member,
+                nick=lambda current_nick: self.get_shift_nickname(current_nick, status),
+                add_roles=add_roles,
+                remove_roles=remove_roles,
+                reason=f"Shift status: {status}",
+                debounce=debounce
+            )
         except discord.Forbidden:
+            # Can't edit this member (permissions or higher role)
             pass
         except Exception as e:
-            print(f"Error updating duty roles for {member.display_name}: {e}")
+            logger.error(f"Error updating shift status for {member.display_name}: {e}")
 
     async def cleanup_stale_shifts(self, bot):
         """Clean up shifts that were active when bot went offline"""
@@ -1299,11 +1411,13 @@ class ShiftManagementCog(commands.Cog):
                 # Clean up roles/nicknames
                 member = bot.get_guild(shift.get('guild_id')).get_member(shift['discord_user_id'])
                 if member:
-                    await self.update_nickname_for_shift_status(member, 'off')
-                    await self.update_duty_roles(member, shift['type'], 'off')
+                    await self.update_shift_status(member, shift['type'], 'off')
 
             if stale_shifts:
-                print(f"Cleaned up {len(stale_shifts)} stale shifts on startup")
+                await db.close_open_breaks([shift['id'] for shift in stale_shifts], datetime.utcnow())
+                for shift_type in {shift['type'] for shift in stale_shifts}:
+                    self.invalidate_leaderboard(shift_type)
+                logger.info(f"Cleaned up {len(stale_shifts)} stale shifts on startup")
 
     async def get_user_types(self, member: discord.Member) -> list:
         """Get all shift types a user is eligible for"""
@@ -1381,13 +1495,26 @@ class ShiftManagementCog(commands.Cog):
         async with db.pool.acquire() as conn:
             if type:
                 quotas = await conn.fetch(
-                    'SELECT role_id, quota_seconds FROM shift_quotas WHERE type = $1',
+                    '''SELECT role_id, quota_seconds, quota_period_weeks, watch_quota
+                       FROM shift_quotas
+                       WHERE type = $1''',
                     type
                 )
             else:
-                quotas = await conn.fetch('SELECT role_id, quota_seconds FROM shift_quotas')
+                quotas = await conn.fetch(
+                    'SELECT role_id, quota_seconds, quota_period_weeks, watch_quota FROM shift_quotas'
+                )
 
-            quota_map = {q['role_id']: q['quota_seconds'] for q in quotas}
+            quota_map = {}
+            for q in quotas:
+                # Keep the highest quota per role (a role can have one row per type)
+                existing = quota_map.get(q['role_id'])
+                if not existing or q['quota_seconds'] > existing['seconds']:
+                    quota_map[q['role_id']] = {
+                        'seconds': q['quota_seconds'],
+                        'period': q.get('quota_period_weeks') or 1,
+                        'watch_quota': q.get('watch_quota') or 0
+                    }
 
             if type:
                 shifts = await conn.fetch(
@@ -1417,46 +1544,74 @@ class ShiftManagementCog(commands.Cog):
 
             user_data = {s['discord_user_id']: s['total_seconds'] for s in shifts}
 
-            results = {}
-            for user_id in user_ids:
-                member = guild.get_member(user_id)
-                if not member:
-                    results[user_id] = {'has_quota': False, 'completed': False, 'bypass_type': None}
-                    continue
+        # Resolve each member's governing quota first so watch counts can be fetched in bulk
+        user_quotas = {}
+        for user_id in user_ids:
+            member = guild.get_member(user_id)
+            if not member:
+                continue
 
-                max_quota = max((quota_map.get(role.id, 0) for role in member.roles), default=0)
-                active_seconds = user_data.get(user_id, 0)
+            best = None
+            for role in member.roles:
+                quota_data = quota_map.get(role.id)
+                if quota_data and (best is None or quota_data['seconds'] > best['seconds']):
+                    best = quota_data
+            user_quotas[user_id] = (member, best)
 
-                user_role_ids = {role.id for role in member.roles}
-                bypass_type = None
-                completed = False
+        # FENZ quotas include hosted watches - one grouped query per distinct quota period
+        watch_counts = {}
+        if type == "Shift FENZ":
+            users_by_period = {}
+            for user_id, (member, best) in user_quotas.items():
+                if best and best['watch_quota'] > 0:
+                    users_by_period.setdefault(best['period'], []).append(user_id)
+
+            for period, period_user_ids in users_by_period.items():
+                watch_counts.update(await self.get_bulk_watch_hosting_counts(period_user_ids, period))
+
+        results = {}
+        for user_id in user_ids:
+            if user_id not in user_quotas:
+                results[user_id] = {'has_quota': False, 'completed': False, 'bypass_type': None}
+                continue
+
+            member, best = user_quotas[user_id]
+            max_quota = best['seconds'] if best else 0
+            watch_quota = best['watch_quota'] if best else 0
+            watch_count = watch_counts.get(user_id, 0)
+            active_seconds = user_data.get(user_id, 0) or 0
+
+            user_role_ids = {role.id for role in member.roles}
+            bypass_type = None
+            completed = False
+            watch_completed = (watch_count >= watch_quota) if watch_quota > 0 else True
 
-                if max_quota > 0:
-                    if QUOTA_BYPASS_ROLE in user_role_ids:
-                        bypass_type = 'QB'
-                        completed = True
-                    elif LOA_ROLE in user_role_ids:
-                        bypass_type = 'LOA'
-                        completed = True
-                    elif REDUCED_ACTIVITY_ROLE in user_role_ids:
-                        bypass_type = 'RA'
-                        modified_quota = max_quota * 0.5
-                        completed = (active_seconds / modified_quota >= 1) if modified_quota > 0 else False
-                    else:
-                        bypass_type = None  # Add this line
-                        completed = (active_seconds / max_quota >= 1) if max_quota > 0 else False
-                if max_quota == 0:
-                    results[user_id] = {
-                        'has_quota': max_quota > 0,
-                        'quota_seconds': max_quota,
-                        'active_seconds': active_seconds,
-                        'percentage': (active_seconds / max_quota * 100) if max_quota > 0 else 0,
-                        'completed': completed,
-                        'bypass_type': bypass_type
-                    }
-                    continue
+            if max_quota > 0:
+                if QUOTA_BYPASS_ROLE in user_role_ids:
+                    bypass_type = 'QB'
+                    completed = True
+                elif LOA_ROLE in user_role_ids:
+                    bypass_type = 'LOA'
+                    completed = True
+                elif REDUCED_ACTIVITY_ROLE in user_role_ids:
+                    bypass_type = 'RA'
+                    modified_quota = max_quota * 0.5
+                    completed = (active_seconds / modified_quota >= 1) and watch_completed
+                else:
+                    completed = (active_seconds / max_quota >= 1) and watch_completed
+
+            results[user_id] = {
+                'has_quota': max_quota > 0,
+                'quota_seconds': max_quota,
+                'active_seconds': active_seconds,
+                'percentage': (active_seconds / max_quota * 100) if max_quota > 0 else 0,
+                'completed': completed,
+                'bypass_type': bypass_type,
+                'watch_count': watch_count,
+                'watch_quota': watch_quota
+            }
 
-            return results
+        return results
 
     async def get_user_summary(self, user_id: int, member: discord.Member = None):
         """Get all user data in a single database connection"""
@@ -1754,47 +1909,30 @@ class ShiftManagementCog(commands.Cog):
 
             return int(total_seconds)
 
-    async def update_nickname_for_shift_status(self, member: discord.Member, status: str):
+    @staticmethod
+    def get_shift_nickname(current_nick: str, status: str) -> Optional[str]:
         """
-        Update member's nickname based on shift status
+        Nickname for a shift status, or None to leave it unchanged
         status can be: 'duty', 'break', 'off'
         """
-        try:
-            current_nick = member.nick or member.name
-
-            # Remove any existing prefix
-            for prefix in ["DUTY | ", "BRK | "]:
-                if current_nick.startswith(prefix):
-                    current_nick = current_nick[len(prefix):]
-                    break
-
-            # Determine new nickname
-            if status == 'duty':
-                new_nick = f"DUTY | {current_nick}"
-            elif status == 'break':
-                new_nick = f"BRK | {current_nick}"
-            else:  # 'off'
-                new_nick = current_nick
-
-            # Check if it fits Discord's 32 character limit
-            if len(new_nick) > 32:
-                # If adding prefix makes it too long, keep current nickname
-                if status == 'off':
-                    # Still try to remove prefix if going off shift
-                    new_nick = current_nick
-                else:
-                    # Don't add prefix if it won't fit
-                    return
+        # Remove any existing prefix
+        for prefix in ["DUTY | ", "BRK | "]:
+            if current_nick.startswith(prefix):
+                current_nick = current_nick[len(prefix):]
+                break
 
-            # Only update if different
-            if member.nick != new_nick:
-                await member.edit(nick=new_nick)
+        # Determine new nickname
+        if status == 'duty':
+            new_nick = f"DUTY | {current_nick}"
+        elif status == 'break':
+            new_nick = f"BRK | {current_nick}"
+        else:  # 'off'
+            return current_nick
 
-        except discord.Forbidden:
-            # Can't edit nickname (permissions or higher role)
-            pass
-        except Exception as e:
-            print(f"Error updating nickname for {member.display_name}: {e}")
+        # Don't add prefix if it won't fit Discord's 32 character limit
+        if len(new_nick) > 32:
+            return None
+        return new_nick
 
     def format_duration(self, td: timedelta) -> str:
         """Format a timedelta into a readable string"""
@@ -1915,8 +2053,7 @@ class ShiftManagementCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error during test: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in test_weekly_reset")
 
     # Replace the shift_quota command (around line 1068) with this:
 
@@ -2028,7 +2165,7 @@ class ShiftManagementCog(commands.Cog):
 
             elif action == "set":
                 # Check admin permission
-                if not any(role_check.id in QUOTA_ADMIN_ROLES for role_check in interaction.user.roles):
+                if not self.has_quota_admin_permission(interaction.user):
                     await interaction.followup.send(
                         "<:Denied:1426930694633816248> You don't have permission to set quotas.",
                         ephemeral=True
@@ -2081,7 +2218,7 @@ class ShiftManagementCog(commands.Cog):
 
             elif action == "remove":
                 # Check admin permission
-                if not any(role_check.id in QUOTA_ADMIN_ROLES for role_check in interaction.user.roles):
+                if not self.has_quota_admin_permission(interaction.user):
                     await interaction.followup.send(
                         "<:Denied:1426930694633816248> You don't have permission to remove quotas.",
                         ephemeral=True
@@ -2162,7 +2299,7 @@ class ShiftManagementCog(commands.Cog):
                     return
 
                 # Check if user is admin (to show ignored roles)
-                is_admin = any(role_check.id in QUOTA_ADMIN_ROLES for role_check in interaction.user.roles)
+                is_admin = self.has_quota_admin_permission(interaction.user)
 
                 # Fetch all quotas
                 async with db.pool.acquire() as conn:
@@ -2267,7 +2404,7 @@ class ShiftManagementCog(commands.Cog):
 
             elif action == "toggle_visibility":
                 # Check admin permission
-                if not any(role_check.id in QUOTA_ADMIN_ROLES for role_check in interaction.user.roles):
+                if not self.has_quota_admin_permission(interaction.user):
                     await interaction.followup.send(
                         "<:Denied:1426930694633816248> You don't have permission to toggle role visibility.",
                         ephemeral=True
@@ -2382,8 +2519,7 @@ class ShiftManagementCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in shift_quota")
 
     @shift_group.command(name="leaderboard", description="View shift leaderboard")
     @app_commands.describe(
@@ -2422,49 +2558,9 @@ class ShiftManagementCog(commands.Cog):
             return
 
         try:
-            async with db.pool.acquire() as conn:
-                if wave is not None:
-                    # View specific wave (historical data)
-                    query = '''SELECT discord_user_id,
-                                      discord_username,
-                                      SUM(EXTRACT(EPOCH FROM (end_time - start_time)) -
-                                          COALESCE(pause_duration, 0)) as total_seconds
-                               FROM shifts
-                               WHERE end_time IS NOT NULL
-                                 AND (wave_number = $1 OR round_number = $1)
-                                 AND type = $2
-                               GROUP BY discord_user_id, discord_username
-                               ORDER BY total_seconds DESC LIMIT 25'''
-                    results = await conn.fetch(query, wave, type.value)
-
-                    week_start = await conn.fetchval(
-                        '''SELECT MIN(week_identifier) 
-                           FROM shifts 
-                           WHERE (wave_number = $1 OR round_number = $1)''',
-                        wave
-                    )
-
-                    if week_start:
-                        week_end = week_start + timedelta(days=6)
-                        wave_label = f"Wave {wave} ({week_start.strftime('%d %b')} - {week_end.strftime('%d %b %Y')})"
-                    else:
-                        wave_label = f"Wave {wave}"
-                else:
-                    # View current week (no wave assigned yet)
-                    current_week = self.weekly_manager.get_current_week_monday()
-                    query = '''SELECT discord_user_id,
-                                      discord_username,
-                                      SUM(EXTRACT(EPOCH FROM (end_time - start_time)) -
-                                          COALESCE(pause_duration, 0)) as total_seconds
-                               FROM shifts
-                               WHERE end_time IS NOT NULL
-                                 AND week_identifier = $1
-                                 AND wave_number IS NULL
-                                 AND type = $2
-                               GROUP BY discord_user_id, discord_username
-                               ORDER BY total_seconds DESC LIMIT 25'''
-                    results = await conn.fetch(query, current_week, type.value)
-                    wave_label = "Current Wave"
+            leaderboard = await self.get_leaderboard(type.value, wave, interaction.guild)
+            results = leaderboard['rows']
+            wave_label = leaderboard['label']
 
             if not results:
                 wave_display = f"Wave {wave}" if wave is not None else "Current Wave"
@@ -2480,8 +2576,7 @@ class ShiftManagementCog(commands.Cog):
                 await interaction.edit_original_response(embed=embed)
                 return
 
-            user_ids = [row['discord_user_id'] for row in results]
-            quota_infos = await self.get_bulk_quota_info(user_ids, interaction.guild, type.value)
+            quota_infos = leaderboard['quota_infos'].get(interaction.guild.id, {})
 
             embed = discord.Embed(
                 title="Shift Leaderboard",
@@ -2531,8 +2626,7 @@ class ShiftManagementCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in shift_leaderboard")
 
     @shift_leaderboard.autocomplete('wave')
     async def wave_autocomplete(
@@ -2601,7 +2695,7 @@ class ShiftManagementCog(commands.Cog):
             return choices
 
         except Exception as e:
-            print(f"Error in wave autocomplete: {e}")
+            logger.error(f"Error in wave autocomplete: {e}")
             return []
 
     '''@shift_group.command(name="reset", description="[ADMIN] Reset shifts for a wave")
@@ -2617,7 +2711,7 @@ class ShiftManagementCog(commands.Cog):
         await interaction.response.defer()
 
         # Check permission
-        if not any(role.id in RESET_ROLES for role in interaction.user.roles):
+        if not self.has_reset_permission(interaction.user):
             await interaction.followup.send(
                 "<:Denied:1426930694633816248> You don't have permission to reset shifts.",
                 ephemeral=True
@@ -2669,8 +2763,7 @@ class ShiftManagementCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()'''
+            logger.exception("Error in shift_reset")'''
 
     @shift_group.command(name="manage", description="Manage your shifts")
     @app_commands.describe(type="Select your shift type")
@@ -2719,8 +2812,7 @@ class ShiftManagementCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in shift_manage")
 
     @shift_manage.autocomplete('type')
     async def shift_type_autocomplete(
@@ -2881,8 +2973,7 @@ class ShiftManagementCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in shift_active")
 
     # Admin command
     @shift_group.command(name="admin", description="Manage shifts for users")
@@ -2957,8 +3048,7 @@ class ShiftManagementCog(commands.Cog):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in shift_admin")
 
     def format_duration_short(self, td: timedelta) -> str:
         """Format a timedelta into a short readable string"""
@@ -3079,28 +3169,20 @@ class ShiftManagementCog(commands.Cog):
         await interaction.edit_original_response(embed=embed, view=view)
 
     async def end_shift_and_show_summary(self, interaction: discord.Interaction, shift: dict):
-        """End the shift and show summary with statistics"""
-        # If paused, add final pause duration
-        pause_duration = shift.get('pause_duration', 0)
-        if shift.get('pause_start'):
-            pause_duration += (datetime.utcnow() - shift['pause_start']).total_seconds()
+        """End the shift (if still open) and show summary with statistics"""
+        if not shift.get('end_time'):
+            ended = await db.end_shift(shift['id'], datetime.utcnow())
+            self.cancel_break_timer(shift['id'])
+            if ended:
+                shift = ended
 
-        # End the shift
-        async with db.pool.acquire() as conn:
-            await conn.execute(
-                '''UPDATE shifts
-                   SET end_time       = $1,
-                       pause_duration = $2,
-                       pause_start    = NULL
-                   WHERE id = $3''',
-                datetime.utcnow(), pause_duration, shift['id']
-            )
+        pause_duration = shift.get('pause_duration') or 0
 
         # Get updated statistics
         stats = await self.get_shift_statistics(interaction.user.id)
 
         # Calculate this shift's duration
-        total_duration = datetime.utcnow() - shift['start_time']
+        total_duration = (shift.get('end_time') or datetime.utcnow()) - shift['start_time']
         active_duration = total_duration - timedelta(seconds=pause_duration)
 
         # Create summary embed
@@ -3297,44 +3379,58 @@ class ShiftManagementCog(commands.Cog):
     async def queue_modification_log(self, guild: discord.Guild, admin: discord.Member,
                                      target_user: discord.Member, shift: dict,
                                      modification_detail: str):
-        """Queue a modification to be logged in batch after 5 minutes"""
-        cache_key = (admin.id, target_user.id, shift['id'])
+        """Queue a modification to be logged in batch after 5 minutes (survives restarts)"""
+        self.invalidate_leaderboard(shift['type'], shift.get('wave_number'))
+
+        job_name = f"shift.modification_log:{admin.id}:{target_user.id}:{shift['id']}"
         current_time = datetime.utcnow()
 
-        # Initialize cache entry if doesn't exist
-        if cache_key not in self._modification_cache:
-            self._modification_cache[cache_key] = {
+        # Continue an existing batch (possibly restored from before a restart)
+        payload = await scheduler.get_payload(job_name)
+        if not payload:
+            payload = {
                 'modifications': [],
-                'first_time': current_time,
-                'shift': shift,
-                'guild': guild,
-                'admin': admin,
-                'target_user': target_user
+                'first_time': current_time.isoformat(),
+                'shift': {'id': shift['id'], 'type': shift['type']},
+                'guild_id': guild.id,
+                'admin_id': admin.id,
+                'target_user_id': target_user.id
             }
 
-        # Add modification to cache
-        self._modification_cache[cache_key]['modifications'].append({
-            'time': current_time,
+        payload['modifications'].append({
+            'time': current_time.isoformat(),
             'detail': modification_detail
         })
 
-        # Cancel existing timer if present
-        if cache_key in self._modification_timers:
-            self._modification_timers[cache_key].cancel()
-
-        # Create new timer
-        timer = asyncio.create_task(self._send_batched_modifications(cache_key))
-        self._modification_timers[cache_key] = timer
-
-    async def _send_batched_modifications(self, cache_key: tuple):
-        """Send batched modifications after 5 minute delay"""
-        await asyncio.sleep(300)  # 5 minutes
-
-        if cache_key not in self._modification_cache:
-            return
+        # Re-using the job name pushes the send time back (debounce)
+        await scheduler.schedule_once(
+            job_name,
+            'shift.modification_log',
+            current_time + timedelta(seconds=MODIFICATION_LOG_DELAY_SECONDS),
+            payload
+        )
 
-        cache_data = self._modification_cache.pop(cache_key)
-        self._modification_timers.pop(cache_key, None)
+    async def _send_batched_modifications(self, payload: dict):
+        """Send a batch of modifications once the 5 minute window has passed"""
+        guild = self.bot.get_guild(payload['guild_id'])
+        target_user = None
+        admin = None
+        if guild:
+            target_user = guild.get_member(payload['target_user_id'])
+            admin = guild.get_member(payload['admin_id'])
+        if target_user is None:
+            target_user = await self.bot.fetch_user(payload['target_user_id'])
+        if admin is None:
+            admin = await self.bot.fetch_user(payload['admin_id'])
+
+        cache_data = {
+            'modifications': payload['modifications'],
+            'first_time': datetime.fromisoformat(payload['first_time']),
+            'shift': payload['shift'],
+            'guild': guild,
+            'admin': admin,
+            'target_user': target_user
+        }
 
         # Build modification details
         mod_lines = []
@@ -3387,88 +3483,211 @@ class ShiftManagementCog(commands.Cog):
 
         await channel.send(embed=embed)
 
-    # Add this method to ShiftManagementCog class (around line 800)
-    @tasks.loop(minutes=5)  # Check every 5 minutes
-    async def check_long_breaks(self):
-        """Automatically end shifts with breaks over threshold"""
+    def arm_break_timer(self, shift_id: int, pause_start: datetime):
+        """Auto-terminate the shift exactly when its break passes the threshold"""
+        self.cancel_break_timer(shift_id)
+        deadline = pause_start + timedelta(seconds=LONG_BREAK_THRESHOLD_SECONDS)
+        self._break_timers[shift_id] = asyncio.create_task(self._break_deadline(shift_id, deadline))
+
+    def cancel_break_timer(self, shift_id: int):
+        """Cancel a pending break deadline (on resume or end)"""
+        timer = self._break_timers.pop(shift_id, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+
+    async def rebuild_break_timers(self):
+        """Arm a deadline for every open break in the database"""
+        async with db.pool.acquire() as conn:
+            paused = await conn.fetch(
+                '''SELECT id, pause_start
+                   FROM shifts
+                   WHERE pause_start IS NOT NULL
+                     AND end_time IS NULL'''
+            )
+
+        for shift in paused:
+            existing = self._break_timers.get(shift['id'])
+            if existing is None or existing.done():
+                self.arm_break_timer(shift['id'], shift['pause_start'])
+
+        if paused:
+            logger.info(f"Armed break deadlines for {len(paused)} paused shifts")
+
+    async def _break_deadline(self, shift_id: int, deadline: datetime):
         try:
-            async with db.pool.acquire() as conn:
-                # Find all shifts on break for longer than threshold
-                threshold_time = datetime.utcnow() - timedelta(seconds=LONG_BREAK_THRESHOLD_SECONDS)
+            delay = (deadline - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.auto_terminate_break(shift_id)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.exception(f"Error in break deadline for shift {shift_id}: {e}")
+        finally:
+            if self._break_timers.get(shift_id) is asyncio.current_task():
+                self._break_timers.pop(shift_id, None)
 
-                long_breaks = await conn.fetch(
-                    '''SELECT *
-                       FROM shifts
-                       WHERE pause_start IS NOT NULL
-                         AND pause_start < $1
-                         AND end_time IS NULL''',
-                    threshold_time
+    async def auto_terminate_break(self, shift_id: int):
+        """End a shift whose break exceeded the threshold (single guarded UPDATE)"""
+        # The break guard makes this a no-op if the break was resumed/ended meanwhile
+        shift = await db.end_shift(shift_id, datetime.utcnow(), min_break_seconds=LONG_BREAK_THRESHOLD_SECONDS)
+
+        if not shift:
+            return
+
+        completed_shift = shift
+
+        # Clean up roles/nicknames
+        guild = self.bot.get_guild(completed_shift.get('guild_id'))
+        if guild:
+            member = guild.get_member(completed_shift['discord_user_id'])
+            if member:
+                await self.update_shift_status(member, completed_shift['type'], 'off')
+
+                # Log the auto-termination
+                await self.log_shift_event(
+                    guild,
+                    'end',
+                    member,
+                    completed_shift,
+                    admin=guild.me,  # Passes the bot as the admin
+                    details=f"Auto-terminated: Break exceeded {LONG_BREAK_THRESHOLD_SECONDS // 60} minutes"
                 )
 
-                for shift in long_breaks:
-                    # Calculate final pause duration
-                    pause_duration = shift.get('pause_duration', 0)
-                    pause_duration += (datetime.utcnow() - shift['pause_start']).total_seconds()
+        logger.info(f"Auto-terminated shift {shift_id} due to long break")
 
-                    # Close break session
-                    current_sessions = await conn.fetchval(
-                        'SELECT break_sessions FROM shifts WHERE id = $1',
-                        shift['id']
-                    )
+    async def get_leaderboard(self, type: str, wave: int = None, guild: discord.Guild = None) -> dict:
+        """
+        Top shift totals for a type and wave (None = current wave), served from memory when cached.
+        Archived waves never change so they stay cached; the current wave is invalidated on shift changes.
+        """
+        key = (type, wave)
+        entry = self._leaderboard_cache.get(key)
+        if entry is None or (wave is None and entry['week'] != self.weekly_manager.get_current_week_monday()):
+            entry = await self._build_leaderboard(key)
+
+        # Quota icons are only shown for the current wave
+        if wave is None and guild is not None:
+            self._leaderboard_guilds.add(guild.id)
+            if guild.id not in entry['quota_infos'] and entry['rows']:
+                user_ids = [row['discord_user_id'] for row in entry['rows']]
+                entry['quota_infos'][guild.id] = await self.get_bulk_quota_info(user_ids, guild, type)
+
+        return entry
+
+    def invalidate_leaderboard(self, type: str, wave: int = None, all_waves: bool = False):
+        """Drop cached leaderboards after shifts change; the current wave is rebuilt in the background"""
+        keys = {key for key in self._leaderboard_cache if key[0] == type and (all_waves or key[1] == wave)}
+        keys.add((type, wave))
+        for key in keys:
+            self._leaderboard_versions[key] = self._leaderboard_versions.get(key, 0) + 1
+            self._leaderboard_cache.pop(key, None)
+
+        if all_waves or wave is None:
+            asyncio.create_task(self._warm_leaderboard(type))
+
+    async def warm_leaderboards(self):
+        """Pre-compute the current wave's leaderboard for every shift type"""
+        for type in typeS.values():
+            self._leaderboard_versions[(type, None)] = self._leaderboard_versions.get((type, None), 0) + 1
+            await self._warm_leaderboard(type)
+
+    async def _warm_leaderboard(self, type: str):
+        try:
+            await self._build_leaderboard((type, None))
+        except Exception as e:
+            logger.error(f"Error warming {type} leaderboard: {e}")
+
+    async def _build_leaderboard(self, key: tuple) -> dict:
+        # Single-flight: concurrent requests for the same leaderboard share one build
+        task = self._leaderboard_builds.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._compute_leaderboard(key))
+            self._leaderboard_builds[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute_leaderboard(self, key: tuple) -> dict:
+        type, wave = key
+        try:
+            while True:
+                version = self._leaderboard_versions.get(key, 0)
+                entry = await self._query_leaderboard(type, wave)
+
+                if wave is None and entry['rows']:
+                    user_ids = [row['discord_user_id'] for row in entry['rows']]
+                    for guild_id in list(self._leaderboard_guilds):
+                        guild = self.bot.get_guild(guild_id)
+                        if guild:
+                            entry['quota_infos'][guild_id] = await self.get_bulk_quota_info(user_ids, guild, type)
+
+                # Shifts changed while we were querying - go again
+                if self._leaderboard_versions.get(key, 0) == version:
+                    break
 
-                    sessions = json.loads(current_sessions) if current_sessions else []
-                    if sessions and sessions[-1]['end'] is None:
-                        final_duration = (datetime.utcnow() - shift['pause_start']).total_seconds()
-                        sessions[-1]['end'] = datetime.utcnow().isoformat()
-                        sessions[-1]['duration'] = final_duration
+            # Don't pin an empty archived wave: it may simply not exist yet
+            if wave is None or entry['rows']:
+                self._leaderboard_cache[key] = entry
+            return entry
+        finally:
+            if self._leaderboard_builds.get(key) is asyncio.current_task():
+                del self._leaderboard_builds[key]
 
-                    # End the shift
-                    await conn.execute(
-                        '''UPDATE shifts
-                           SET end_time       = $1,
-                               pause_duration = $2,
-                               pause_start    = NULL,
-                               break_sessions = $3
-                           WHERE id = $4''',
-                        datetime.utcnow(),
-                        pause_duration,
-                        json.dumps(sessions),
-                        shift['id']
-                    )
+    async def _query_leaderboard(self, type: str, wave: int = None) -> dict:
+        current_week = self.weekly_manager.get_current_week_monday()
 
-                    # Clean up roles/nicknames
-                    guild = self.bot.get_guild(shift.get('guild_id'))
-                    if guild:
-                        member = guild.get_member(shift['discord_user_id'])
-                        if member:
-                            await self.update_nickname_for_shift_status(member, 'off')
-                            await self.update_duty_roles(member, shift['type'], 'off')
-
-                            # Log the auto-termination
-                            completed_shift = dict(shift)
-                            completed_shift['end_time'] = datetime.utcnow()
-                            completed_shift['pause_duration'] = pause_duration
-
-                            await self.log_shift_event(
-                                guild,
-                                'end',
-                                member,
-                                completed_shift,
-                                admin=guild.me,  # ADD THIS - passes the bot as the admin
-                                details=f"Auto-terminated: Break exceeded {LONG_BREAK_THRESHOLD_SECONDS // 60} minutes"
-                            )
+        async with db.pool.acquire() as conn:
+            if wave is not None:
+                # Specific wave (historical data)
+                results = await conn.fetch(
+                    '''SELECT discord_user_id,
+                              discord_username,
+                              SUM(EXTRACT(EPOCH FROM (end_time - start_time)) -
+                                  COALESCE(pause_duration, 0)) as total_seconds
+                       FROM shifts
+                       WHERE end_time IS NOT NULL
+                         AND (wave_number = $1 OR round_number = $1)
+                         AND type = $2
+                       GROUP BY discord_user_id, discord_username
+                       ORDER BY total_seconds DESC LIMIT $3''',
+                    wave, type, LEADERBOARD_SIZE
+                )
 
-                    print(f"Auto-terminated shift {shift['id']} due to long break")
+                week_start = await conn.fetchval(
+                    '''SELECT MIN(week_identifier)
+                       FROM shifts
+                       WHERE (wave_number = $1 OR round_number = $1)''',
+                    wave
+                )
 
-        except Exception as e:
-            print(f"Error in check_long_breaks: {e}")
-            import traceback
-            traceback.print_exc()
+                if week_start:
+                    week_end = week_start + timedelta(days=6)
+                    wave_label = f"Wave {wave} ({week_start.strftime('%d %b')} - {week_end.strftime('%d %b %Y')})"
+                else:
+                    wave_label = f"Wave {wave}"
+            else:
+                # Current week (no wave assigned yet)
+                results = await conn.fetch(
+                    '''SELECT discord_user_id,
+                              discord_username,
+                              SUM(EXTRACT(EPOCH FROM (end_time - start_time)) -
+                                  COALESCE(pause_duration, 0)) as total_seconds
+                       FROM shifts
+                       WHERE end_time IS NOT NULL
+                         AND week_identifier = $1
+                         AND wave_number IS NULL
+                         AND type = $2
+                       GROUP BY discord_user_id, discord_username
+                       ORDER BY total_seconds DESC LIMIT $3''',
+                    current_week, type, LEADERBOARD_SIZE
+                )
+                wave_label = "Current Wave"
 
-    @check_long_breaks.before_loop
-    async def before_check_long_breaks(self):
-        """Wait until bot is ready before starting the task"""
-        await self.bot.wait_until_ready()
+        return {
+            'rows': [dict(row) for row in results],
+            'label': wave_label,
+            'week': current_week,
+            'quota_infos': {}  # guild_id -> {user_id: quota_info}
+        }
 
     async def get_watch_hosting_count(self, user_id: int, weeks_back: int = 1) -> int:
         """
@@ -3479,35 +3698,22 @@ class ShiftManagementCog(commands.Cog):
             user_id: Discord user ID
             weeks_back: Number of weeks to look back (for quota period)
         """
-        try:
-            from watches import load_completed_watches
-            completed_watches = await load_completed_watches()
+        counts = await self.get_bulk_watch_hosting_counts([user_id], weeks_back)
+        return counts.get(user_id, 0)
 
-            # Calculate cutoff time
-            cutoff_timestamp = int((datetime.utcnow() - timedelta(weeks=weeks_back)).timestamp())
-
-            watch_count = 0
-
-            for watch_id, watch_data in completed_watches.items():
-                # Check if this user hosted the watch
-                if watch_data.get('user_id') != user_id:
-                    continue
-
-                # Check if watch is within time period
-                if watch_data.get('started_at', 0) < cutoff_timestamp:
-                    continue
-
-                # Only count successful watches
-                if watch_data.get('status') == 'failed':
-                    continue
-
-                watch_count += 1
+    async def get_bulk_watch_hosting_counts(self, user_ids: list, weeks_back: int = 1) -> dict:
+        """
+        Get watch hosting counts for many users with a single grouped query
 
-            return watch_count
+        Returns: {user_id: watch_count} (users with no watches are omitted)
+        """
+        try:
+            cutoff = datetime.utcnow() - timedelta(weeks=weeks_back)
+            return await db.get_watch_hosting_counts(user_ids, cutoff)
 
         except Exception as e:
-            print(f'Error getting watch hosting count: {e}')
-            return 0
+            logger.error(f'Error getting watch hosting counts: {e}')
+            return {}
 
     async def get_total_active_time_with_watches(self, user_id: int, type: str, quota_period_weeks: int = 1) -> tuple[
         int, int]:
@@ -3556,7 +3762,7 @@ class ShiftManagementCog(commands.Cog):
         watch_count = 0
         if type == "Shift FENZ":
             watch_count = await self.get_watch_hosting_count(user_id, quota_period_weeks)
-            print(f"User {user_id} FENZ quota: {int(total_seconds)}s shifts + {watch_count} watches")
+            logger.info(f"User {user_id} FENZ quota: {int(total_seconds)}s shifts + {watch_count} watches")
 
         return int(total_seconds), watch_count
 
@@ -3709,8 +3915,7 @@ class ShiftStartView(discord.ui.View):
                 current_week, interaction.guild.id
             )
 
-        await self.cog.update_nickname_for_shift_status(self.user, 'duty')
-        await self.cog.update_duty_roles(self.user, type, 'duty')
+        await self.cog.update_shift_status(self.user, type, 'duty')
 
         shift = await self.cog.get_active_shift(self.user.id)
 
@@ -3779,35 +3984,18 @@ class ShiftActiveView(discord.ui.View):
         await interaction.response.defer()
 
         try:
-            async with db.pool.acquire() as conn:
-                # Get current break_sessions
-                current_sessions = await conn.fetchval(
-                    'SELECT break_sessions FROM shifts WHERE id = $1',
-                    self.shift['id']
+            # Open a break row and set pause_start in one statement
+            pause_start = datetime.utcnow()
+            if not await db.start_break(self.shift['id'], pause_start):
+                await interaction.followup.send(
+                    "<:Denied:1426930694633816248> This shift is already on break or has ended.",
+                    ephemeral=True
                 )
+                return
 
-                # Parse existing sessions (handle None case)
-                sessions = json.loads(current_sessions) if current_sessions else []
+            self.cog.arm_break_timer(self.shift['id'], pause_start)
 
-                # Add new break session with start time (no end yet)
-                sessions.append({
-                    'start': datetime.utcnow().isoformat(),
-                    'end': None,
-                    'duration': None
-                })
-
-                await conn.execute(
-                    '''UPDATE shifts
-                       SET pause_start    = $1,
-                           break_sessions = $2
-                       WHERE id = $3''',
-                    datetime.utcnow(),
-                    json.dumps(sessions),
-                    self.shift['id']
-                )
-
-            await self.cog.update_nickname_for_shift_status(self.user, 'break')
-            await self.cog.update_duty_roles(self.user, self.shift['type'], 'break')
+            await self.cog.update_shift_status(self.user, self.shift['type'], 'break')
 
             updated_shift = await self.cog.get_active_shift(self.user.id)
 
@@ -3852,57 +4040,19 @@ class ShiftActiveView(discord.ui.View):
         await interaction.response.defer()
 
         try:
-            await asyncio.gather(
-                self.cog.update_nickname_for_shift_status(self.user, 'off'),
-                self.cog.update_duty_roles(self.user, self.shift['type'], 'off')
-            )
-
-            async with db.pool.acquire() as conn:
-                current_sessions = await conn.fetchval(
-                    'SELECT break_sessions FROM shifts WHERE id = $1',
-                    self.shift['id']
-                )
-
-                sessions = json.loads(current_sessions) if current_sessions else []
-
-                # If there's an open break, close it
-                if sessions and sessions[-1]['end'] is None:
-                    final_duration = (datetime.utcnow() - self.shift['pause_start']).total_seconds()
-                    sessions[-1]['end'] = datetime.utcnow().isoformat()
-                    sessions[-1]['duration'] = final_duration
-
-                    # Calculate pause_duration INCLUDING this final break
-                    pause_duration = self.shift.get('pause_duration', 0) + final_duration
-
-                    # Update break_sessions AND pause_duration in ONE query
-                    await conn.execute(
-                        '''UPDATE shifts
-                           SET break_sessions = $1,
-                               pause_duration = $2
-                           WHERE id = $3''',
-                        json.dumps(sessions),
-                        pause_duration,
-                        self.shift['id']
-                    )
-                else:
-                    # No open break, just use existing pause_duration
-                    pause_duration = self.shift.get('pause_duration', 0)
+            await self.cog.update_shift_status(self.user, self.shift['type'], 'off')
 
-            # NOW end the shift with correct pause_duration
-            async with db.pool.acquire() as conn:
-                await conn.execute(
-                    '''UPDATE shifts
-                       SET end_time    = $1,
-                           pause_start = NULL
-                       WHERE id = $2''',
-                    datetime.utcnow(),
-                    self.shift['id']
+            # End the shift and close any open break in one statement
+            completed_shift = await db.end_shift(self.shift['id'], datetime.utcnow())
+            self.cog.cancel_break_timer(self.shift['id'])
+            if not completed_shift:
+                await interaction.followup.send(
+                    "<:Denied:1426930694633816248> This shift has already ended.",
+                    ephemeral=True
                 )
+                return
 
-            # Get the completed shift for logging
-            completed_shift = dict(self.shift)
-            completed_shift['end_time'] = datetime.utcnow()
-            completed_shift['pause_duration'] = pause_duration
+            pause_duration = completed_shift.get('pause_duration') or 0
 
             # ðŸ†• LOG THE SHIFT END
             await self.cog.log_shift_event(
@@ -3959,7 +4109,7 @@ class ShiftActiveView(discord.ui.View):
 
             embed.set_footer(text=f"Shift Type: {self.shift['type']}")
 
-            await self.cog.end_shift_and_show_summary(interaction, self.shift)
+            await self.cog.end_shift_and_show_summary(interaction, completed_shift)
 
         except Exception as e:
             await interaction.followup.send(
@@ -4001,35 +4151,22 @@ class ShiftBreakView(discord.ui.View):
         await interaction.response.defer()
 
         try:
-            pause_duration = (datetime.utcnow() - self.shift['pause_start']).total_seconds()
-            total_pause = self.shift.get('pause_duration', 0) + pause_duration
-
-            async with db.pool.acquire() as conn:
-                # Get current break_sessions
-                current_sessions = await conn.fetchval(
-                    'SELECT break_sessions FROM shifts WHERE id = $1',
-                    self.shift['id']
+            # Close the open break row and fold it into pause_duration in one statement
+            resumed_at = datetime.utcnow()
+            resumed = await db.end_break(self.shift['id'], resumed_at)
+            if not resumed:
+                await interaction.followup.send(
+                    "<:Denied:1426930694633816248> This shift is not on break.",
+                    ephemeral=True
                 )
+                return
 
-                # Parse and update the last session
-                sessions = json.loads(current_sessions) if current_sessions else []
-                if sessions and sessions[-1]['end'] is None:
-                    sessions[-1]['end'] = datetime.utcnow().isoformat()
-                    sessions[-1]['duration'] = pause_duration
-
-                await conn.execute(
-                    '''UPDATE shifts
-                       SET pause_start    = NULL,
-                           pause_duration = $1,
-                           break_sessions = $2
-                       WHERE id = $3''',
-                    total_pause,
-                    json.dumps(sessions),
-                    self.shift['id']
-                )
+            self.cog.cancel_break_timer(self.shift['id'])
+            pause_duration = resumed['break_seconds']
+            if pause_duration is None:
+                pause_duration = (resumed_at - self.shift['pause_start']).total_seconds()
 
-            await self.cog.update_nickname_for_shift_status(self.user, 'duty')
-            await self.cog.update_duty_roles(self.user, self.shift['type'], 'duty')
+            await self.cog.update_shift_status(self.user, self.shift['type'], 'duty')
 
             updated_shift = await self.cog.get_active_shift(self.user.id)
 
@@ -4087,57 +4224,19 @@ class ShiftBreakView(discord.ui.View):
         await interaction.response.defer()
 
         try:
-            await asyncio.gather(
-                self.cog.update_nickname_for_shift_status(self.user, 'off'),
-                self.cog.update_duty_roles(self.user, self.shift['type'], 'off')
-            )
-
-            async with db.pool.acquire() as conn:
-                current_sessions = await conn.fetchval(
-                    'SELECT break_sessions FROM shifts WHERE id = $1',
-                    self.shift['id']
-                )
-
-                sessions = json.loads(current_sessions) if current_sessions else []
-
-                # If there's an open break, close it
-                if sessions and sessions[-1]['end'] is None:
-                    final_duration = (datetime.utcnow() - self.shift['pause_start']).total_seconds()
-                    sessions[-1]['end'] = datetime.utcnow().isoformat()
-                    sessions[-1]['duration'] = final_duration
-
-                    # Calculate pause_duration INCLUDING this final break
-                    pause_duration = self.shift.get('pause_duration', 0) + final_duration
-
-                    # Update break_sessions AND pause_duration in ONE query
-                    await conn.execute(
-                        '''UPDATE shifts
-                           SET break_sessions = $1,
-                               pause_duration = $2
-                           WHERE id = $3''',
-                        json.dumps(sessions),
-                        pause_duration,
-                        self.shift['id']
-                    )
-                else:
-                    # No open break, just use existing pause_duration
-                    pause_duration = self.shift.get('pause_duration', 0)
+            await self.cog.update_shift_status(self.user, self.shift['type'], 'off')
 
-            # NOW end the shift with correct pause_duration
-            async with db.pool.acquire() as conn:
-                await conn.execute(
-                    '''UPDATE shifts
-                       SET end_time    = $1,
-                           pause_start = NULL
-                       WHERE id = $2''',
-                    datetime.utcnow(),
-                    self.shift['id']
+            # End the shift and close any open break in one statement
+            completed_shift = await db.end_shift(self.shift['id'], datetime.utcnow())
+            self.cog.cancel_break_timer(self.shift['id'])
+            if not completed_shift:
+                await interaction.followup.send(
+                    "<:Denied:1426930694633816248> This shift has already ended.",
+                    ephemeral=True
                 )
+                return
 
-            # Get the completed shift for logging
-            completed_shift = dict(self.shift)
-            completed_shift['end_time'] = datetime.utcnow()
-            completed_shift['pause_duration'] = pause_duration
+            pause_duration = completed_shift.get('pause_duration') or 0
 
             # 🆕 LOG THE SHIFT END
             await self.cog.log_shift_event(
@@ -4191,7 +4290,7 @@ class ShiftBreakView(discord.ui.View):
 
             embed.set_footer(text=f"Shift Type: {self.shift['type']}")
 
-            await self.cog.end_shift_and_show_summary(interaction, self.shift)
+            await self.cog.end_shift_and_show_summary(interaction, completed_shift)
 
         except Exception as e:
             await interaction.followup.send(
@@ -4256,11 +4355,8 @@ class ShiftTypeSelectView(discord.ui.View):
                     current_week, interaction.guild.id
                 )
 
-            # Update nickname to DUTY
-            await self.cog.update_nickname_for_shift_status(self.user, 'duty')
-
-            # Update duty roles
-            await self.cog.update_duty_roles(self.user, type, 'duty')
+            # Update nickname to DUTY and duty roles
+            await self.cog.update_shift_status(self.user, type, 'duty')
 
             # Get the newly created shift
             shift = await self.cog.get_active_shift(self.user.id)
@@ -4423,8 +4519,7 @@ class AdminShiftControlView(discord.ui.View):
                     current_week, interaction.guild.id
                 )
 
-            await self.cog.update_nickname_for_shift_status(self.target_user, 'duty')
-            await self.cog.update_duty_roles(self.target_user, self.type, 'duty')
+            await self.cog.update_shift_status(self.target_user, self.type, 'duty')
 
             # Get the newly created shift
             shift = await self.cog.get_active_shift(self.target_user.id)
@@ -4456,35 +4551,18 @@ class AdminShiftControlView(discord.ui.View):
                 )
                 return
 
-            async with db.pool.acquire() as conn:
-                # Get current break_sessions
-                current_sessions = await conn.fetchval(
-                    'SELECT break_sessions FROM shifts WHERE id = $1',
-                    self.active_shift['id']
+            # Open a break row and set pause_start in one statement
+            pause_start = datetime.utcnow()
+            if not await db.start_break(self.active_shift['id'], pause_start):
+                await interaction.followup.send(
+                    "<:Denied:1426930694633816248> This shift is already on break or has ended.",
+                    ephemeral=True
                 )
+                return
 
-                # Parse existing sessions
-                sessions = json.loads(current_sessions) if current_sessions else []
+            self.cog.arm_break_timer(self.active_shift['id'], pause_start)
 
-                # Add new break session
-                sessions.append({
-                    'start': datetime.utcnow().isoformat(),
-                    'end': None,
-                    'duration': None
-                })
-
-                await conn.execute(
-                    '''UPDATE shifts
-                       SET pause_start    = $1,
-                           break_sessions = $2
-                       WHERE id = $3''',
-                    datetime.utcnow(),
-                    json.dumps(sessions),
-                    self.active_shift['id']
-                )
-
-            await self.cog.update_nickname_for_shift_status(self.target_user, 'break')
-            await self.cog.update_duty_roles(self.target_user, self.type, 'break')
+            await self.cog.update_shift_status(self.target_user, self.type, 'break')
 
             # Get updated shift
             updated_shift = await self.cog.get_active_shift(self.target_user.id)
@@ -4521,35 +4599,22 @@ class AdminShiftControlView(discord.ui.View):
                 )
                 return
 
-            pause_duration = (datetime.utcnow() - self.active_shift['pause_start']).total_seconds()
-            total_pause = self.active_shift.get('pause_duration', 0) + pause_duration
-
-            async with db.pool.acquire() as conn:
-                # Get current break_sessions
-                current_sessions = await conn.fetchval(
-                    'SELECT break_sessions FROM shifts WHERE id = $1',
-                    self.active_shift['id']
+            # Close the open break row and fold it into pause_duration in one statement
+            resumed_at = datetime.utcnow()
+            resumed = await db.end_break(self.active_shift['id'], resumed_at)
+            if not resumed:
+                await interaction.followup.send(
+                    "<:Denied:1426930694633816248> This shift is not on break.",
+                    ephemeral=True
                 )
+                return
 
-                # Parse and update the last session
-                sessions = json.loads(current_sessions) if current_sessions else []
-                if sessions and sessions[-1]['end'] is None:
-                    sessions[-1]['end'] = datetime.utcnow().isoformat()
-                    sessions[-1]['duration'] = pause_duration
+            self.cog.cancel_break_timer(self.active_shift['id'])
+            pause_duration = resumed['break_seconds']
+            if pause_duration is None:
+                pause_duration = (resumed_at - self.active_shift['pause_start']).total_seconds()
 
-                await conn.execute(
-                    '''UPDATE shifts
-                       SET pause_start    = NULL,
-                           pause_duration = $1,
-                           break_sessions = $2
-                       WHERE id = $3''',
-                    total_pause,
-                    json.dumps(sessions),
-                    self.active_shift['id']
-                )
-
-            await self.cog.update_nickname_for_shift_status(self.target_user, 'duty')
-            await self.cog.update_duty_roles(self.target_user, self.type, 'duty')
+            await self.cog.update_shift_status(self.target_user, self.type, 'duty')
 
             # Get updated shift
             updated_shift = await self.cog.get_active_shift(self.target_user.id)
@@ -4585,27 +4650,14 @@ class AdminShiftControlView(discord.ui.View):
                 "<a:Load:1430912797469970444> Stopping shift...",
                 ephemeral=True
             )
-            pause_duration = self.active_shift.get('pause_duration', 0)
-            if self.active_shift.get('pause_start'):
-                pause_duration += (datetime.utcnow() - self.active_shift['pause_start']).total_seconds()
-
-            async with db.pool.acquire() as conn:
-                await conn.execute(
-                    '''UPDATE shifts
-                       SET end_time       = $1,
-                           pause_duration = $2,
-                           pause_start    = NULL
-                       WHERE id = $3''',
-                    datetime.utcnow(), pause_duration, self.active_shift['id']
-                )
-
-            await self.cog.update_nickname_for_shift_status(self.target_user, 'off')
-            await self.cog.update_duty_roles(self.target_user, self.type, 'off')
+            # End the shift and close any open break in one statement
+            completed_shift = await db.end_shift(self.active_shift['id'], datetime.utcnow())
+            self.cog.cancel_break_timer(self.active_shift['id'])
+            if not completed_shift:
+                await status_msg.edit(content="<:Denied:1426930694633816248> This shift has already ended.")
+                return
 
-            # Create completed shift dict for logging
-            completed_shift = dict(self.active_shift)
-            completed_shift['end_time'] = datetime.utcnow()
-            completed_shift['pause_duration'] = pause_duration
+            await self.cog.update_shift_status(self.target_user, self.type, 'off')
 
             # 🆕 LOG THE ADMIN STOP
             await self.cog.log_shift_event(
@@ -5598,7 +5650,7 @@ class TimeModifyModal(discord.ui.Modal):
                 except discord.NotFound:
                     pass  # Message was deleted
                 except discord.HTTPException as e:
-                    print(f"Failed to edit message: {e}")
+                    logger.error(f"Failed to edit message: {e}")
 
         except ValueError:
             await interaction.followup.send(
@@ -5610,8 +5662,7 @@ class TimeModifyModal(discord.ui.Modal):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in TimeModifyModal.on_submit")
 
 class DeleteShiftSelectView(discord.ui.View):
     """View for selecting which shift to delete"""
@@ -5893,6 +5944,7 @@ class DeleteShiftConfirmView(discord.ui.View):
             # Delete the shift
             async with db.pool.acquire() as conn:
                 await conn.execute('DELETE FROM shifts WHERE id = $1', self.shift['id'])
+            self.cog.invalidate_leaderboard(self.shift['type'], self.shift.get('wave_number'))
 
             await interaction.followup.send(
                 f"<:Accepted:1426930333789585509> Deleted shift (ID: {self.shift['id']}) for {self.target_user.mention}",
@@ -5915,8 +5967,7 @@ class DeleteShiftConfirmView(discord.ui.View):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in DeleteShiftConfirmView.delete_button")
 
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary, emoji="<:Denied:1426930694633816248>")
     async def cancel_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -6225,6 +6276,8 @@ class ClearShiftsConfirmView(discord.ui.View):
                     )
                     scope_text = "all time"
 
+            self.cog.invalidate_leaderboard(self.type, all_waves=True)
+
             # Log the clear
             await self.cog.log_shift_event(
                 interaction.guild,
@@ -6256,8 +6309,7 @@ class ClearShiftsConfirmView(discord.ui.View):
                 f"<:Denied:1426930694633816248> Error: {str(e)}",
                 ephemeral=True
             )
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in ClearShiftsConfirmView.clear_button")
 
         except Exception as e:
             await interaction.followup.send(
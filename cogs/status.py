@@ -4,6 +4,7 @@ from discord import app_commands
 import random
 from datetime import timedelta
 from database import db
+from scheduler import scheduler
 
 # Your Discord User ID for approval permissions
 OWNER_ID = 678475709257089057
@@ -115,9 +116,8 @@ class StatusCog(commands.Cog):
 
         await self.load_submissions()
 
-        # Start the status rotation task
-        if not self.change_status.is_running():
-            self.change_status.start()
+        # Rotate the status every minute (per-process, so not persisted)
+        await scheduler.register('status.change_status', self.change_status, interval=60, durable=False)
         if not self.daily_submission_summary.is_running():
             self.daily_submission_summary.start()
 
@@ -173,7 +173,6 @@ class StatusCog(commands.Cog):
         if now.time() >= time(20, 0):
             target_time += timedelta(days=1)
 
-    @tasks.loop(minutes=1)
     async def change_status(self):
         """Automatically change bot status with random type"""
         # Pick a random status message
@@ -197,11 +196,6 @@ class StatusCog(commands.Cog):
 
         await self.bot.change_presence(activity=activity)
 
-    @change_status.before_loop
-    async def before_change_status(self):
-        """Wait until bot is ready before starting the loop"""
-        await self.bot.wait_until_ready()
-
     @app_commands.command(name="status", description="Submit a new status suggestion for the bot")
     @app_commands.describe(suggestion="Your status suggestion (e.g., 'Emergency response')")
     async def submit_status(self, interaction: discord.Interaction, suggestion: str):
@@ -405,7 +399,7 @@ class StatusCog(commands.Cog):
 
     async def cog_unload(self):
         """Cancel the task when cog is unloaded"""
-        self.change_status.cancel()
+        scheduler.unregister('status.change_status')
         self.daily_submission_summary.cancel()
 
 class StatusBulkReviewView(discord.ui.View):
@@ -4,13 +4,13 @@ load_dotenv()
 import discord
 from discord.ext import commands
 from discord import app_commands
-from discord.ext import tasks
 import asyncio
 import datetime
+import heapq
 from datetime import timezone
 import json
-import logging
-logger = logging.getLogger(__name__)
+from structured_logging import get_logger
+logger = get_logger(__name__)
 
 # Import database
 from database import db, load_watches, load_scheduled_votes, load_completed_watches
@@ -227,6 +227,86 @@ async def safe_delete_related_messages(channel: discord.TextChannel, message_ids
     return deleted, failed
 
 
+class ScheduledVoteQueue:
+    """
+    Min-heap of pending scheduled votes.
+
+    A single task sleeps until the earliest vote is due and is woken early
+    whenever a vote is added or cancelled, so votes fire on time without
+    polling the scheduled_votes table.
+    """
+
+    def __init__(self, cog):
+        self.cog = cog
+        self._heap = []  # (scheduled_time, vote_id)
+        self._votes = {}  # vote_id -> vote_data
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self, votes: dict):
+        """Seed the queue from the database and start the dispatcher"""
+        for vote_id, vote_data in votes.items():
+            self._votes[vote_id] = vote_data
+            heapq.heappush(self._heap, (vote_data['scheduled_time'], vote_id))
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def schedule(self, vote_id: str, vote_data: dict):
+        """Add (or reschedule) a vote and re-arm the timer"""
+        self._votes[vote_id] = vote_data
+        heapq.heappush(self._heap, (vote_data['scheduled_time'], vote_id))
+        self._wakeup.set()
+
+    def cancel(self, vote_id: str):
+        """Forget a vote; its heap entry is discarded lazily"""
+        if self._votes.pop(vote_id, None) is not None:
+            self._wakeup.set()
+
+    def next_due(self):
+        """Timestamp of the next pending vote, or None"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def _discard_stale(self):
+        while self._heap:
+            scheduled_time, vote_id = self._heap[0]
+            vote_data = self._votes.get(vote_id)
+            if vote_data is not None and vote_data['scheduled_time'] == scheduled_time:
+                break
+            heapq.heappop(self._heap)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            next_due = self.next_due()
+
+            if next_due is None:
+                await self._wakeup.wait()
+                continue
+
+            delay = next_due - discord.utils.utcnow().timestamp()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, vote_id = heapq.heappop(self._heap)
+            vote_data = self._votes.pop(vote_id)
+
+            try:
+                await self.cog.send_scheduled_vote(vote_data)
+                await db.remove_scheduled_vote(vote_id)
+            except Exception as e:
+                logger.error(f'Error dispatching scheduled vote {vote_id}: {e}')
+
 
 # Vote button and view
 class VoteButton(discord.ui.View):
@@ -419,7 +499,7 @@ class VoteButton(discord.ui.View):
                     await interaction.response.send_message(embed=error_embed, ephemeral=True)
                 else:
                     await interaction.followup.send(embed=error_embed, ephemeral=True)
-                print(f'Error processing vote: {e}')
+                logger.error(f'Error processing vote: {e}')
                 raise
 
 class WatchRoleButton(discord.ui.View):
@@ -461,7 +541,7 @@ class WatchRoleButton(discord.ui.View):
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
             await interaction.response.send_message(embed=error_embed, ephemeral=True)
-            print(f'Error toggling role: {e}')
+            logger.error(f'Error toggling role: {e}')
             raise
 
 
@@ -533,6 +613,7 @@ class MissedVoteConfirmationView(discord.ui.View):
 
             # Remove from database
             await db.remove_scheduled_vote(self.vote_id)
+            self.cog.vote_scheduler.cancel(self.vote_id)
 
             embed = interaction.message.embeds[0]
             embed.colour = discord.Colour(0x2ecc71)
@@ -546,7 +627,7 @@ class MissedVoteConfirmationView(discord.ui.View):
             await interaction.followup.send('<:Accepted:1426930333789585509> Vote sent successfully!', ephemeral=True)
 
         except Exception as e:
-            print(f'Error sending missed vote: {e}')
+            logger.error(f'Error sending missed vote: {e}')
             await interaction.followup.send(f'<:Denied:1426930694633816248> Error sending vote: {e}', ephemeral=True)
 
     @discord.ui.button(label='Cancel', emoji='<:Denied:1426930694633816248>', style=discord.ButtonStyle.red,
@@ -563,6 +644,7 @@ class MissedVoteConfirmationView(discord.ui.View):
 
             # Remove from database
             await db.remove_scheduled_vote(self.vote_id)
+            self.cog.vote_scheduler.cancel(self.vote_id)
 
             embed = interaction.message.embeds[0]
             embed.colour = discord.Colour(0xf24d4d)
@@ -577,7 +659,7 @@ class MissedVoteConfirmationView(discord.ui.View):
                                             ephemeral=True)
 
         except Exception as e:
-            print(f'Error cancelling missed vote: {e}')
+            logger.error(f'Error cancelling missed vote: {e}')
             await interaction.followup.send(f'<:Denied:1426930694633816248> Error: {e}', ephemeral=True)
 
 
@@ -655,7 +737,7 @@ class WatchRegulationsDropdown(discord.ui.View):
             await interaction.response.send_message(embed=regulations_embed, ephemeral=True)
 
         except Exception as e:
-            print(f'Error showing regulations: {e}')
+            logger.error(f'Error showing regulations: {e}')
             error_embed = discord.Embed(
                 description=f'<:Denied:1426930694633816248> Error: {e}',
                 colour=discord.Colour(0xf24d4d)
@@ -666,6 +748,7 @@ class WatchCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.vote_timeout_tasks = {}
+        self.vote_scheduler = ScheduledVoteQueue(self)
         self.bot.add_view(WatchRegulationsDropdown())
         self.bot.add_view(WatchRoleButton(message_id=0))
         self.bot.loop.create_task(self.initialize_cog())
@@ -693,12 +776,12 @@ class WatchCog(commands.Cog):
         max_wait = 30
         waited = 0
         while db.pool is None and waited < max_wait:
-            print("⏳ WatchCog waiting for database connection...")
+            logger.info("⏳ WatchCog waiting for database connection...")
             await asyncio.sleep(1)
             waited += 1
 
         if db.pool is None:
-            print("<:Denied:1426930694633816248> WatchCog initialization failed: database connection timeout")
+            logger.error("<:Denied:1426930694633816248> WatchCog initialization failed: database connection timeout")
             return
 
         # <:Accepted:1426930333789585509> Re-register persistent VoteButton views for active watches
@@ -707,10 +790,23 @@ class WatchCog(commands.Cog):
         # Now load initial data
         await self.load_initial_data()
 
-        # Start the scheduled votes checker
-        self.check_scheduled_votes.start()
+        # Report votes missed during downtime, then arm the scheduler for the rest
+        try:
+            scheduled_votes = await load_scheduled_votes()
+        except Exception as e:
+            logger.error(f'<:Denied:1426930694633816248> Error loading scheduled votes: {e}')
+            scheduled_votes = {}
+
+        # One cutoff for both, so a vote falling due while the owner is DM'd is scheduled, not dropped
+        cutoff = int(discord.utils.utcnow().timestamp())
+        await self.check_missed_votes(scheduled_votes, cutoff)
+
+        self.vote_scheduler.start({
+            vote_id: vote_data for vote_id, vote_data in scheduled_votes.items()
+            if vote_data['scheduled_time'] >= cutoff
+        })
 
-        print("<:Accepted:1426930333789585509> WatchCog initialized successfully")
+        logger.info("<:Accepted:1426930333789585509> WatchCog initialized successfully")
 
     def truncate_field_value(self, value: str, max_length: int = 1024) -> str:
         """Truncate a field value to fit Discord's limits"""
@@ -726,7 +822,7 @@ class WatchCog(commands.Cog):
             # For now, just register the WatchRoleButton
             pass
         except Exception as e:
-            print(f'Error registering vote buttons: {e}')
+            logger.error(f'Error registering vote buttons: {e}')
 
     async def load_initial_data(self):
         """Load active watches from database on startup"""
@@ -740,33 +836,27 @@ class WatchCog(commands.Cog):
                 if int(k) not in IGNORED_WATCH_MESSAGE_IDS
             }
 
-            print(f'<:Accepted:1426930333789585509> Loaded {len(active_watches)} active watches (ignored IDs: {IGNORED_WATCH_MESSAGE_IDS})')
+            logger.info(f'<:Accepted:1426930333789585509> Loaded {len(active_watches)} active watches (ignored IDs: {IGNORED_WATCH_MESSAGE_IDS})')
         except Exception as e:
-            print(f'<:Denied:1426930694633816248> Error loading watches: {e}')
+            logger.error(f'<:Denied:1426930694633816248> Error loading watches: {e}')
             active_watches = {}
 
-    # Also update cog_unload to handle the case where check_scheduled_votes might not be started
-    def cog_unload(self):
-        """Clean up when cog is unloaded"""
-        if self.check_scheduled_votes.is_running():
-            self.check_scheduled_votes.cancel()
-
     watch_group = app_commands.Group(name='watch', description='Watch management commands')
 
     async def reload_data(self):
         async with db.pool.acquire() as conn:
             self.active_watches = await conn.fetch("SELECT * FROM active_watches;")
-        print("<:Accepted:1426930333789585509> Reloaded active watch cache")
+        logger.info("<:Accepted:1426930333789585509> Reloaded active watch cache")
 
     async def calculate_watch_statistics(self) -> dict:
         """Calculate statistics from completed watches (with filtering)"""
         try:
             completed_watches = await load_completed_watches()
 
-            print(f"Stats Calculation: Found {len(completed_watches)} total records in database")
+            logger.info(f"Stats Calculation: Found {len(completed_watches)} total records in database")
 
             if not completed_watches:
-                print("<:Warn:1437771973970104471> Stats Calculation: No completed watches found")
+                logger.warning("<:Warn:1437771973970104471> Stats Calculation: No completed watches found")
                 return {
                     'total_watches': 0,
                     'longest_duration': 'N/A',
@@ -784,11 +874,11 @@ class WatchCog(commands.Cog):
                     watch_data.get('colour', '').upper() != 'LCS')
             }
 
-            print(
+            logger.info(
                 f"🔍 Filtered out {len(completed_watches) - len(filtered_watches)} watches from stats (ignored IDs + LCS)")
 
             if not filtered_watches:
-                print("<:Warn:1437771973970104471> All watches were filtered out")
+                logger.warning("<:Warn:1437771973970104471> All watches were filtered out")
                 return {
                     'total_watches': 0,
                     'longest_duration': 'N/A',
@@ -808,7 +898,7 @@ class WatchCog(commands.Cog):
                     if started_at > 0 and ended_at > 0 and ended_at > started_at:
                         successful_watches.append(watch)
 
-            print(f"<:Accepted:1426930333789585509> Stats Calculation: {len(successful_watches)} successful watches (after filtering)")
+            logger.info(f"<:Accepted:1426930333789585509> Stats Calculation: {len(successful_watches)} successful watches (after filtering)")
 
             if not successful_watches:
                 return {
@@ -850,7 +940,7 @@ class WatchCog(commands.Cog):
             most_common_colour = max(colour_counts.items(), key=lambda x: x[1])[0] if colour_counts else 'N/A'
             if len(most_common_colour) > 8:  # Reasonable limit for a colour name
                 most_common_colour = most_common_colour[:8] + "..."
-            print(f"Most common colour: {most_common_colour} (from {len(colour_counts)} unique colours)")
+            logger.info(f"Most common colour: {most_common_colour} (from {len(colour_counts)} unique colours)")
 
             # Most active station
             station_counts = {}
@@ -862,7 +952,7 @@ class WatchCog(commands.Cog):
             most_active_station = max(station_counts.items(), key=lambda x: x[1])[0] if station_counts else 'N/A'
             if len(most_active_station) > 12:  # Reasonable limit for a station name
                 most_active_station = most_active_station[:12] + "..."
-            print(f"Most active station: {most_active_station} (from {len(station_counts)} unique stations)")
+            logger.info(f"Most active station: {most_active_station} (from {len(station_counts)} unique stations)")
 
             # Average duration
             total_duration = sum(
@@ -880,7 +970,7 @@ class WatchCog(commands.Cog):
             else:
                 average_duration = 'N/A'
 
-            print(f"<:Accepted:1426930333789585509> Stats calculation complete!")
+            logger.info(f"<:Accepted:1426930333789585509> Stats calculation complete!")
 
             return {
                 'total_watches': total_watches,
@@ -892,9 +982,7 @@ class WatchCog(commands.Cog):
             }
 
         except Exception as e:
-            print(f'Error calculating statistics: {e}')
-            import traceback
-            traceback.print_exc()
+            logger.exception(f'Error calculating statistics: {e}')
             return {
                 'total_watches': 0,
                 'longest_duration': 'Error',
@@ -917,7 +1005,7 @@ class WatchCog(commands.Cog):
                         break
 
             if not stats_message:
-                print("No stats embed found to update")
+                logger.info("No stats embed found to update")
                 return
 
             # Calculate new statistics
@@ -970,10 +1058,10 @@ class WatchCog(commands.Cog):
 
             # Update the message (keep the same view)
             await stats_message.edit(embed=stats_embed)
-            print("<:Accepted:1426930333789585509> Stats embed updated successfully")
+            logger.info("<:Accepted:1426930333789585509> Stats embed updated successfully")
 
         except Exception as e:
-            print(f'Error updating stats embed: {e}')
+            logger.error(f'Error updating stats embed: {e}')
 
     @watch_group.command(name='start', description='Starts a FENZ watch')
     @app_commands.default_permissions(manage_nicknames=True)
@@ -1066,9 +1154,9 @@ class WatchCog(commands.Cog):
                         if msg_id in active_watches:
                             del active_watches[msg_id]
                     except Exception as e:
-                        print(f'Error deleting previous watch {msg_id}: {e}')
+                        logger.error(f'Error deleting previous watch {msg_id}: {e}')
             except Exception as e:
-                print(f'Error cleaning up previous watches: {e}')
+                logger.error(f'Error cleaning up previous watches: {e}')
 
             colour_map = {
                 'Yellow': discord.Colour.gold(),
@@ -1142,9 +1230,8 @@ class WatchCog(commands.Cog):
                     'comms_status': comms.lower()  # Add this
                 }
 
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Error saving watch data in watch_start")
                 # Still let the watch message stay posted, just warn the user
 
             success_embed = discord.Embed(
@@ -1156,7 +1243,7 @@ class WatchCog(commands.Cog):
             await self.update_watch_channel_name(watch_channel, colour, station, 'active')
 
         except Exception as e:
-            print(f'Error starting watch: {e}')
+            logger.error(f'Error starting watch: {e}')
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
             if not interaction.response.is_done():
@@ -1267,6 +1354,20 @@ class WatchCog(commands.Cog):
                     "comms_status": comms.lower()  # Add this
                 })
                 await db.remove_scheduled_vote(vote_id)
+            else:
+                self.vote_scheduler.schedule(vote_id, {
+                    "guild_id": interaction.guild.id,
+                    "channel_id": watch_channel_id,
+                    "watch_role_id": watch_role_id,
+                    "user_id": interaction.user.id,
+                    "colour": colour,
+                    "station": station,
+                    "votes": votes,
+                    "time_minutes": time,
+                    "scheduled_time": scheduled_time,
+                    "created_at": current_time,
+                    "comms_status": comms.lower()
+                })
 
             if time:
                 scheduled_dt = datetime.datetime.fromtimestamp(scheduled_time, tz=timezone.utc)
@@ -1286,7 +1387,7 @@ class WatchCog(commands.Cog):
             await self.update_watch_channel_name(watch_channel, colour, station, 'voting')
 
         except Exception as e:
-            print(f'Error scheduling vote: {e}')
+            logger.error(f'Error scheduling vote: {e}')
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
             await interaction.followup.send(embed=error_embed, ephemeral=True)
@@ -1435,7 +1536,7 @@ class WatchCog(commands.Cog):
 
             # ALWAYS update stats embed - the calculation function will filter out LCS watches
             await self.update_stats_embed(channel)
-            print("<:Accepted:1426930333789585509> Stats embed updated (LCS watches are filtered in calculation)")
+            logger.info("<:Accepted:1426930333789585509> Stats embed updated (LCS watches are filtered in calculation)")
 
             success_embed = discord.Embed(
                 description=f'<:Accepted:1426930333789585509> Watch ended successfully with {attendees} attendees!',
@@ -1445,7 +1546,7 @@ class WatchCog(commands.Cog):
             await interaction.delete_original_response()
 
         except Exception as e:
-            print(f'Error ending watch: {e}')
+            logger.error(f'Error ending watch: {e}')
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
             await interaction.followup.send(embed=error_embed, ephemeral=True)
@@ -1742,7 +1843,7 @@ class WatchCog(commands.Cog):
                 await interaction.followup.send(embed=pages[0], view=view, ephemeral=True)
 
         except Exception as e:
-            print(f'Error fetching watch logs: {e}')
+            logger.error(f'Error fetching watch logs: {e}')
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
 
@@ -1866,7 +1967,7 @@ class WatchCog(commands.Cog):
             await interaction.followup.send(embed=success_embed, ephemeral=True)
 
         except Exception as e:
-            print(f'Error deleting watch log: {e}')
+            logger.error(f'Error deleting watch log: {e}')
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
             await interaction.followup.send(embed=error_embed, ephemeral=True)
@@ -1950,7 +2051,7 @@ class WatchCog(commands.Cog):
                     deleted_count += 1
 
                 except Exception as e:
-                    print(f'Error deleting watch {message_id}: {e}')
+                    logger.error(f'Error deleting watch {message_id}: {e}')
                     failed_count += 1
 
             summary_embed = discord.Embed(
@@ -1962,42 +2063,19 @@ class WatchCog(commands.Cog):
             await interaction.followup.send(embed=summary_embed, ephemeral=True)
 
         except Exception as e:
-            print(f'Error in end all watches: {e}')
+            logger.error(f'Error in end all watches: {e}')
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
             await interaction.followup.send(embed=error_embed, ephemeral=True)
             raise
 
-    @tasks.loop(minutes=1)
-    async def check_scheduled_votes(self):
-        """Check every minute for votes that should be sent"""
+    async def check_missed_votes(self, scheduled_votes: dict = None, current_time: int = None):
+        """Check for votes that should have been sent while bot was offline (due before current_time)"""
         try:
-            scheduled_votes = await load_scheduled_votes()
-            current_time = int(discord.utils.utcnow().timestamp())
-
-            votes_to_send = []
-            for vote_id, vote_data in list(scheduled_votes.items()):
-                if vote_data['scheduled_time'] <= current_time:
-                    votes_to_send.append((vote_id, vote_data))
-
-            for vote_id, vote_data in votes_to_send:
-                await self.send_scheduled_vote(vote_data)
-                await db.remove_scheduled_vote(vote_id)
-
-        except Exception as e:
-            print(f'Error in check_scheduled_votes: {e}')
-
-    @check_scheduled_votes.before_loop
-    async def before_check_scheduled_votes(self):
-        """Wait until bot is ready, then check for missed votes"""
-        await self.bot.wait_until_ready()
-        await self.check_missed_votes()
-
-    async def check_missed_votes(self):
-        """Check for votes that should have been sent while bot was offline"""
-        try:
-            scheduled_votes = await load_scheduled_votes()
-            current_time = int(discord.utils.utcnow().timestamp())
+            if scheduled_votes is None:
+                scheduled_votes = await load_scheduled_votes()
+            if current_time is None:
+                current_time = int(discord.utils.utcnow().timestamp())
 
             missed_votes = []
             for vote_id, vote_data in scheduled_votes.items():
@@ -2010,7 +2088,7 @@ class WatchCog(commands.Cog):
             owner = await self.bot.fetch_user(OWNER_ID)
 
             for vote_id, vote_data in missed_votes:
-                scheduled_dt = datetime.datetime.datetime.fromtimestamp(vote_data['scheduled_time'], tz=datetime.timezone.utc)
+                scheduled_dt = datetime.datetime.fromtimestamp(vote_data['scheduled_time'], tz=datetime.timezone.utc)
                 missed_by_minutes = (current_time - vote_data['scheduled_time']) // 60
 
                 embed = discord.Embed(
@@ -2035,19 +2113,19 @@ class WatchCog(commands.Cog):
                 await owner.send(embed=embed, view=view)
 
         except Exception as e:
-            print(f'Error checking missed votes: {e}')
+            logger.error(f'Error checking missed votes: {e}')
 
     async def send_scheduled_vote(self, vote_data):
         """Send a scheduled vote to the channel"""
         try:
             guild = self.bot.get_guild(vote_data['guild_id'])
             if not guild:
-                print(f"Guild {vote_data['guild_id']} not found")
+                logger.info(f"Guild {vote_data['guild_id']} not found")
                 return
 
             watch_channel = guild.get_channel(vote_data['channel_id'])
             if not watch_channel:
-                print(f"Channel {vote_data['channel_id']} not found")
+                logger.info(f"Channel {vote_data['channel_id']} not found")
                 return
 
             deleted, skipped, failed = await safe_delete_messages(
@@ -2116,7 +2194,7 @@ class WatchCog(commands.Cog):
                 self.vote_timeout_tasks[f"auto_cancel_{msg.id}"] = cancel_task
 
         except Exception as e:
-            print(f'Error sending scheduled vote: {e}')
+            logger.error(f'Error sending scheduled vote: {e}')
 
     async def auto_cancel_vote(self, message_id: int, view: VoteButton, vote_data: dict, channel, guild):
         """Auto-cancel vote when scheduled time arrives if insufficient votes"""
@@ -2181,7 +2259,7 @@ class WatchCog(commands.Cog):
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            print(f'Error in auto-cancel handler: {e}')
+            logger.error(f'Error in auto-cancel handler: {e}')
 
     async def handle_vote_timeout(self, message_id: int, view: VoteButton, vote_data: dict, channel, guild):
         """Handle vote timeout when insufficient votes"""
@@ -2240,11 +2318,11 @@ class WatchCog(commands.Cog):
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            print(f'Error in vote timeout handler: {e}')
+            logger.error(f'Error in vote timeout handler: {e}')
 
     def cog_unload(self):
         """Clean up when cog is unloaded"""
-        self.check_scheduled_votes.cancel()
+        self.vote_scheduler.stop()
 
     async def start_watch_after_vote(self, channel, message_id: int, user_id: int, user_name: str,
                                      colour: str, station: str, watch_role_id: int, voters: list,
@@ -2262,7 +2340,7 @@ class WatchCog(commands.Cog):
             except discord.NotFound:
                 pass
             except Exception as e:
-                print(f'Error deleting vote message: {e}')
+                logger.error(f'Error deleting vote message: {e}')
 
             # Create the actual watch start embed
             colour_map = {
@@ -2368,14 +2446,12 @@ class WatchCog(commands.Cog):
             if f"start_{message_id}" in self.vote_timeout_tasks:
                 del self.vote_timeout_tasks[f"start_{message_id}"]
 
-            print(f"<:Accepted:1426930333789585509> Successfully started watch {msg.id} after vote delay")
+            logger.info(f"<:Accepted:1426930333789585509> Successfully started watch {msg.id} after vote delay")
 
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            print(f'Error starting watch after vote: {e}')
-            import traceback
-            traceback.print_exc()
+            logger.exception(f'Error starting watch after vote: {e}')
 
     @watch_group.command(name='switch',
                          description='Switch an active watch to a different colour/station/leader/comms')
@@ -2585,7 +2661,7 @@ class WatchCog(commands.Cog):
                     active_watches[watch]['comms_status'] = final_comms
                     active_watches[watch]['switch_history'] = switch_history
 
-                    print(f"<:Accepted:1426930333789585509> Successfully updated watch {watch} (minor switch)")
+                    logger.info(f"<:Accepted:1426930333789585509> Successfully updated watch {watch} (minor switch)")
 
                 except discord.NotFound:
                     error_embed = discord.Embed(
@@ -2603,7 +2679,7 @@ class WatchCog(commands.Cog):
                 except discord.NotFound:
                     pass
                 except Exception as e:
-                    print(f'Error deleting original watch message: {e}')
+                    logger.error(f'Error deleting original watch message: {e}')
 
                 related_messages = watch_data.get('related_messages', [])
                 msg_ids_to_delete = [mid for mid in related_messages if mid != int(watch)]
@@ -2694,12 +2770,10 @@ class WatchCog(commands.Cog):
                         'comms_status': final_comms
                     }
 
-                    print(f"<:Accepted:1426930333789585509> Successfully saved switched watch {msg.id}")
+                    logger.info(f"<:Accepted:1426930333789585509> Successfully saved switched watch {msg.id}")
 
                 except Exception as e:
-                    import traceback
-                    traceback.print_exc()
-                    print(f"<:Denied:1426930694633816248> CRITICAL: Failed to save switched watch {msg.id}: {e}")
+                    logger.exception(f"<:Denied:1426930694633816248> CRITICAL: Failed to save switched watch {msg.id}: {e}")
 
                     try:
                         await msg.delete()
@@ -2721,7 +2795,7 @@ class WatchCog(commands.Cog):
             await interaction.followup.send(embed=success_embed, ephemeral=True)
 
         except Exception as e:
-            print(f'Error switching watch: {e}')
+            logger.error(f'Error switching watch: {e}')
             error_embed = discord.Embed(
                 description=f'<:Denied:1426930694633816248> Error: {e}',
                 colour=discord.Colour(0xf24d4d)
@@ -2826,7 +2900,7 @@ class WatchCog(commands.Cog):
                     except (discord.NotFound, discord.Forbidden):
                         pass
                     except Exception as e:
-                        print(f'Error deleting boost message {msg_id}: {e}')
+                        logger.error(f'Error deleting boost message {msg_id}: {e}')
 
             guild_config = get_guild_config(interaction.guild.id)
             watch_role_id = guild_config.get('watch_role_id')
@@ -2891,7 +2965,7 @@ class WatchCog(commands.Cog):
             await interaction.followup.send(embed=success_embed, ephemeral=True)
 
         except Exception as e:
-            print(f'Error boosting watch: {e}')
+            logger.error(f'Error boosting watch: {e}')
             error_embed = discord.Embed(description=f'<:Denied:1426930694633816248> Error: {e}',
                                         colour=discord.Colour(0xf24d4d))
             await interaction.followup.send(embed=error_embed, ephemeral=True)
@@ -2929,12 +3003,12 @@ class WatchCog(commands.Cog):
                 new_name = "「⚫」watches"
 
             await channel.edit(name=new_name)
-            print(f"<:Accepted:1426930333789585509> Channel renamed to {new_name}")
+            logger.info(f"<:Accepted:1426930333789585509> Channel renamed to {new_name}")
 
         except discord.Forbidden:
-            print("<:Warn:1437771973970104471> Missing permissions to rename channel.")
+            logger.warning("<:Warn:1437771973970104471> Missing permissions to rename channel.")
         except Exception as e:
-            print(f"<:Warn:1437771973970104471> Error renaming channel: {e}")
+            logger.warning(f"<:Warn:1437771973970104471> Error renaming channel: {e}")
 
     @watch_group.command(name='embed', description='Create/update the watch statistics embed')
     @app_commands.default_permissions(manage_nicknames=True)
@@ -3039,7 +3113,7 @@ class WatchCog(commands.Cog):
 
 
         except Exception as e:
-            print(f'Error creating watch embed: {e}')
+            logger.error(f'Error creating watch embed: {e}')
             error_embed = discord.Embed(
                 description=f'<:Denied:1426930694633816248> Error: {e}',
                 colour=discord.Colour(0xf24d4d)
@@ -11,8 +11,9 @@ import time
 import psutil
 import sys
 import gc
-import logging  # Add this line
 from database import db
+from loop_monitor import loop_monitor
+from log_reader import LOG_FILE, get_log_index
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
@@ -65,6 +66,9 @@ class JishakuCog(commands.Cog):
         self.bot = bot
         self._last_result = None
         self.start_time = time.time()
+        # Prime the CPU counter so /py stats can read it without sleeping on the loop
+        self._process = psutil.Process()
+        self._process.cpu_percent(interval=None)
 
     def format_uptime(self) -> str:
         """Format bot uptime"""
@@ -263,12 +267,12 @@ class JishakuCog(commands.Cog):
                                                 ephemeral=True)
 
         # System stats
-        process = psutil.Process()
+        process = self._process
         memory_info = process.memory_info()
         memory_mb = memory_info.rss / 1024 / 1024
 
-        # CPU usage (non-blocking)
-        cpu_percent = process.cpu_percent(interval=0.1)
+        # CPU usage since the last call (non-blocking)
+        cpu_percent = process.cpu_percent(interval=None)
 
         # Discord stats
         total_members = sum(guild.member_count for guild in self.bot.guilds)
@@ -339,7 +343,24 @@ class JishakuCog(commands.Cog):
             inline=True
         )
 
-        embed.set_footer(text=f"Process ID: {process.pid}")
+        # Event loop health
+        loop_stats = loop_monitor.summary()
+        last_stall = loop_stats['last_stall']
+        if last_stall:
+            stall_text = (f"{last_stall['duration'] * 1000:.0f}ms in "
+                          f"`{(last_stall['task'] or 'unknown task')[:60]}`")
+        else:
+            stall_text = "None"
+        embed.add_field(
+            name="⏱️ Event Loop",
+            value=f"**Lag:** {loop_stats['last'] * 1000:.1f}ms (p99 {loop_stats['p99'] * 1000:.1f}ms)\n"
+                  f"**Max (5m):** {loop_stats['max'] * 1000:.1f}ms\n"
+                  f"**Stalls >{loop_stats['threshold'] * 1000:.0f}ms:** {loop_stats['stalls']}\n"
+                  f"**Last Stall:** {stall_text}",
+            inline=False
+        )
+
+        embed.set_footer(text=f"Process ID: {process.pid} | Stack samples: /health/loop")
         await interaction.delete_original_response()
         await interaction.followup.send(embed=embed, ephemeral=True)
 
@@ -611,7 +632,18 @@ class JishakuCog(commands.Cog):
         return filtered[:25]
 
     @py_group.command(name="logs", description="View bot logs with pagination")
-    async def py_logs(self, interaction: discord.Interaction):
+    @app_commands.describe(
+        level="Minimum log level to show",
+        logger="Only show this logger and its children (e.g. cogs.shift)",
+        search="Only show lines containing this text"
+    )
+    @app_commands.choices(level=[
+        app_commands.Choice(name="Info", value="INFO"),
+        app_commands.Choice(name="Warning", value="WARNING"),
+        app_commands.Choice(name="Error", value="ERROR"),
+    ])
+    async def py_logs(self, interaction: discord.Interaction, level: app_commands.Choice[str] = None,
+                      logger: str = None, search: str = None):
         """Display bot logs with navigation controls"""
         if interaction.user.id != OWNER_ID:
             await interaction.response.send_message(
@@ -626,31 +658,20 @@ class JishakuCog(commands.Cog):
         )
 
         try:
-            # Get logs from the logging handler
-            # Assuming you have a log file or memory handler
-            logs = []
-
-            # Option 1: Read from log file
-            try:
-                with open('bot.log', 'r', encoding='utf-8') as f:
-                    logs = f.readlines()
-                    # Get last 100 logs
-                    logs = logs[-100:]
-            except FileNotFoundError:
-                # Option 2: Get from root logger handlers
-                for handler in logging.getLogger().handlers:
-                    if isinstance(handler, logging.FileHandler):
-                        try:
-                            with open(handler.baseFilename, 'r', encoding='utf-8') as f:
-                                logs = f.readlines()
-                                logs = logs[-100:]
-                            break
-                        except Exception:
-                            pass
+            # Newest 100 matching lines, read by offset from the shared log index
+            result = await get_log_index(LOG_FILE).query_async(
+                page=1, size=100,
+                level=level.value if level else None,
+                logger=logger,
+                search=search
+            )
+            logs = result['lines']
 
             if not logs:
-                # No logs found, create sample message
-                logs = ["No logs available. Configure logging to view logs here."]
+                if level or logger or search:
+                    logs = ["No log lines match these filters."]
+                else:
+                    logs = ["No logs available. Configure logging to view logs here."]
 
             # Clean up logs (remove trailing newlines)
             logs = [log.rstrip() for log in logs if log.strip()]
@@ -663,7 +684,7 @@ class JishakuCog(commands.Cog):
                 color=discord.Color.blue(),
                 timestamp=datetime.utcnow()
             )
-            embed.set_footer(text=f"Page 1/{view.total_pages} • {len(logs)} total log entries")
+            embed.set_footer(text=f"Page 1/{view.total_pages} • {len(logs)} newest log entries")
 
             await interaction.delete_original_response()
             await interaction.followup.send(embed=embed, view=view, ephemeral=True)
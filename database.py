@@ -6,6 +6,77 @@ from typing import Optional, Dict, List, Any
 import json
 import asyncio
 from datetime import datetime, timezone
+from metrics import metrics
+
+DB_QUERY_SECONDS = metrics.histogram('db_query_seconds', 'Database query latency', ['status'])
+DB_POOL_CONNECTIONS = metrics.gauge('db_pool_connections', 'Database pool connections by state', ['state'])
+
+
+# Extensions the indexes below depend on (pg_trgm is bundled with PostgreSQL contrib)
+SCHEMA_EXTENSIONS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+]
+
+# Tables the bot creates itself (created once per process, before indexes)
+SCHEMA_TABLES = [
+    '''CREATE TABLE IF NOT EXISTS shift_breaks
+       (
+           id         SERIAL PRIMARY KEY,
+           shift_id   INTEGER   NOT NULL REFERENCES shifts (id) ON DELETE CASCADE,
+           started_at TIMESTAMP NOT NULL,
+           ended_at   TIMESTAMP
+       )''',
+    '''CREATE TABLE IF NOT EXISTS command_sync_state
+       (
+           guild_id     BIGINT PRIMARY KEY,
+           payload_hash TEXT      NOT NULL,
+           synced_at    TIMESTAMP NOT NULL
+       )''',
+]
+
+# Indexes the bot relies on for hot-path queries (created once per process)
+SCHEMA_INDEXES = [
+    '''CREATE INDEX IF NOT EXISTS idx_completed_watches_host_started
+       ON completed_watches (user_id, started_at)''',
+    '''CREATE INDEX IF NOT EXISTS idx_shift_breaks_shift
+       ON shift_breaks (shift_id, started_at)''',
+    '''CREATE UNIQUE INDEX IF NOT EXISTS idx_shift_breaks_one_open
+       ON shift_breaks (shift_id) WHERE ended_at IS NULL''',
+    '''CREATE INDEX IF NOT EXISTS idx_callsigns_callsign_prefix
+       ON callsigns (callsign, fenz_prefix)''',
+    '''CREATE INDEX IF NOT EXISTS idx_callsigns_discord_user
+       ON callsigns (discord_user_id)''',
+    '''CREATE INDEX IF NOT EXISTS idx_callsigns_roblox_user
+       ON callsigns (roblox_user_id)''',
+    # Trigram indexes serve substring (LIKE '%q%') and similarity searches
+    '''CREATE INDEX IF NOT EXISTS idx_callsigns_roblox_username_trgm
+       ON callsigns USING gin (LOWER(roblox_username) gin_trgm_ops)''',
+    '''CREATE INDEX IF NOT EXISTS idx_callsigns_discord_username_trgm
+       ON callsigns USING gin (LOWER(discord_username) gin_trgm_ops)''',
+    '''CREATE INDEX IF NOT EXISTS idx_callsigns_full_callsign_trgm
+       ON callsigns USING gin (LOWER(COALESCE(fenz_prefix, '') || '-' || callsign) gin_trgm_ops)''',
+]
+
+# One-off data migrations, safe to re-run
+SCHEMA_MIGRATIONS = [
+    # Copy legacy break_sessions JSON into shift_breaks rows
+    '''INSERT INTO shift_breaks (shift_id, started_at, ended_at)
+       SELECT s.id,
+              (session ->> 'start')::timestamp,
+              COALESCE(NULLIF(session ->> 'end', '')::timestamp, s.end_time)
+       FROM shifts s
+                CROSS JOIN LATERAL jsonb_array_elements(
+           CASE
+               WHEN jsonb_typeof(NULLIF(s.break_sessions::text, '')::jsonb) = 'array'
+                   THEN NULLIF(s.break_sessions::text, '')::jsonb
+               ELSE '[]'::jsonb
+               END
+                                   ) AS session
+       WHERE s.break_sessions IS NOT NULL
+         AND session ->> 'start' IS NOT NULL
+         AND NOT EXISTS (SELECT 1 FROM shift_breaks b WHERE b.shift_id = s.id)
+       ON CONFLICT DO NOTHING''',
+]
 
 
 class Database:
@@ -15,6 +86,9 @@ class Database:
         self._connection_lock = asyncio.Lock()
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = 5
+        self._schema_ready = False
+        self._trigram_search = True  # Cleared if pg_trgm turns out to be unavailable
+        metrics.register_collector('db_pool', self._collect_pool_metrics)
 
         if not self.database_url:
             print('<:Warn:1437771973970104471>  DATABASE_URL not set! Bot will not be able to save data.')
@@ -49,6 +123,7 @@ class Database:
 
                     print('<:Accepted:1426930333789585509> Connected to Supabase database')
                     self._reconnect_attempts = 0
+                    await self.ensure_schema()
                     return True
 
                 except asyncpg.exceptions.PostgresError as e:
@@ -72,6 +147,24 @@ class Database:
 
             return False
 
+    async def ensure_schema(self):
+        """Create bot-owned tables, indexes and run data migrations if needed"""
+        if self._schema_ready or not self.pool:
+            return
+
+        async with self.pool.acquire() as conn:
+            for label, statements in (('extension', SCHEMA_EXTENSIONS),
+                                      ('table', SCHEMA_TABLES),
+                                      ('index', SCHEMA_INDEXES),
+                                      ('migration', SCHEMA_MIGRATIONS)):
+                for statement in statements:
+                    try:
+                        await conn.execute(statement)
+                    except Exception as e:
+                        print(f'<:Warn:1437771973970104471> Could not apply schema {label}: {e}')
+
+        self._schema_ready = True
+
     async def _setup_connection(self, connection):
         """Setup function called for each new connection"""
         # Set connection parameters
@@ -79,8 +172,26 @@ class Database:
 
     async def _init_connection(self, connection):
         """Init function called for each new connection"""
-        # You can add custom type codecs here if needed
-        pass
+        # Time every query on this connection (asyncpg >= 0.29)
+        if hasattr(connection, 'add_query_logger'):
+            connection.add_query_logger(self._record_query)
+
+    @staticmethod
+    def _record_query(record):
+        DB_QUERY_SECONDS.observe(record.elapsed, status='error' if record.exception else 'ok')
+
+    def _collect_pool_metrics(self):
+        if not self.pool:
+            for state in ('open', 'idle', 'in_use', 'max'):
+                DB_POOL_CONNECTIONS.set(0, state=state)
+            return
+
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        DB_POOL_CONNECTIONS.set(size, state='open')
+        DB_POOL_CONNECTIONS.set(idle, state='idle')
+        DB_POOL_CONNECTIONS.set(size - idle, state='in_use')
+        DB_POOL_CONNECTIONS.set(self.pool.get_max_size(), state='max')
 
     async def ensure_connected(self, max_retries: int = 3) -> bool:
         """Ensure database connection is alive, reconnect if needed"""
@@ -604,6 +715,237 @@ class Database:
                 }
             return watches
 
+    async def get_watch_hosting_counts(self, user_ids: List[int], since: datetime) -> Dict[int, int]:
+        """Count non-failed watches hosted per user since a cutoff (single grouped query)"""
+        if not user_ids:
+            return {}
+
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''SELECT user_id, COUNT(*) AS watch_count
+                   FROM completed_watches
+                   WHERE user_id = ANY ($1)
+                     AND started_at >= $2
+                     AND COALESCE(status, 'completed') <> 'failed'
+                   GROUP BY user_id''',
+                list(user_ids), since
+            )
+            return {row['user_id']: row['watch_count'] for row in rows}
+
+    # Shift break methods
+
+    async def start_break(self, shift_id: int, at: datetime) -> Optional[Dict]:
+        """Put an active shift on break; returns the updated shift or None if not allowed"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''WITH s AS (
+                       UPDATE shifts
+                           SET pause_start = $2::timestamp
+                           WHERE id = $1
+                               AND end_time IS NULL
+                               AND pause_start IS NULL
+                           RETURNING *),
+                        b AS (
+                            INSERT INTO shift_breaks (shift_id, started_at)
+                                SELECT id, $2::timestamp FROM s)
+                   SELECT * FROM s''',
+                shift_id, at
+            )
+            return dict(row) if row else None
+
+    async def end_break(self, shift_id: int, at: datetime) -> Optional[Dict]:
+        """Resume a shift from break; returns the updated shift plus break_seconds, or None"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''WITH s AS (
+                       UPDATE shifts
+                           SET pause_duration = COALESCE(pause_duration, 0)
+                                   + EXTRACT(EPOCH FROM ($2::timestamp - pause_start)),
+                               pause_start = NULL
+                           WHERE id = $1
+                               AND end_time IS NULL
+                               AND pause_start IS NOT NULL
+                           RETURNING *),
+                        b AS (
+                            UPDATE shift_breaks
+                                SET ended_at = $2::timestamp
+                                FROM s
+                                WHERE shift_breaks.shift_id = s.id
+                                    AND shift_breaks.ended_at IS NULL
+                                RETURNING EXTRACT(EPOCH FROM (shift_breaks.ended_at - shift_breaks.started_at))::float8
+                                    AS break_seconds)
+                   SELECT s.*, b.break_seconds
+                   FROM s
+                            LEFT JOIN b ON TRUE''',
+                shift_id, at
+            )
+            return dict(row) if row else None
+
+    async def end_shift(self, shift_id: int, at: datetime, min_break_seconds: float = None) -> Optional[Dict]:
+        """End a shift, closing any open break in the same statement; returns the ended shift or None
+
+        With min_break_seconds, only ends the shift if it has been on break at least that long.
+        """
+        break_guard = ''
+        params = [shift_id, at]
+        if min_break_seconds is not None:
+            break_guard = '''AND pause_start IS NOT NULL
+                               AND pause_start <= $2::timestamp - make_interval(secs => $3)'''
+            params.append(float(min_break_seconds))
+
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                f'''WITH s AS (
+                       UPDATE shifts
+                           SET end_time = $2::timestamp,
+                               pause_duration = COALESCE(pause_duration, 0) + CASE
+                                   WHEN pause_start IS NOT NULL
+                                       THEN EXTRACT(EPOCH FROM ($2::timestamp - pause_start))
+                                   ELSE 0 END,
+                               pause_start = NULL
+                           WHERE id = $1
+                               AND end_time IS NULL
+                               {break_guard}
+                           RETURNING *),
+                        b AS (
+                            UPDATE shift_breaks
+                                SET ended_at = $2::timestamp
+                                FROM s
+                                WHERE shift_breaks.shift_id = s.id
+                                    AND shift_breaks.ended_at IS NULL)
+                   SELECT * FROM s''',
+                *params
+            )
+            return dict(row) if row else None
+
+    async def close_open_breaks(self, shift_ids: List[int], at: datetime):
+        """Close any open break rows for shifts that were ended in bulk"""
+        if not shift_ids:
+            return
+
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                '''UPDATE shift_breaks
+                   SET ended_at = $2::timestamp
+                   WHERE shift_id = ANY ($1)
+                     AND ended_at IS NULL''',
+                list(shift_ids), at
+            )
+
+    async def get_break_sessions(self, shift_id: int) -> List[Dict]:
+        """Get a shift's break sessions in order"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''SELECT started_at,
+                          ended_at,
+                          EXTRACT(EPOCH FROM (ended_at - started_at))::float8 AS duration
+                   FROM shift_breaks
+                   WHERE shift_id = $1
+                   ORDER BY started_at''',
+                shift_id
+            )
+            return [dict(row) for row in rows]
+
+    async def get_break_stats(self, wave_numbers: List[int] = None, type: str = None) -> List[Dict]:
+        """Break count, mean and max length (seconds) per wave"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''SELECT s.wave_number,
+                          COUNT(*)                                                    AS break_count,
+                          AVG(EXTRACT(EPOCH FROM (b.ended_at - b.started_at)))::float8 AS mean_seconds,
+                          MAX(EXTRACT(EPOCH FROM (b.ended_at - b.started_at)))::float8 AS max_seconds
+                   FROM shift_breaks b
+                            JOIN shifts s ON s.id = b.shift_id
+                   WHERE b.ended_at IS NOT NULL
+                     AND s.wave_number IS NOT NULL
+                     AND ($1::int[] IS NULL OR s.wave_number = ANY ($1))
+                     AND ($2::text IS NULL OR s.type = $2)
+                   GROUP BY s.wave_number
+                   ORDER BY s.wave_number''',
+                wave_numbers, type
+            )
+            return [dict(row) for row in rows]
+
+    async def get_command_hashes(self) -> Dict[int, str]:
+        """Hash of the command payload last synced to each guild"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch('SELECT guild_id, payload_hash FROM command_sync_state')
+            return {row['guild_id']: row['payload_hash'] for row in rows}
+
+    async def set_command_hash(self, guild_id: int, payload_hash: str):
+        """Record a successful command sync for a guild"""
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                '''INSERT INTO command_sync_state (guild_id, payload_hash, synced_at)
+                   VALUES ($1, $2, $3)
+                   ON CONFLICT (guild_id) DO UPDATE
+                       SET payload_hash = EXCLUDED.payload_hash,
+                           synced_at    = EXCLUDED.synced_at''',
+                guild_id, payload_hash, datetime.utcnow()
+            )
+
+    async def search_callsigns(self, query: str, limit: int = 25, timeout_ms: int = 1500) -> List[Dict]:
+        """
+        Ranked callsign search across callsign, Roblox and Discord usernames.
+
+        Exact callsign matches rank first, then prefix matches, then substring
+        and trigram-similar matches by similarity. Matching is served by the
+        trigram indexes, and statement_timeout bounds the query. Without
+        pg_trgm the search falls back to plain substring matching.
+        """
+        needle = query.strip().lower()
+        if not needle:
+            return []
+        pattern = needle.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+        if self._trigram_search:
+            try:
+                return await self._search_callsigns(needle, pattern, limit, timeout_ms, trigram=True)
+            except asyncpg.exceptions.UndefinedFunctionError as e:
+                print(f"<:Warn:1437771973970104471> pg_trgm unavailable, callsign search falls back to LIKE: {e}")
+                self._trigram_search = False
+        return await self._search_callsigns(needle, pattern, limit, timeout_ms, trigram=False)
+
+    async def _search_callsigns(self, needle: str, pattern: str, limit: int, timeout_ms: int,
+                                trigram: bool) -> List[Dict]:
+        if trigram:
+            score = '''GREATEST(similarity(LOWER(c.roblox_username), $1),
+                                             similarity(LOWER(c.discord_username), $1),
+                                             similarity(LOWER(COALESCE(c.fenz_prefix, '') || '-' || c.callsign), $1))'''
+            fuzzy = '''
+                                OR LOWER(c.roblox_username) % $1
+                                OR LOWER(c.discord_username) % $1'''
+        else:
+            score, fuzzy = '0', ''
+
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(f'SET LOCAL statement_timeout = {int(timeout_ms)}')
+                rows = await conn.fetch(
+                    f'''SELECT *
+                       FROM (SELECT c.*,
+                                    LOWER(COALESCE(c.fenz_prefix, '') || '-' || c.callsign) AS full_callsign,
+                                    {score}
+                                        AS score
+                             FROM callsigns c
+                             WHERE LOWER(c.roblox_username) LIKE '%' || $2 || '%'
+                                OR LOWER(c.discord_username) LIKE '%' || $2 || '%'
+                                OR LOWER(COALESCE(c.fenz_prefix, '') || '-' || c.callsign) LIKE '%' || $2 || '%'{fuzzy}) ranked
+                       ORDER BY (LOWER(callsign) = $1 OR full_callsign = $1) DESC,
+                                (LOWER(roblox_username) LIKE $2 || '%'
+                                    OR LOWER(discord_username) LIKE $2 || '%'
+                                    OR LOWER(callsign) LIKE $2 || '%'
+                                    OR full_callsign LIKE $2 || '%') DESC,
+                                score DESC,
+                                roblox_username
+                       LIMIT $3''',
+                    needle, pattern, limit
+                )
+            return [dict(row) for row in rows]
+
     async def delete_completed_watch(self, message_id: int):
         """Delete a completed watch"""
         async with self.pool.acquire() as conn:
@@ -914,6 +1256,20 @@ class Database:
             )
             return dict(record) if record else {"calls": 0, "reset_time": None}
 
+    async def set_api_usage(self, calls: int, reset_time: Optional[datetime]):
+        """Checkpoint today's API call count (overwrites rather than increments)"""
+        async with self.pool.acquire() as conn:
+            today = datetime.utcnow().date()
+            result = await conn.execute(
+                "UPDATE bloxlink_api_usage SET calls=$2, reset_time=$3 WHERE api_date=$1",
+                today, calls, reset_time
+            )
+            if result == 'UPDATE 0':
+                await conn.execute(
+                    "INSERT INTO bloxlink_api_usage(api_date, calls, reset_time) VALUES($1, $2, $3)",
+                    today, calls, reset_time
+                )
+
 
 # === GLOBAL DATABASE INSTANCE ===
 db = Database()
@@ -0,0 +1,138 @@
+"""
+Local stand-in for the Bloxlink and Roblox user APIs.
+
+Serves the endpoints BloxlinkAPI calls, with deterministic Roblox accounts
+per Discord ID, configurable latency and injected 429s, and counts every
+request. Point the callsign cog at it with BLOXLINK_API_BASE and
+ROBLOX_USERS_API (set before cogs.callsign is imported):
+
+    server = FakeBloxlinkServer(latency=0.05, rate_limit_ratio=0.02)
+    await server.start()
+    os.environ['BLOXLINK_API_BASE'] = server.bloxlink_base
+    os.environ['ROBLOX_USERS_API'] = server.roblox_base
+"""
+import asyncio
+import random
+import time
+import zlib
+from collections import Counter
+from typing import Optional
+
+from aiohttp import web
+
+
+def fake_roblox_id(discord_user_id: int) -> int:
+    """Stable Roblox ID for a Discord ID"""
+    return 10_000_000 + discord_user_id % 4_000_000_000
+
+
+def fake_roblox_username(roblox_id: int) -> str:
+    return f"Roblox{roblox_id}"
+
+
+class FakeBloxlinkServer:
+    """
+    aiohttp server for /v4/public/[guilds/{guild}/]discord-to-roblox/{id},
+    GET /v1/users/{id} and POST /v1/users.
+
+    unlinked_ratio of Discord IDs (chosen by hash, so stable across runs) have
+    no Roblox account; rate_limit_ratio of Bloxlink requests get a 429 with
+    Retry-After. Bloxlink responses carry X-RateLimit-* headers for
+    daily_quota, like the real API.
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit_ratio: float = 0.0, unlinked_ratio: float = 0.0,
+                 daily_quota: int = 1_000_000, retry_after: float = 1.0, seed: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.unlinked_ratio = unlinked_ratio
+        self.daily_quota = daily_quota
+        self.retry_after = retry_after
+        self.host = host
+        self.port = port
+        self.requests = Counter()  # bloxlink, bloxlink_429, roblox_user, roblox_users_batch
+        self._random = random.Random(seed)
+        self._used = 0
+        self._reset_at = time.time() + 86400
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get('/v4/public/guilds/{guild_id}/discord-to-roblox/{discord_id}', self._bloxlink)
+        self.app.router.add_get('/v4/public/discord-to-roblox/{discord_id}', self._bloxlink)
+        self.app.router.add_get('/v1/users/{roblox_id}', self._roblox_user)
+        self.app.router.add_post('/v1/users', self._roblox_users)
+
+    # === LIFECYCLE ===
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def bloxlink_base(self) -> str:
+        return f"{self.url}/v4/public"
+
+    @property
+    def roblox_base(self) -> str:
+        return f"{self.url}/v1"
+
+    def reset_counters(self):
+        self.requests.clear()
+
+    def is_linked(self, discord_user_id: int) -> bool:
+        return (zlib.crc32(str(discord_user_id).encode()) % 10_000) / 10_000 >= self.unlinked_ratio
+
+    # === HANDLERS ===
+    async def _delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def _bloxlink(self, request: web.Request) -> web.Response:
+        await self._delay()
+        self.requests['bloxlink'] += 1
+
+        if self._random.random() < self.rate_limit_ratio:
+            self.requests['bloxlink_429'] += 1
+            return web.json_response({'error': 'rate limited'}, status=429,
+                                     headers={'Retry-After': str(self.retry_after)})
+
+        self._used += 1
+        headers = {
+            'X-RateLimit-Limit': str(self.daily_quota),
+            'X-RateLimit-Remaining': str(max(0, self.daily_quota - self._used)),
+            'X-RateLimit-Reset': str(int(self._reset_at)),
+        }
+        discord_user_id = int(request.match_info['discord_id'])
+        if not self.is_linked(discord_user_id):
+            return web.json_response({'error': 'User not found'}, status=404, headers=headers)
+        return web.json_response({'robloxID': str(fake_roblox_id(discord_user_id)), 'resolved': {}},
+                                 headers=headers)
+
+    async def _roblox_user(self, request: web.Request) -> web.Response:
+        await self._delay()
+        self.requests['roblox_user'] += 1
+        roblox_id = int(request.match_info['roblox_id'])
+        return web.json_response({'id': roblox_id, 'name': fake_roblox_username(roblox_id),
+                                  'displayName': fake_roblox_username(roblox_id)})
+
+    async def _roblox_users(self, request: web.Request) -> web.Response:
+        await self._delay()
+        self.requests['roblox_users_batch'] += 1
+        body = await request.json()
+        return web.json_response({'data': [
+            {'id': int(roblox_id), 'name': fake_roblox_username(int(roblox_id)),
+             'displayName': fake_roblox_username(int(roblox_id))}
+            for roblox_id in body.get('userIds', [])
+        ]})
@@ -0,0 +1,316 @@
+"""
+In-process stand-in for the part of gspread the callsign sync uses.
+
+GoogleSheetsManager only touches the spreadsheet through a handful of
+gspread calls; FakeSpreadsheet implements those against in-memory rows and
+counts every call, so sync runs can be measured and replayed offline:
+
+    fake = FakeSpreadsheet.callsign_template()
+    sheets_manager.client, sheets_manager.spreadsheet = fake, fake
+    ...
+    print(fake.calls)
+
+Values are stored the way the Sheets API returns them (strings). Data
+validation rules live on the row, so they move with deleteDimension and
+sortRange like they do in Sheets.
+"""
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+NON_COMMAND_HEADER = ["Callsign", "Prefix", "Number", "Roblox", "", "Strikes", "Discord ID", "Rank",
+                      "Qualifications", "Sort"]
+COMMAND_HEADER = ["Callsign", "Roblox", "Qualifications", "Strikes", "Discord ID", "Rank Priority", "Sort"]
+
+_A1_CELL = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def _column_number(letters: str) -> int:
+    number = 0
+    for char in letters:
+        number = number * 26 + ord(char) - ord('A') + 1
+    return number
+
+
+def _parse_a1(a1: str):
+    """'A2' / 'A2:J2' / 'Sheet'!A2:J2 -> (sheet title or None, row, col, end_row, end_col)"""
+    title = None
+    if '!' in a1:
+        title, a1 = a1.rsplit('!', 1)
+        title = title.strip("'")
+    start, _, end = a1.partition(':')
+    start_col, start_row = _A1_CELL.match(start).groups()
+    end_col, end_row = _A1_CELL.match(end or start).groups()
+    return title, int(start_row), _column_number(start_col), int(end_row), _column_number(end_col)
+
+
+def _as_cell(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _sort_key(value: str):
+    """Sheets order: numbers, then text, then blanks"""
+    if value == '':
+        return (2, 0, '')
+    try:
+        return (0, float(value), '')
+    except ValueError:
+        return (1, 0, value.lower())
+
+
+class FakeCell:
+    def __init__(self, row: int, col: int, value: str):
+        self.row = row
+        self.col = col
+        self.value = value
+
+
+class FakeRow:
+    __slots__ = ('values', 'validations')
+
+    def __init__(self, values=None, validations=None):
+        self.values: List[str] = [_as_cell(v) for v in (values or [])]
+        self.validations: Dict[int, dict] = dict(validations or {})  # 1-based column -> rule
+
+    def get(self, col: int) -> str:
+        return self.values[col - 1] if col <= len(self.values) else ''
+
+    def set(self, col: int, value):
+        if col > len(self.values):
+            self.values.extend([''] * (col - len(self.values)))
+        self.values[col - 1] = _as_cell(value)
+
+    def is_blank(self) -> bool:
+        return not any(self.values)
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet: "FakeSpreadsheet", sheet_id: int, title: str, header: List[str]):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.title = title
+        self.rows: List[FakeRow] = [FakeRow(header)]
+
+    def _row(self, row: int) -> FakeRow:
+        while len(self.rows) < row:
+            self.rows.append(FakeRow())
+        return self.rows[row - 1]
+
+    def _used_rows(self) -> List[FakeRow]:
+        last = len(self.rows)
+        while last and self.rows[last - 1].is_blank():
+            last -= 1
+        return self.rows[:last]
+
+    # === READS ===
+    def get_all_values(self) -> List[List[str]]:
+        self.spreadsheet._call('values.get')
+        rows = self._used_rows()
+        width = max((len(row.values) for row in rows), default=0)
+        return [row.values + [''] * (width - len(row.values)) for row in rows]
+
+    def col_values(self, col: int) -> List[str]:
+        self.spreadsheet._call('values.get')
+        values = [row.get(col) for row in self._used_rows()]
+        while values and values[-1] == '':
+            values.pop()
+        return values
+
+    def row_values(self, row: int) -> List[str]:
+        self.spreadsheet._call('values.get')
+        if row > len(self.rows):
+            return []
+        values = list(self.rows[row - 1].values)
+        while values and values[-1] == '':
+            values.pop()
+        return values
+
+    def find(self, query: str, in_column: int = None) -> Optional[FakeCell]:
+        self.spreadsheet._call('values.get')
+        for row_number, row in enumerate(self.rows, start=1):
+            columns = [in_column] if in_column else range(1, len(row.values) + 1)
+            for col in columns:
+                if row.get(col) == query:
+                    return FakeCell(row_number, col, query)
+        return None  # gspread 6 behaviour
+
+    # === WRITES ===
+    def update_cell(self, row: int, col: int, value):
+        self.spreadsheet._call('values.update')
+        self._row(row).set(col, value)
+
+    def _write(self, range_name: str, values: List[list]):
+        _, start_row, start_col, _, _ = _parse_a1(range_name)
+        for row_offset, row_values in enumerate(values):
+            row = self._row(start_row + row_offset)
+            for col_offset, value in enumerate(row_values):
+                row.set(start_col + col_offset, value)
+
+    def update(self, range_name=None, values=None, value_input_option: str = None, **kwargs):
+        """update('A2', [[...]]) (gspread 5) or update([[...]], 'A2') (gspread 6)"""
+        if not isinstance(range_name, str):
+            range_name, values = values, range_name
+        self.spreadsheet._call('values.update')
+        self._write(range_name or 'A1', values)
+
+    def batch_update(self, data: List[dict], value_input_option: str = None, **kwargs):
+        self.spreadsheet._call('values.batchUpdate')
+        for entry in data:
+            self._write(entry['range'], entry['values'])
+
+    def delete_rows(self, start_index: int, end_index: int = None):
+        self.spreadsheet._call('batchUpdate')
+        del self.rows[start_index - 1:(end_index or start_index)]
+
+
+class FakeSpreadsheet:
+    """
+    Fake gspread Client + Spreadsheet. `latency` seconds are slept on every
+    call (gspread is blocking, so this blocks too); `calls` counts API calls
+    by kind (values.get, values.update, values.batchUpdate, batchUpdate,
+    metadata, drive).
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = Counter()
+        self.requests = Counter()  # batchUpdate requests by type
+        self.worksheets: Dict[str, FakeWorksheet] = {}
+        self.modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    @classmethod
+    def callsign_template(cls, latency: float = 0.0, strikes_values=("Clear", "Strike 1"),
+                          qualification_values=("No Additional Qualifications",)) -> "FakeSpreadsheet":
+        """A spreadsheet shaped like the live one: both sheets with header and dropdowns on row 2"""
+        spreadsheet = cls(latency)
+        non_command = spreadsheet.add_worksheet("Non-Command", NON_COMMAND_HEADER)
+        command = spreadsheet.add_worksheet("Command", COMMAND_HEADER)
+
+        def rule(values):
+            return {'condition': {'type': 'ONE_OF_LIST', 'values': [{'userEnteredValue': v} for v in values]},
+                    'showCustomUi': True}
+
+        non_command._row(2).validations.update({6: rule(strikes_values), 9: rule(qualification_values)})
+        command._row(2).validations.update({3: rule(qualification_values), 4: rule(strikes_values)})
+        return spreadsheet
+
+    def add_worksheet(self, title: str, header: List[str]) -> FakeWorksheet:
+        worksheet = FakeWorksheet(self, len(self.worksheets), title, header)
+        self.worksheets[title] = worksheet
+        return worksheet
+
+    def _call(self, kind: str):
+        self.calls[kind] += 1
+        if kind != 'values.get' and kind not in ('metadata', 'drive'):
+            self.modified += timedelta(seconds=1)
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.requests.clear()
+
+    # === gspread Client / Spreadsheet API ===
+    def open_by_key(self, key: str) -> "FakeSpreadsheet":
+        return self
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        return self.worksheets[title]
+
+    def get_lastUpdateTime(self) -> str:
+        self._call('drive')
+        return self.modified.isoformat()
+
+    def _sheet(self, sheet_id: int) -> FakeWorksheet:
+        return next(ws for ws in self.worksheets.values() if ws.id == sheet_id)
+
+    def fetch_sheet_metadata(self, params: dict = None) -> dict:
+        self._call('metadata')
+        params = params or {}
+        sheets = []
+        for a1 in params.get('ranges', []):
+            title, start_row, start_col, end_row, end_col = _parse_a1(a1)
+            worksheet = self.worksheets.get(title)
+            if worksheet is None:
+                continue
+            row_data = []
+            for row_number in range(start_row, end_row + 1):
+                row = worksheet._row(row_number)
+                values = []
+                for col in range(start_col, end_col + 1):
+                    cell = {}
+                    if col in row.validations:
+                        cell['dataValidation'] = row.validations[col]
+                    values.append(cell)
+                row_data.append({'values': values})
+            sheets.append({
+                'properties': {'title': title, 'sheetId': worksheet.id},
+                'data': [{'startRow': start_row - 1, 'startColumn': start_col - 1, 'rowData': row_data}]
+            })
+        return {'sheets': sheets}
+
+    def batch_update(self, body: dict) -> dict:
+        self._call('batchUpdate')
+        replies = []
+        for request in body.get('requests', []):
+            (kind, args), = request.items()
+            self.requests[kind] += 1
+            getattr(self, f'_request_{kind}')(args)
+            replies.append({})
+        return {'replies': replies}
+
+    # === batchUpdate request types ===
+    def _request_setDataValidation(self, args: dict):
+        grid = args['range']
+        worksheet = self._sheet(grid['sheetId'])
+        for row in range(grid['startRowIndex'] + 1, grid['endRowIndex'] + 1):
+            for col in range(grid['startColumnIndex'] + 1, grid['endColumnIndex'] + 1):
+                if args.get('rule'):
+                    worksheet._row(row).validations[col] = args['rule']
+                else:
+                    worksheet._row(row).validations.pop(col, None)
+
+    def _request_copyPaste(self, args: dict):
+        source, destination = args['source'], args['destination']
+        source_sheet = self._sheet(source['sheetId'])
+        target_sheet = self._sheet(destination['sheetId'])
+        source_rows = range(source['startRowIndex'] + 1, source['endRowIndex'] + 1)
+        source_cols = range(source['startColumnIndex'] + 1, source['endColumnIndex'] + 1)
+        for i, row in enumerate(range(destination['startRowIndex'] + 1, destination['endRowIndex'] + 1)):
+            for j, col in enumerate(range(destination['startColumnIndex'] + 1, destination['endColumnIndex'] + 1)):
+                src = source_sheet._row(source_rows[i % len(source_rows)])
+                src_col = source_cols[j % len(source_cols)]
+                if args.get('pasteType') in (None, 'PASTE_NORMAL', 'PASTE_VALUES'):
+                    target_sheet._row(row).set(col, src.get(src_col))
+                if args.get('pasteType') in (None, 'PASTE_NORMAL', 'PASTE_DATA_VALIDATION'):
+                    if src_col in src.validations:
+                        target_sheet._row(row).validations[col] = src.validations[src_col]
+
+    def _request_deleteDimension(self, args: dict):
+        grid = args['range']
+        if grid.get('dimension') != 'ROWS':
+            raise NotImplementedError("FakeSpreadsheet only deletes rows")
+        worksheet = self._sheet(grid['sheetId'])
+        del worksheet.rows[grid['startIndex']:grid['endIndex']]
+
+    def _request_sortRange(self, args: dict):
+        grid = args['range']
+        worksheet = self._sheet(grid['sheetId'])
+        start = grid.get('startRowIndex', 0)
+        end = grid.get('endRowIndex', len(worksheet.rows))
+        block = worksheet.rows[start:end]
+        # Stable sorts from the last key to the first give a multi-key sort
+        for spec in reversed(args['sortSpecs']):
+            col = spec['dimensionIndex'] + 1
+            descending = spec.get('sortOrder') == 'DESCENDING'
+            blanks = [row for row in block if row.get(col) == '']
+            filled = [row for row in block if row.get(col) != '']
+            filled.sort(key=lambda row: _sort_key(row.get(col)), reverse=descending)
+            block = filled + blanks
+        worksheet.rows[start:end] = block
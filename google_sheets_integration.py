@@ -6,6 +6,9 @@ import json
 import time
 import asyncio
 import pytz
+from metrics import metrics, timed
+
+SHEETS_CALL_SECONDS = metrics.histogram('sheets_call_seconds', 'Google Sheets operation latency', ['operation'])
 
 
 HHSTJ_RANK_MAP = {
@@ -62,6 +65,24 @@ COMMAND_RANK_PRIORITY = {
 # Google Sheets Configuration
 SPREADSHEET_ID = "1Qtb2xmrnDljsgL1wB-Yh2kPWZak7URjIfYueDKGCJ24"
 
+# Dropdown validations are replicated from this row
+TEMPLATE_ROW = 2
+
+# Dropdown columns per worksheet (Strikes and Qualifications)
+VALIDATION_COLUMNS = {
+    "Non-Command": (6, 9),  # F, I
+    "Command": (3, 4),  # C, D
+}
+
+# Server-side sort order per worksheet: (1-based column, order)
+SORT_SPECS = {
+    "Non-Command": [(8, 'ASCENDING'),  # H: Rank (1=SFF, 2=QFF, 3=RFF)
+                    (10, 'ASCENDING'),  # J: Sort Helper (number or 99999)
+                    (3, 'ASCENDING')],  # C: Callsign number (tiebreaker)
+    "Command": [(6, 'ASCENDING'),  # F: Rank Priority (1=NC, 2=DNC...)
+                (7, 'ASCENDING')],  # G: Sort Helper (number or 99999)
+}
+
 # Define scopes
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -92,7 +113,9 @@ class GoogleSheetsManager:
     def __init__(self):
         self.client = None
         self.spreadsheet = None
-        self._cached_validations = {}  # Cache for dropdown validations
+        self._cached_validations = {}  # (sheet title, column) -> template row DataValidationRule
+        self._validations_loaded = False
+        self._last_rows = {}  # sheet title -> last data row, kept in step with our own writes
 
     NZST = pytz.timezone('Pacific/Auckland')
 
@@ -135,18 +158,16 @@ class GoogleSheetsManager:
             return None
 
     def find_first_empty_row(self, worksheet) -> int:
-        """Find the first completely empty row in the worksheet"""
+        """
+        Find the row to write a new entry to. Syncs compact and sort the
+        sheets, so this is the row after the last known data row; it is
+        checked to be empty in case the sheet was edited by hand.
+        """
         try:
-            # Get all values
-            all_values = worksheet.get_all_values()
-
-            # Find first empty row
-            for i, row in enumerate(all_values, start=1):
-                if all(cell == '' for cell in row):
-                    return i
-
-            # If no empty row found, return next row after last
-            return len(all_values) + 1
+            row = self.get_last_row(worksheet) + 1
+            if any(worksheet.row_values(row)):
+                row = self.get_last_row(worksheet, refresh=True) + 1
+            return row
         except Exception as e:
             print(f"<:Denied:1426930694633816248> Error finding empty row: {e}")
             return 2  # Default to row 2 if error
@@ -170,101 +191,197 @@ class GoogleSheetsManager:
 
     def delete_row(self, worksheet, row_number: int):
         """Delete a specific row"""
+        self.delete_rows(worksheet, [row_number])
+
+    # === WORKSHEET MAINTENANCE ===
+    def get_last_row(self, worksheet, refresh: bool = False) -> int:
+        """Last data row of a worksheet (header = 1), read from column A only when not known"""
+        if refresh or worksheet.title not in self._last_rows:
+            self._last_rows[worksheet.title] = max(1, len(worksheet.col_values(1)))
+        return self._last_rows[worksheet.title]
+
+    def _shift_last_row(self, worksheet, delta: int):
+        if worksheet.title in self._last_rows:
+            self._last_rows[worksheet.title] = max(1, self._last_rows[worksheet.title] + delta)
+
+    @staticmethod
+    def _blank_rows(values: list) -> list:
+        """Completely empty rows between the header and the last data row (from get_all_values)"""
+        return [i for i, row in enumerate(values[1:], start=2) if not any(cell != '' for cell in row)]
+
+    def _delete_requests(self, worksheet, rows) -> list:
+        """deleteDimension requests for `rows`, one per run of consecutive rows, bottom-up"""
+        runs = []
+        for row in sorted(set(rows), reverse=True):
+            if runs and runs[-1][0] == row + 1:
+                runs[-1][0] = row
+            else:
+                runs.append([row, row])
+
+        return [{
+            "deleteDimension": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "dimension": "ROWS",
+                    "startIndex": start - 1,
+                    "endIndex": end
+                }
+            }
+        } for start, end in runs]
+
+    def _sort_request(self, worksheet, sort_specs: list) -> dict:
+        """sortRange request over the data rows; sort_specs are (1-based column, order) pairs"""
+        sort_range = {
+            'sheetId': worksheet.id,
+            'startRowIndex': 1,  # Skip header row
+        }
+        if worksheet.title in self._last_rows:
+            sort_range['endRowIndex'] = self._last_rows[worksheet.title]
+
+        return {
+            'sortRange': {
+                'range': sort_range,
+                'sortSpecs': [{'dimensionIndex': column - 1, 'sortOrder': order} for column, order in sort_specs]
+            }
+        }
+
+    @timed(SHEETS_CALL_SECONDS, operation='maintain_worksheets')
+    def run_structure_requests(self, requests: list) -> bool:
+        """Send validation / delete / sort requests as one batchUpdate (applied in order)"""
+        if not requests:
+            return True
         try:
-            worksheet.delete_rows(row_number)
-            print(f"<:Accepted:1426930333789585509> Deleted row {row_number} from {worksheet.title}")
+            self.spreadsheet.batch_update({"requests": requests})
+            return True
         except Exception as e:
-            print(f"<:Denied:1426930694633816248> Error deleting row: {e}")
+            print(f"<:Denied:1426930694633816248> Error updating sheet structure: {e}")
+            # Our row bookkeeping may no longer match the sheet
+            self._last_rows.clear()
+            return False
+
+    def delete_rows(self, worksheet, rows) -> bool:
+        """Delete rows (any order, gaps allowed) in a single request"""
+        rows = sorted(set(rows))
+        if not rows:
+            return True
+        if not self.run_structure_requests(self._delete_requests(worksheet, rows)):
+            return False
+        self._shift_last_row(worksheet, -len(rows))
+        print(f"<:Accepted:1426930333789585509> Deleted {len(rows)} row(s) from {worksheet.title}")
+        return True
 
     def get_existing_data_validation(self, worksheet, row: int, column: int):
         """
-        Get existing data validation rules from a cell to reuse them
+        Get the dropdown options of a column (from the cached template row rules)
         Returns the validation options as a list, or None if no validation exists
         """
-        try:
-            cache_key = f"{worksheet.title}_{column}"
-
-            # Return cached validation if available
-            if cache_key in self._cached_validations:
-                return self._cached_validations[cache_key]
-
-            worksheet_id = worksheet.id
-
-            # Get sheet metadata to find data validation rules
-            sheet_metadata = self.spreadsheet.fetch_sheet_metadata()
-
-            for sheet in sheet_metadata['sheets']:
-                if sheet['properties']['sheetId'] == worksheet_id:
-                    # Look for conditionalFormats or dataValidation in the sheet
-                    if 'conditionalFormats' in sheet:
-                        for rule in sheet['conditionalFormats']:
-                            if 'dataValidation' in rule:
-                                # Check if this rule applies to our column
-                                rule_range = rule.get('ranges', [{}])[0]
-                                rule_col = rule_range.get('startColumnIndex', -1)
-
-                                if rule_col == column - 1:  # Convert to 0-based
-                                    condition = rule['dataValidation'].get('condition', {})
-                                    if condition.get('type') == 'ONE_OF_LIST':
-                                        values = [v.get('userEnteredValue') for v in condition.get('values', [])]
-                                        self._cached_validations[cache_key] = values
-                                        return values
-
-            # If no validation found, try to get it from another row in the same column
-            # Look at row 2 (first data row after header)
-            try:
-                column_letter = self._column_to_letter(column)
-                cell_range = f"{column_letter}2"
-
-                # This is a workaround - we'll check if row 2 has validation
-                # If it does, we assume all rows in this column should have the same validation
-                print(f"ℹ️ No cached validation found for {worksheet.title} column {column}, checking row 2...")
-
-            except:
-                pass
+        if not self._validations_loaded:
+            self.load_template_validations()
 
+        rule = self._cached_validations.get((worksheet.title, column))
+        if not rule:
             return None
 
-        except Exception as e:
-            print(f"<:Warn:1437771973970104471> Could not get existing data validation: {e}")
+        condition = rule.get('condition', {})
+        if condition.get('type') != 'ONE_OF_LIST':
             return None
+        return [v.get('userEnteredValue') for v in condition.get('values', [])]
 
-    def copy_data_validation_to_cell(self, worksheet, source_row: int, target_row: int, column: int):
+    @timed(SHEETS_CALL_SECONDS, operation='load_template_validations')
+    def load_template_validations(self, template_row: int = TEMPLATE_ROW) -> dict:
         """
-        Copy data validation from one cell to another in the same column
-        This preserves existing dropdown configurations
+        Read the data validation rules of the template row of every worksheet in
+        VALIDATION_COLUMNS with one API call, caching them by (sheet title, column)
         """
         try:
-            worksheet_id = worksheet.id
-            column_letter = self._column_to_letter(column)
-
-            # Use copyPaste request to copy validation
-            copy_request = {
-                "copyPaste": {
-                    "source": {
-                        "sheetId": worksheet_id,
-                        "startRowIndex": source_row - 1,
-                        "endRowIndex": source_row,
-                        "startColumnIndex": column - 1,
-                        "endColumnIndex": column
-                    },
-                    "destination": {
-                        "sheetId": worksheet_id,
-                        "startRowIndex": target_row - 1,
-                        "endRowIndex": target_row,
-                        "startColumnIndex": column - 1,
-                        "endColumnIndex": column
-                    },
-                    "pasteType": "PASTE_DATA_VALIDATION"
+            ranges = [f"'{title}'!A{template_row}:{self._column_to_letter(max(columns))}{template_row}"
+                      for title, columns in VALIDATION_COLUMNS.items()]
+            metadata = self.spreadsheet.fetch_sheet_metadata(params={
+                'ranges': ranges,
+                'includeGridData': 'true',
+                'fields': 'sheets(properties(title),data(startColumn,rowData(values(dataValidation))))'
+            })
+
+            validations = {}
+            for sheet in metadata.get('sheets', []):
+                title = sheet['properties']['title']
+                for grid in sheet.get('data', []):
+                    start_column = grid.get('startColumn', 0)
+                    for row in grid.get('rowData', [])[:1]:
+                        for offset, cell in enumerate(row.get('values', [])):
+                            if cell.get('dataValidation'):
+                                validations[(title, start_column + offset + 1)] = cell['dataValidation']
+
+            self._cached_validations = validations
+            self._validations_loaded = True
+            print(f"<:Accepted:1426930333789585509> Loaded {len(validations)} template dropdown rules")
+
+        except Exception as e:
+            print(f"<:Warn:1437771973970104471> Could not load template validations: {e}")
+
+        return self._cached_validations
+
+    def _validation_requests(self, worksheet, rows, columns=None, template_row: int = TEMPLATE_ROW) -> list:
+        """
+        setDataValidation requests giving `rows` the template row's dropdowns,
+        one per column per run of consecutive rows. Columns without a cached
+        rule fall back to copying the validation from the template cell.
+        """
+        columns = columns or VALIDATION_COLUMNS.get(worksheet.title, ())
+        rows = sorted(set(rows) - {template_row})
+        if not rows or not columns:
+            return []
+
+        if not self._validations_loaded:
+            self.load_template_validations(template_row)
+
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+
+        requests = []
+        for column in columns:
+            rule = self._cached_validations.get((worksheet.title, column))
+            for start, end in runs:
+                target = {
+                    "sheetId": worksheet.id,
+                    "startRowIndex": start - 1,
+                    "endRowIndex": end,
+                    "startColumnIndex": column - 1,
+                    "endColumnIndex": column
                 }
-            }
+                if rule:
+                    requests.append({"setDataValidation": {"range": target, "rule": rule}})
+                else:
+                    requests.append({
+                        "copyPaste": {
+                            "source": {
+                                "sheetId": worksheet.id,
+                                "startRowIndex": template_row - 1,
+                                "endRowIndex": template_row,
+                                "startColumnIndex": column - 1,
+                                "endColumnIndex": column
+                            },
+                            "destination": target,
+                            "pasteType": "PASTE_DATA_VALIDATION"
+                        }
+                    })
+        return requests
 
-            self.spreadsheet.batch_update({"requests": [copy_request]})
-            print(f"<:Accepted:1426930333789585509> Copied validation to {column_letter}{target_row}")
+    @timed(SHEETS_CALL_SECONDS, operation='apply_validations')
+    def apply_validations(self, requests: list) -> bool:
+        """Send validation requests (from _validation_requests) as a single batchUpdate"""
+        if not requests:
+            return True
+        try:
+            self.spreadsheet.batch_update({"requests": requests})
+            print(f"<:Accepted:1426930333789585509> Applied {len(requests)} validation ranges in one request")
             return True
-
         except Exception as e:
-            print(f"<:Warn:1437771973970104471> Could not copy data validation: {e}")
+            print(f"<:Warn:1437771973970104471> Could not apply validations: {e}")
             return False
 
     def determine_rank_type(self, member_roles) -> tuple:
@@ -324,6 +441,7 @@ class GoogleSheetsManager:
         # Return comma-separated list
         return ", ".join(qualifications)
 
+    @timed(SHEETS_CALL_SECONDS, operation='add_callsign_to_sheets')
     async def add_callsign_to_sheets(self, member, callsign: str, fenz_prefix: str,
                                      roblox_username: str, discord_id: int):
         """
@@ -374,6 +492,7 @@ class GoogleSheetsManager:
                     print(f"ℹ️ Updating existing Non-Command row {empty_row}")
                 else:
                     empty_row = self.find_first_empty_row(target_sheet)
+                    self._last_rows[target_sheet.title] = max(empty_row, self._last_rows.get(target_sheet.title, 1))
                     print(f"ℹ️ Creating new Non-Command row {empty_row}")
 
                 rank_name, rank_prefix, rank_number = rank_data
@@ -395,12 +514,8 @@ class GoogleSheetsManager:
                 target_sheet.update_cell(empty_row, 8, rank_number)  # H: Rank number
                 target_sheet.update_cell(empty_row, 9, qualifications)  # I: Qualifications
 
-                # Copy data validation from row 2 (template row) to preserve existing dropdowns
-                # Column F: Strikes dropdown
-                self.copy_data_validation_to_cell(target_sheet, source_row=2, target_row=empty_row, column=6)
-
-                # Column I: Qualifications dropdown
-                self.copy_data_validation_to_cell(target_sheet, source_row=2, target_row=empty_row, column=9)
+                # Apply the template row's dropdowns (F: Strikes, I: Qualifications)
+                self.apply_validations(self._validation_requests(target_sheet, [empty_row]))
 
                 print(f"<:Accepted:1426930333789585509> Added Non-Command callsign {full_callsign} to row {empty_row}")
 
@@ -414,6 +529,7 @@ class GoogleSheetsManager:
                     print(f"ℹ️ Updating existing Command row {empty_row}")
                 else:
                     empty_row = self.find_first_empty_row(target_sheet)
+                    self._last_rows[target_sheet.title] = max(empty_row, self._last_rows.get(target_sheet.title, 1))
                     print(f"ℹ️ Creating new Command row {empty_row}")
 
                 rank_name, rank_prefix = rank_data
@@ -436,12 +552,8 @@ class GoogleSheetsManager:
                 target_sheet.update_cell(empty_row, 5, str(discord_id))  # E: Discord ID
                 target_sheet.update_cell(empty_row, 6, rank_priority)  # F: Rank priority
 
-                # Copy data validation from row 2 (template row) to preserve existing dropdowns
-                # Column D: Strikes dropdown
-                self.copy_data_validation_to_cell(target_sheet, source_row=2, target_row=empty_row, column=4)
-
-                # Column C: Qualifications dropdown
-                self.copy_data_validation_to_cell(target_sheet, source_row=2, target_row=empty_row, column=3)
+                # Apply the template row's dropdowns (C: Qualifications, D: Strikes)
+                self.apply_validations(self._validation_requests(target_sheet, [empty_row]))
 
                 print(f"<:Accepted:1426930333789585509> Added Command callsign {full_callsign} to row {empty_row}")
 
@@ -455,37 +567,15 @@ class GoogleSheetsManager:
 
     def sort_worksheet_multi(self, worksheet, sort_specs: list):
         """
-        Sort a worksheet by multiple columns
+        Sort a worksheet by multiple columns (server-side sortRange)
         sort_specs: List of dicts with 'column' (1-based) and 'order' ('ASCENDING' or 'DESCENDING')
         Example: [{'column': 8, 'order': 'ASCENDING'}, {'column': 3, 'order': 'ASCENDING'}]
         """
-        try:
-            worksheet_id = worksheet.id
-
-            # Build sort specs for API
-            api_sort_specs = []
-            for spec in sort_specs:
-                api_sort_specs.append({
-                    'dimensionIndex': spec['column'] - 1,  # Convert to 0-based
-                    'sortOrder': spec['order']
-                })
-
-            sort_request = {
-                'sortRange': {
-                    'range': {
-                        'sheetId': worksheet_id,
-                        'startRowIndex': 1,  # Skip header row
-                    },
-                    'sortSpecs': api_sort_specs
-                }
-            }
-
-            self.spreadsheet.batch_update({'requests': [sort_request]})
-            print(f"<:Accepted:1426930333789585509> Sorted {worksheet.title}")
-            return True
-        except Exception as e:
-            print(f"<:Denied:1426930694633816248> Error sorting worksheet: {e}")
+        specs = [(spec['column'], spec['order']) for spec in sort_specs]
+        if not self.run_structure_requests([self._sort_request(worksheet, specs)]):
             return False
+        print(f"<:Accepted:1426930333789585509> Sorted {worksheet.title}")
+        return True
 
     def detect_rank_mismatch(self, member_roles, current_fenz_prefix: str) -> tuple:
         """
@@ -507,6 +597,7 @@ class GoogleSheetsManager:
 
         return (has_mismatch, correct_prefix, rank_type)
 
+    @timed(SHEETS_CALL_SECONDS, operation='batch_update_callsigns')
     async def batch_update_callsigns(self, callsign_data: list):
         """
         Smart batch update with automatic role detection
@@ -525,6 +616,9 @@ class GoogleSheetsManager:
                 print("<:Denied:1426930694633816248> Could not access worksheets")
                 return False
 
+            # Dropdown rules are read once per sync from the template row
+            self.load_template_validations()
+
             # Get existing data from sheets
             print("📖 Reading existing sheet data...")
             existing_non_command = non_command_sheet.get_all_values()
@@ -681,14 +775,14 @@ class GoogleSheetsManager:
             print(f"➕ New: {len(nc_new)} NC, {len(cmd_new)} CMD")
             print(f"🗑️ Delete: {len(nc_deletes)} NC, {len(cmd_deletes)} CMD")
 
-            # Delete removed users
-            for discord_id in sorted(nc_deletes, key=lambda x: existing_nc_map[x]['row'], reverse=True):
-                non_command_sheet.delete_rows(existing_nc_map[discord_id]['row'])
-                await asyncio.sleep(0.3)
+            # Values are written against the rows as read; removed users and blank
+            # gap rows are deleted afterwards in the same request as the sort
+            nc_delete_rows = {existing_nc_map[discord_id]['row'] for discord_id in nc_deletes}
+            nc_delete_rows.update(self._blank_rows(existing_non_command))
+            cmd_delete_rows = {existing_cmd_map[discord_id]['row'] for discord_id in cmd_deletes}
+            cmd_delete_rows.update(self._blank_rows(existing_command))
 
-            for discord_id in sorted(cmd_deletes, key=lambda x: existing_cmd_map[x]['row'], reverse=True):
-                command_sheet.delete_rows(existing_cmd_map[discord_id]['row'])
-                await asyncio.sleep(0.3)
+            validation_requests = []
 
             # BATCH UPDATE EXISTING ROWS (Non-Command)
             if nc_updates:
@@ -707,9 +801,8 @@ class GoogleSheetsManager:
                     if i + chunk_size < len(batch_data):
                         await asyncio.sleep(1)
 
-                # <:Accepted:1426930333789585509> Copy validations to updated rows
-                updated_rows = [update['row'] for update in nc_updates]
-                self.batch_copy_validations(non_command_sheet, 2, updated_rows, [6, 9])
+                validation_requests += self._validation_requests(
+                    non_command_sheet, [update['row'] for update in nc_updates])
 
             # BATCH UPDATE EXISTING ROWS (Command)
             if cmd_updates:
@@ -728,44 +821,42 @@ class GoogleSheetsManager:
                     if i + chunk_size < len(batch_data):
                         await asyncio.sleep(1)
 
-                # <:Accepted:1426930333789585509> Copy validations to updated rows
-                updated_rows = [update['row'] for update in cmd_updates]
-                self.batch_copy_validations(command_sheet, 2, updated_rows, [3, 4])
+                validation_requests += self._validation_requests(
+                    command_sheet, [update['row'] for update in cmd_updates])
 
             # ADD NEW ROWS
             if nc_new:
                 start_row = len(existing_non_command) + 1
                 non_command_sheet.update(f'A{start_row}', nc_new, value_input_option='RAW')
-                for i in range(len(nc_new)):
-                    row_num = start_row + i
-                    self.copy_data_validation_to_cell(non_command_sheet, 2, row_num, 6)
-                    self.copy_data_validation_to_cell(non_command_sheet, 2, row_num, 9)
-                    await asyncio.sleep(0.2)
+                validation_requests += self._validation_requests(
+                    non_command_sheet, range(start_row, start_row + len(nc_new)))
 
             if cmd_new:
                 start_row = len(existing_command) + 1
                 command_sheet.update(f'A{start_row}', cmd_new, value_input_option='RAW')
-                for i in range(len(cmd_new)):
-                    row_num = start_row + i
-                    self.copy_data_validation_to_cell(command_sheet, 2, row_num, 3)
-                    self.copy_data_validation_to_cell(command_sheet, 2, row_num, 4)
-                    await asyncio.sleep(0.2)
-
-            # Sort both sheets
-            print("📊 Sorting sheets...")
-
-            # Non-Command: Sort by Rank → Sort Helper → Callsign
-            self.sort_worksheet_multi(non_command_sheet, [
-                {'column': 8, 'order': 'ASCENDING'},  # H: Rank (1=SFF, 2=QFF, 3=RFF)
-                {'column': 10, 'order': 'ASCENDING'},  # J: Sort Helper (number or 99999)
-                {'column': 3, 'order': 'ASCENDING'}  # C: Callsign number (tiebreaker)
-            ])
-
-            # Command: Sort by Rank Priority → Sort Helper
-            self.sort_worksheet_multi(command_sheet, [
-                {'column': 6, 'order': 'ASCENDING'},  # F: Rank Priority (1=NC, 2=DNC...)
-                {'column': 7, 'order': 'ASCENDING'}  # G: Sort Helper (number or 99999) ← NEW!
-            ])
+                validation_requests += self._validation_requests(
+                    command_sheet, range(start_row, start_row + len(cmd_new)))
+
+            # Row count after this sync, as the sort range end
+            self._last_rows[non_command_sheet.title] = max(
+                1, len(existing_non_command) + len(nc_new) - len(nc_delete_rows))
+            self._last_rows[command_sheet.title] = max(
+                1, len(existing_command) + len(cmd_new) - len(cmd_delete_rows))
+
+            # Dropdowns, deletions/compaction and the sort of both sheets in one batchUpdate.
+            # Requests apply in order: validations land on the rows as written, deletes
+            # run bottom-up so earlier indices stay valid, then each sheet is sorted.
+            structure_requests = list(validation_requests)
+            for sheet, changed, delete_rows in (
+                    (non_command_sheet, nc_updates or nc_new, nc_delete_rows),
+                    (command_sheet, cmd_updates or cmd_new, cmd_delete_rows)):
+                structure_requests += self._delete_requests(sheet, delete_rows)
+                if changed or delete_rows:
+                    structure_requests.append(self._sort_request(sheet, SORT_SPECS[sheet.title]))
+
+            if structure_requests:
+                print(f"📊 Compacting and sorting sheets ({len(structure_requests)} requests)...")
+                self.run_structure_requests(structure_requests)
 
             print(f"<:Accepted:1426930333789585509> Smart update complete!")
             return True
@@ -776,95 +867,7 @@ class GoogleSheetsManager:
             traceback.print_exc()
             return False
 
-    def batch_copy_validations(self, worksheet, source_row: int, target_rows: range, columns: list):
-        """
-        Copy data validations from source row to multiple target rows in a single batch request
-        This dramatically reduces API calls and avoids rate limits
-
-        Args:
-            worksheet: The worksheet to update
-            source_row: Row to copy validation from (usually row 2)
-            target_rows: Range of rows to copy to (e.g., range(2, 50))
-            columns: List of column numbers to copy validations for (e.g., [3, 4])
-        """
-        try:
-            worksheet_id = worksheet.id
-            requests = []
-
-            for column in columns:
-                for target_row in target_rows:
-                    # Skip if copying to itself
-                    if target_row == source_row:
-                        continue
-
-                    requests.append({
-                        "copyPaste": {
-                            "source": {
-                                "sheetId": worksheet_id,
-                                "startRowIndex": source_row - 1,
-                                "endRowIndex": source_row,
-                                "startColumnIndex": column - 1,
-                                "endColumnIndex": column
-                            },
-                            "destination": {
-                                "sheetId": worksheet_id,
-                                "startRowIndex": target_row - 1,
-                                "endRowIndex": target_row,
-                                "startColumnIndex": column - 1,
-                                "endColumnIndex": column
-                            },
-                            "pasteType": "PASTE_DATA_VALIDATION"
-                        }
-                    })
-
-            # Execute all requests in a single batch (limit to 100 requests per batch)
-            batch_size = 100
-            for i in range(0, len(requests), batch_size):
-                batch = requests[i:i + batch_size]
-                self.spreadsheet.batch_update({"requests": batch})
-                print(f"<:Accepted:1426930333789585509> Copied validations (batch {i // batch_size + 1}/{(len(requests) - 1) // batch_size + 1})")
-
-            return True
-
-        except Exception as e:
-            print(f"<:Warn:1437771973970104471> Could not batch copy data validation: {e}")
-            return False
-
-    def apply_validations_directly(self, worksheet, rows: range, column: int, validation_values: list):
-        """
-        Apply data validation rules directly to a range of cells
-        More efficient than copying cell-by-cell
-        """
-        try:
-            worksheet_id = worksheet.id
-
-            validation_rule = {
-                "setDataValidation": {
-                    "range": {
-                        "sheetId": worksheet_id,
-                        "startRowIndex": min(rows) - 1,
-                        "endRowIndex": max(rows),
-                        "startColumnIndex": column - 1,
-                        "endColumnIndex": column
-                    },
-                    "rule": {
-                        "condition": {
-                            "type": "ONE_OF_LIST",
-                            "values": [{"userEnteredValue": val} for val in validation_values]
-                        },
-                        "showCustomUi": True,
-                        "strict": True
-                    }
-                }
-            }
-
-            self.spreadsheet.batch_update({"requests": [validation_rule]})
-            return True
-
-        except Exception as e:
-            print(f"<:Warn:1437771973970104471> Could not apply validation: {e}")
-            return False
-
+    @timed(SHEETS_CALL_SECONDS, operation='get_all_callsigns')
     async def get_all_callsigns(self):
         """
         Get all existing callsigns from both sheets
@@ -912,6 +915,7 @@ class GoogleSheetsManager:
             print(f"<:Denied:1426930694633816248> Error getting callsigns: {e}")
             return []
 
+    @timed(SHEETS_CALL_SECONDS, operation='get_all_callsigns_from_sheets')
     async def get_all_callsigns_from_sheets(self):
         """
         Get all callsigns from both sheets (Non-Command and Command)
@@ -977,6 +981,26 @@ class GoogleSheetsManager:
             traceback.print_exc()
             return []
 
+    @timed(SHEETS_CALL_SECONDS, operation='get_revision')
+    async def get_revision(self):
+        """
+        Spreadsheet last-modified time from Drive, which changes on any edit.
+        Returns None if it can't be read.
+        """
+        try:
+            if not self.client:
+                auth_success = self.authenticate()
+                if not auth_success:
+                    return None
+
+            # gspread 6 exposes a method, gspread 5 a property
+            get_last_update = getattr(self.spreadsheet, 'get_lastUpdateTime', None)
+            return get_last_update() if get_last_update else self.spreadsheet.lastUpdateTime
+        except Exception as e:
+            print(f"<:Warn:1437771973970104471> Could not read spreadsheet revision: {e}")
+            return None
+
+    @timed(SHEETS_CALL_SECONDS, operation='remove_callsign_from_sheets')
     async def remove_callsign_from_sheets(self, discord_user_id: int):
         """
         Remove a callsign from Google Sheets by Discord user ID
@@ -1022,40 +1046,15 @@ class GoogleSheetsManager:
 
     def get_dropdown_values_from_template(self, worksheet, column, template_row=2):
         """Extract dropdown values from template row"""
-        try:
-            worksheet_id = worksheet.id
-            sheet_metadata = self.spreadsheet.fetch_sheet_metadata()
-
-            for sheet in sheet_metadata['sheets']:
-                if sheet['properties']['sheetId'] == worksheet_id:
-                    # Look for data validation rules
-                    if 'dataValidation' in sheet:
-                        for rule in sheet['dataValidation']:
-                            if rule['range']['startColumnIndex'] == column - 1:
-                                # Extract values
-                                return rule['condition']['values']
+        if not self._validations_loaded:
+            self.load_template_validations(template_row)
 
-            return None
-        except Exception as e:
-            print(f"⚠️ Could not read dropdown from template: {e}")
-            return None
+        rule = self._cached_validations.get((worksheet.title, column))
+        return rule['condition'].get('values') if rule and 'condition' in rule else None
 
     def ensure_dropdown_exists(self, worksheet, row, column, template_row=2):
-        """Copy dropdown from template, or create with template's values"""
-        try:
-            # Try copying (fastest)
-            self.copy_data_validation_to_cell(worksheet, template_row, row, column)
-            return True
-        except:
-            # Read values from template
-            values = self.get_dropdown_values_from_template(worksheet, column, template_row)
-
-            if not values:
-                # Ultimate fallback: use hardcoded defaults
-                values = self._get_default_dropdown_values(worksheet.title, column)
-
-            # Create dropdown with those values
-            return self.apply_validations_directly(worksheet, [row], column, values)
+        """Give a cell the template row's dropdown"""
+        return self.apply_validations(self._validation_requests(worksheet, [row], [column], template_row))
 
 # Create global instance
 sheets_manager = GoogleSheetsManager()
\ No newline at end of file
@@ -0,0 +1,194 @@
+import asyncio
+import os
+import re
+import threading
+from array import array
+from typing import Dict, List
+
+
+LOG_FILE = 'discord.log'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+READ_CHUNK_BYTES = 256 * 1024
+SCAN_BATCH_LINES = 512
+
+# JSON lines from structured_logging (ts/level/logger first), or the older
+# '%(asctime)s:%(levelname)s:%(name)s: %(message)s' text format in old backups
+LINE_PATTERN = re.compile(
+    rb'^(?:\{"ts": "[^"]*", "level": "([A-Z]+)", "logger": "([^"]+)"'
+    rb'|\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}:([A-Z]+):([^:\s]+): )'
+)
+LEVELS = ['', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+LEVEL_CODES = {name: code for code, name in enumerate(LEVELS)}
+
+
+class LogIndex:
+    """
+    Incremental line-offset index over a log file.
+
+    Only the bytes appended since the last refresh are scanned, recording the
+    offset, level and logger of every line (continuation lines such as
+    tracebacks in text-format logs inherit the record above them). Pages are
+    then read by seeking to the offsets, newest first, so a request never
+    loads the whole file.
+    Truncation or rotation (size shrinks / inode changes) resets the index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offsets = array('Q')
+        self.levels = bytearray()
+        self.logger_ids = array('H')
+        self.loggers: List[str] = []
+        self._logger_lookup: Dict[str, int] = {}
+        self.indexed_bytes = 0
+        self._inode = None
+        self._level = 0
+        self._logger_id = 0
+
+    # === INDEXING ===
+    def refresh(self) -> bool:
+        """Index whatever was appended since the last call; returns False if the file is missing"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._reset()
+                return False
+
+            if stat.st_ino != self._inode or stat.st_size < self.indexed_bytes:
+                self._reset()
+                self._inode = stat.st_ino
+
+            if stat.st_size == self.indexed_bytes:
+                return True
+
+            with open(self.path, 'rb') as f:
+                f.seek(self.indexed_bytes)
+                position = self.indexed_bytes
+                carry = b''
+                while True:
+                    chunk = f.read(READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    data = carry + chunk
+                    start = 0
+                    while True:
+                        newline = data.find(b'\n', start)
+                        if newline == -1:
+                            break
+                        self._add_line(position + start, data[start:newline])
+                        start = newline + 1
+                    position += start
+                    carry = data[start:]
+
+            # A trailing partial line is picked up once the writer finishes it
+            self.indexed_bytes = position
+            return True
+
+    def _add_line(self, offset: int, line: bytes):
+        match = LINE_PATTERN.match(line)
+        if match:
+            level, name = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+            self._level = LEVEL_CODES.get(level.decode(), 0)
+            name = name.decode('utf-8', 'replace')
+            logger_id = self._logger_lookup.get(name)
+            if logger_id is None:
+                logger_id = self._logger_lookup[name] = len(self.loggers)
+                self.loggers.append(name)
+            self._logger_id = logger_id + 1
+
+        self.offsets.append(offset)
+        self.levels.append(self._level)
+        self.logger_ids.append(self._logger_id)
+
+    # === READING ===
+    def _read_lines(self, f, indices: List[int]) -> List[str]:
+        lines = []
+        for index in indices:
+            f.seek(self.offsets[index])
+            end = self.offsets[index + 1] if index + 1 < len(self.offsets) else self.indexed_bytes
+            lines.append(f.read(end - self.offsets[index]).decode('utf-8', 'replace').rstrip('\r\n'))
+        return lines
+
+    def _logger_matches(self, logger_id: int, prefix: str) -> bool:
+        if not logger_id:
+            return False
+        name = self.loggers[logger_id - 1]
+        return name == prefix or name.startswith(prefix + '.')
+
+    def query(self, page: int = 1, size: int = 50, level: str = None, logger: str = None,
+              search: str = None) -> Dict:
+        """
+        Return one page of lines, newest first.
+
+        level is a minimum level name, logger matches a logger and its
+        children, search is a case-insensitive substring. Without filters the
+        page is read directly by offset; with filters the index narrows by
+        level/logger first and only candidate lines are read for the search.
+        """
+        if not self.refresh():
+            return {'lines': [], 'total': 0, 'has_more': False, 'missing': True}
+
+        page = max(1, page)
+        size = max(1, min(size, 1000))
+        min_level = LEVEL_CODES.get(level.upper(), 0) if level else 0
+        needle = search.lower() if search else None
+
+        with self._lock, open(self.path, 'rb') as f:
+            line_count = len(self.offsets)
+
+            if not (min_level or logger or needle):
+                end = max(0, line_count - (page - 1) * size)
+                start = max(0, end - size)
+                indices = list(range(end - 1, start - 1, -1))
+                return {'lines': self._read_lines(f, indices), 'total': line_count,
+                        'has_more': start > 0, 'missing': False}
+
+            skip = (page - 1) * size
+            matches: List[str] = []
+            index = line_count - 1
+            while index >= 0 and len(matches) <= size:
+                batch = []
+                while index >= 0 and len(batch) < SCAN_BATCH_LINES:
+                    if self.levels[index] >= min_level and (
+                            not logger or self._logger_matches(self.logger_ids[index], logger)):
+                        batch.append(index)
+                    index -= 1
+
+                lines = self._read_lines(f, batch) if needle else [None] * len(batch)
+                for line_index, line in zip(batch, lines):
+                    if needle and needle not in line.lower():
+                        continue
+                    if skip:
+                        skip -= 1
+                        continue
+                    if len(matches) > size:
+                        break
+                    matches.append(line if line is not None else self._read_lines(f, [line_index])[0])
+
+            has_more = len(matches) > size
+            return {'lines': matches[:size], 'total': None, 'has_more': has_more, 'missing': False}
+
+    async def query_async(self, **kwargs) -> Dict:
+        """query() off the event loop"""
+        return await asyncio.to_thread(self.query, **kwargs)
+
+
+_indexes: Dict[str, LogIndex] = {}
+
+
+def get_log_index(path: str = LOG_FILE) -> LogIndex:
+    """Shared index per log file so repeated requests only scan new bytes"""
+    if not os.path.exists(path):
+        _indexes.pop(path, None)
+        return LogIndex(path)  # Not cached; reports the file as missing
+    index = _indexes.get(path)
+    if index is None:
+        index = _indexes[path] = LogIndex(path)
+    return index
@@ -0,0 +1,156 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from metrics import metrics
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+LOOP_SAMPLE_INTERVAL_SECONDS = 0.5
+SLOW_CALLBACK_THRESHOLD_SECONDS = 0.25
+LAG_WINDOW_SAMPLES = 600  # ~5 minutes at the default interval
+MAX_STALL_REPORTS = 20
+
+LOOP_LAG_SECONDS = metrics.histogram(
+    'event_loop_lag_seconds', 'Event loop scheduling delay per sample',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+LOOP_LAG_CURRENT = metrics.gauge('event_loop_lag_current_seconds', 'Event loop lag (last sample / window max)',
+                                 ['stat'])
+LOOP_STALLS = metrics.counter('event_loop_stalls_total', 'Times the event loop was held past the slow threshold')
+
+
+class LoopMonitor:
+    """
+    Event-loop lag sampler and slow-callback reporter.
+
+    A coroutine on the loop sleeps for a fixed interval and records how late
+    it wakes up (the lag). A watchdog thread watches the sampler's heartbeat:
+    if the loop hasn't come back within the threshold, the thread grabs the
+    loop thread's stack and the task that is running, so the report names
+    the coroutine that held the loop rather than just the fact it stalled.
+    """
+
+    def __init__(self, interval: float = LOOP_SAMPLE_INTERVAL_SECONDS,
+                 threshold: float = SLOW_CALLBACK_THRESHOLD_SECONDS):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = deque(maxlen=LAG_WINDOW_SAMPLES)
+        self.stalls = deque(maxlen=MAX_STALL_REPORTS)
+        self.stall_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._pending: Optional[Dict] = None  # Stall captured by the watchdog, not yet measured
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # === LIFECYCLE ===
+    def start(self):
+        """Start sampling the running loop (call from inside the loop)"""
+        if self._task and not self._task.done():
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._sample())
+
+        self._watchdog = threading.Thread(target=self._watch, name='loop-monitor', daemon=True)
+        self._watchdog.start()
+        logger.info(f"✅ Loop monitor started (interval {self.interval}s, slow threshold {self.threshold}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    # === SAMPLING ===
+    async def _sample(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+
+            with self._lock:
+                self._heartbeat = now
+                pending, self._pending = self._pending, None
+
+            self.samples.append(lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            LOOP_LAG_CURRENT.set(lag, stat='last')
+            LOOP_LAG_CURRENT.set(max(self.samples), stat='max')
+
+            if lag >= self.threshold:
+                self.stall_count += 1
+                LOOP_STALLS.inc()
+                report = pending or {'task': None, 'stack': None}
+                report['duration'] = lag
+                report['at'] = datetime.utcnow()
+                self.stalls.append(report)
+                logger.warning(f"⚠️ Event loop blocked for {lag * 1000:.0f}ms"
+                               f"{' in ' + report['task'] if report.get('task') else ''}")
+
+    def _watch(self):
+        """Watchdog thread: capture what the loop thread is doing while it is stuck"""
+        poll = max(self.threshold / 2, 0.05)
+        while not self._stop.wait(poll):
+            with self._lock:
+                stuck_for = time.monotonic() - self._heartbeat - self.interval
+                if stuck_for < self.threshold or self._pending is not None:
+                    continue
+                self._pending = self._capture()
+
+    def _capture(self) -> Dict:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = ''.join(traceback.format_stack(frame, limit=15)) if frame else None
+
+        task_name = None
+        try:
+            task = asyncio.current_task(self._loop)
+            if task is not None:
+                coro = task.get_coro()
+                task_name = f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+        except Exception:
+            pass
+
+        return {'task': task_name, 'stack': stack}
+
+    # === REPORTING ===
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict:
+        return {
+            'running': bool(self._task and not self._task.done()),
+            'last': self.samples[-1] if self.samples else 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': max(self.samples) if self.samples else 0.0,
+            'stalls': self.stall_count,
+            'threshold': self.threshold,
+            'last_stall': self.stalls[-1] if self.stalls else None,
+        }
+
+    def recent_stalls(self) -> List[Dict]:
+        return list(self.stalls)
+
+
+# === GLOBAL LOOP MONITOR INSTANCE ===
+loop_monitor = LoopMonitor()
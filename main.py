@@ -1,3 +1,9 @@
+import ast
+import asyncio
+import hashlib
+import importlib
+import sys
+import json
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
@@ -8,34 +14,56 @@ import traceback
 from aiohttp import web
 from datetime import datetime
 from pathlib import Path
+import time
 import wavelink
 
 load_dotenv()
 token = os.getenv('DISCORD_TOKEN')
 
 from database import db, ensure_database_connected
+from scheduler import scheduler
+from metrics import metrics
+from loop_monitor import loop_monitor
+from log_reader import LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, get_log_index
+from structured_logging import setup_logging, shutdown_logging
+from bloxlink_limiter import bloxlink_limiter
 
 # ========================================
 # LOGGING CONFIGURATION - CLEANED UP
 # ========================================
-logging.basicConfig(
-    level=logging.INFO,  # Changed from DEBUG to INFO
-    format='%(asctime)s:%(levelname)s:%(name)s: %(message)s',
-    handlers=[
-        logging.FileHandler('discord.log', encoding='utf-8', mode='w'),
-        logging.StreamHandler()
-    ]
-)
+# Records are queued and written to disk/console by a listener thread, off the event loop
+setup_logging(LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, level=logging.INFO)
 
 # Reduce noise from libraries
 logging.getLogger('discord').setLevel(logging.ERROR)
-logging.getLogger('discord.http').setLevel(logging.ERROR)
 logging.getLogger('discord.gateway').setLevel(logging.INFO)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 logging.getLogger('asyncio').setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+# ========================================
+# METRICS
+# ========================================
+DISCORD_RATE_LIMITS = metrics.counter('discord_rate_limits_total', 'Discord REST 429 responses', ['scope'])
+EVENT_HANDLER_SECONDS = metrics.histogram('discord_event_handler_seconds', 'Event/listener handler latency',
+                                          ['event', 'handler'])
+
+
+class RateLimitCounter(logging.Filter):
+    """Count discord.http rate-limit warnings while keeping the logger at ERROR"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage().lower()
+        if 'rate limit' in message:
+            DISCORD_RATE_LIMITS.inc(scope='global' if 'global' in message else 'route')
+        return record.levelno >= logging.ERROR
+
+
+# discord.http has to emit WARNING for us to see 429s; the filter drops them again
+logging.getLogger('discord.http').setLevel(logging.WARNING)
+logging.getLogger('discord.http').addFilter(RateLimitCounter())
+
 
 # ========================================
 # UTILITY FUNCTIONS
@@ -91,6 +119,25 @@ GUILD_COGS = {
 }
 
 GLOBAL_COGS = ['logging_bot']
+
+# What a cog has to wait for before it is loaded. '@database' waits for the
+# initial database connection attempt; any other name is a cog that must be
+# loaded first. Cogs without an entry load as soon as their imports are ready.
+COG_DEPENDENCIES = {
+    '!mod': ['@database'],
+    'callsign': ['@database'],
+    'erlc': ['@database'],
+    'joinvc': ['@database'],
+    'moderation': ['@database'],
+    'music': ['@database'],
+    'pings': ['@database'],
+    'role_watcher': ['@database'],
+    'shift': ['@database'],
+    'status': ['@database'],
+    'topic': ['@database'],
+    'watches': ['@database'],
+    'x': ['@database'],
+}
 OWNER_ID = 678475709257089057
 STATUS_CHANNEL_ID = 1429492069289693184
 DEVELOPMENT_MODE = True
@@ -104,32 +151,73 @@ async def health_check(request):
     """Health check endpoint"""
     db_status = "connected" if db.pool else "disconnected"
     bot_status = "online" if client.is_ready() else "starting"
+    loop_stats = loop_monitor.summary()
 
     return web.Response(
-        text=f"Bot Status: {bot_status}\nDatabase: {db_status}\nTimestamp: {datetime.utcnow().isoformat()}",
+        text=f"Bot Status: {bot_status}\nDatabase: {db_status}\n"
+             f"Event Loop Lag: {loop_stats['last'] * 1000:.1f}ms (p99 {loop_stats['p99'] * 1000:.1f}ms, "
+             f"stalls {loop_stats['stalls']})\n"
+             f"Timestamp: {datetime.utcnow().isoformat()}",
         content_type="text/plain"
     )
 
 
+async def loop_view(request):
+    """Event loop lag summary and recent slow-callback reports with stack samples"""
+    stats = loop_monitor.summary()
+    lines = [
+        f"Sampler: {'running' if stats['running'] else 'stopped'}",
+        f"Lag: last {stats['last'] * 1000:.1f}ms | p50 {stats['p50'] * 1000:.1f}ms | "
+        f"p99 {stats['p99'] * 1000:.1f}ms | max {stats['max'] * 1000:.1f}ms",
+        f"Stalls over {stats['threshold'] * 1000:.0f}ms: {stats['stalls']}",
+        '',
+    ]
+
+    for stall in reversed(loop_monitor.recent_stalls()):
+        lines.append(f"[{stall['at'].isoformat()}] blocked {stall['duration'] * 1000:.0f}ms"
+                     f" in {stall['task'] or 'unknown task'}")
+        lines.append(stall['stack'] or '  (no stack sample - stall ended before the watchdog fired)')
+        lines.append('')
+
+    return web.Response(text='\n'.join(lines), content_type='text/plain')
+
+
 async def log_view(request):
-    """View bot logs via web"""
-    page = int(request.query.get('page', 1))
-    size = int(request.query.get('size', 50))
-    log_path = 'discord.log'
+    """
+    View bot logs via web, newest first.
 
-    if not os.path.exists(log_path):
+    Query params: page, size, level (minimum), logger (name or parent),
+    q (case-insensitive search), file (0 = current, 1+ = rotated backups).
+    """
+    try:
+        page = int(request.query.get('page', 1))
+        size = int(request.query.get('size', 50))
+        backup = int(request.query.get('file', 0))
+    except ValueError:
+        return web.Response(text="page, size and file must be integers.", status=400)
+    if not 0 <= backup <= LOG_BACKUP_COUNT:
+        return web.Response(text=f"file must be between 0 and {LOG_BACKUP_COUNT}.", status=400)
+
+    log_path = LOG_FILE if backup == 0 else f'{LOG_FILE}.{backup}'
+    result = await get_log_index(log_path).query_async(
+        page=page, size=size,
+        level=request.query.get('level'),
+        logger=request.query.get('logger'),
+        search=request.query.get('q')
+    )
+
+    if result['missing']:
         return web.Response(text="Log file not found.", status=404)
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    total = f" of {result['total']} lines" if result['total'] is not None else ''
+    header = f"# {log_path} page {page}{total}{' (more available)' if result['has_more'] else ''}\n"
+    return web.Response(text=header + '\n'.join(result['lines']), content_type='text/plain')
 
-    total_lines = len(lines)
-    start = (page - 1) * size
-    end = start + size
-    page_lines = lines[start:end]
-    content = ''.join(page_lines)
 
-    return web.Response(text=content, content_type='text/plain')
+async def metrics_view(request):
+    """Prometheus-style metrics scrape endpoint"""
+    return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8',
+                        headers={'X-Content-Type-Options': 'nosniff'})
 
 
 async def start_web_server():
@@ -138,6 +226,8 @@ async def start_web_server():
     app.router.add_get('/', health_check)
     app.router.add_get('/health', health_check)
     app.router.add_get('/logs', log_view)
+    app.router.add_get('/metrics', metrics_view)
+    app.router.add_get('/health/loop', loop_view)
 
     runner = web.AppRunner(app)
     await runner.setup()
@@ -182,10 +272,86 @@ class Client(commands.Bot):
         self.loaded_cogs = []
         self.failed_cogs = []
         self.guild_cog_map = {}
+        self.cog_timings = {}
+        self.startup_started = time.perf_counter()
         self.db = db
 
-    async def load_all_cogs(self):
-        """Automatically load all cogs from the cogs folder"""
+    @staticmethod
+    def _prefetch_cog_imports(path: Path) -> float:
+        """Import a cog's top-level dependencies (runs in a worker thread)"""
+        started = time.perf_counter()
+        tree = ast.parse(path.read_text(encoding='utf-8'))
+        modules = set()
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules.add(node.module)
+
+        for module in modules:
+            if module in sys.modules or module.split('.')[0] == 'cogs':
+                continue
+            try:
+                importlib.import_module(module)
+            except Exception:
+                pass  # load_extension reports the real error
+        return time.perf_counter() - started
+
+    async def _load_cog(self, cog_name: str, resources: dict, loaded_events: dict):
+        """Prefetch imports, wait for dependencies, then load one cog"""
+        timing = self.cog_timings[cog_name] = {
+            'start': time.perf_counter() - self.startup_started,
+            'import': 0.0, 'wait': 0.0, 'setup': 0.0, 'status': 'loading'
+        }
+
+        try:
+            timing['import'] = await asyncio.to_thread(self._prefetch_cog_imports, Path('cogs') / f'{cog_name}.py')
+
+            wait_started = time.perf_counter()
+            for dependency in COG_DEPENDENCIES.get(cog_name, []):
+                if dependency.startswith('@'):
+                    if dependency in resources:
+                        # Cogs handle a failed resource themselves; only the ordering matters here
+                        await asyncio.wait({resources[dependency]})
+                elif dependency in loaded_events:
+                    await loaded_events[dependency].wait()
+                    if dependency not in self.loaded_cogs:
+                        raise RuntimeError(f'dependency {dependency} failed to load')
+            timing['wait'] = time.perf_counter() - wait_started
+
+            setup_started = time.perf_counter()
+            await self.load_extension(f'cogs.{cog_name}')
+            timing['setup'] = time.perf_counter() - setup_started
+            timing['status'] = 'loaded'
+            self.loaded_cogs.append(cog_name)
+
+            # Map cog to guilds
+            for guild_id in GUILD_IDS:
+                if guild_id in GUILD_COGS:
+                    if cog_name in GUILD_COGS[guild_id] or cog_name in GLOBAL_COGS:
+                        if cog_name not in self.guild_cog_map:
+                            self.guild_cog_map[cog_name] = []
+                        self.guild_cog_map[cog_name].append(guild_id)
+
+            logger.info(f"Loaded cog: {cog_name} (import {timing['import'] * 1000:.0f}ms, "
+                        f"wait {timing['wait'] * 1000:.0f}ms, setup {timing['setup'] * 1000:.0f}ms)")
+        except Exception as e:
+            timing['status'] = 'failed'
+            self.failed_cogs.append(cog_name)
+            logger.error(f'Failed to load {cog_name}: {e}')
+            traceback.print_exc()
+        finally:
+            timing['end'] = time.perf_counter() - self.startup_started
+            loaded_events[cog_name].set()
+
+    async def load_all_cogs(self, resources: dict = None):
+        """
+        Load all configured cogs from the cogs folder concurrently.
+
+        Each cog's imports are prefetched in a worker thread, then it waits
+        for its COG_DEPENDENCIES (cogs or '@' resources such as the database
+        connection task) before setup runs. Timings land in self.cog_timings.
+        """
         cogs_folder = Path('cogs')
 
         if not cogs_folder.exists():
@@ -201,31 +367,24 @@ class Client(commands.Bot):
             if guild_id in GUILD_COGS:
                 cogs_to_load.update(GUILD_COGS[guild_id])
 
-        # Load each cog
+        selected = []
         for cog_name in cog_files:
             if cogs_to_load and cog_name not in cogs_to_load:
                 logger.debug(f'Skipping {cog_name} (not configured)')
                 continue
+            selected.append(cog_name)
 
-            try:
-                await self.load_extension(f'cogs.{cog_name}')
-                self.loaded_cogs.append(cog_name)
-
-                # Map cog to guilds
-                for guild_id in GUILD_IDS:
-                    if guild_id in GUILD_COGS:
-                        if cog_name in GUILD_COGS[guild_id] or cog_name in GLOBAL_COGS:
-                            if cog_name not in self.guild_cog_map:
-                                self.guild_cog_map[cog_name] = []
-                            self.guild_cog_map[cog_name].append(guild_id)
+        for cog_name in selected:
+            for dependency in COG_DEPENDENCIES.get(cog_name, []):
+                if not dependency.startswith('@') and dependency not in selected:
+                    logger.warning(f'{cog_name} depends on {dependency}, which is not being loaded')
 
-                logger.info(f'Loaded cog: {cog_name}')
-            except Exception as e:
-                self.failed_cogs.append(cog_name)
-                logger.error(f'Failed to load {cog_name}: {e}')
-                traceback.print_exc()
+        loaded_events = {cog_name: asyncio.Event() for cog_name in selected}
+        started = time.perf_counter()
+        await asyncio.gather(*(self._load_cog(cog_name, resources or {}, loaded_events) for cog_name in selected))
 
-        logger.info(f'Cog loading complete: {len(self.loaded_cogs)} loaded, {len(self.failed_cogs)} failed')
+        logger.info(f'Cog loading complete: {len(self.loaded_cogs)} loaded, {len(self.failed_cogs)} failed '
+                    f'in {time.perf_counter() - started:.2f}s')
 
     async def reload_all_cogs(self):
         """Reload all loaded cogs"""
@@ -244,6 +403,18 @@ class Client(commands.Bot):
         if failed_reload:
             logger.warning(f'Failed to reload: {", ".join(failed_reload)}')
 
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        # Time every on_* handler and cog listener
+        start = time.perf_counter()
+        try:
+            await super()._run_event(coro, event_name, *args, **kwargs)
+        finally:
+            EVENT_HANDLER_SECONDS.observe(
+                time.perf_counter() - start,
+                event=event_name,
+                handler=getattr(coro, '__qualname__', 'unknown')
+            )
+
     def is_cog_enabled_for_guild(self, cog_name: str, guild_id: int) -> bool:
         """Check if a cog is enabled for a specific guild"""
         if cog_name in GLOBAL_COGS:
@@ -255,21 +426,26 @@ class Client(commands.Bot):
     async def setup_hook(self):
         """Setup hook - runs before bot connects to Discord"""
         try:
-            # 1. Connect to database
+            # 1. Connect to database (database-backed cogs wait for this)
             logger.info('Connecting to database...')
-            connected = await ensure_database_connected()
-            if not connected:
-                logger.warning('Database connection failed! Bot may not work correctly.')
+            database_task = asyncio.create_task(ensure_database_connected())
 
-            # 2. Start web server
+            # 2. Start the event loop lag monitor and web server
+            loop_monitor.start()
             logger.info('Starting web server...')
             await start_web_server()
 
-            # 3. Load all cogs
+            # 3. Start the shared job scheduler (jobs run once the bot is ready)
+            scheduler.start(self)
+
+            # 4. Load all cogs
             logger.info('Loading cogs...')
-            await self.load_all_cogs()
+            await self.load_all_cogs(resources={'@database': database_task})
+
+            if not await database_task:
+                logger.warning('Database connection failed! Bot may not work correctly.')
 
-            # 4. Sync commands
+            # 5. Sync commands
             logger.info('Syncing commands...')
             await self.sync_commands()
 
@@ -277,8 +453,35 @@ class Client(commands.Bot):
             logger.error(f'Error in setup_hook: {e}')
             traceback.print_exc()
 
-    async def sync_commands(self):
-        """Sync commands to Discord"""
+    def command_payload_hash(self, guild: discord.abc.Snowflake) -> str:
+        """Stable hash of the command payload Discord would receive for a guild"""
+        payload = [command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)]
+        payload.sort(key=lambda command: (command.get('type', 1), command['name']))
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    async def sync_guild_commands(self, guild_id: int, payload_hash: str) -> int:
+        """Sync one guild and record the payload hash it now has"""
+        synced = await self.tree.sync(guild=discord.Object(id=guild_id))
+
+        guild_cogs = GUILD_COGS.get(guild_id, [])
+        cog_info = f" [{len(guild_cogs)} cogs]" if guild_cogs else " [no cogs]"
+        logger.info(f'Guild {guild_id}: {len(synced)} commands{cog_info}')
+        if len(synced) == 0 and guild_cogs:
+            logger.warning(f'Guild {guild_id} has {len(guild_cogs)} cogs but 0 commands!')
+
+        if db.pool:
+            try:
+                await db.set_command_hash(guild_id, payload_hash)
+            except Exception as e:
+                logger.warning(f'Could not save command sync state for guild {guild_id}: {e}')
+        return len(synced)
+
+    async def sync_commands(self, force: bool = False) -> dict:
+        """
+        Sync commands to every guild whose command payload changed since the
+        last sync (all guilds when force is set). Returns a status per guild.
+        """
         try:
             if AGGRESSIVE_SYNC:
                 logger.warning('AGGRESSIVE SYNC MODE - Clearing all commands')
@@ -298,28 +501,50 @@ class Client(commands.Bot):
                 # Reload cogs to re-register commands
                 await self.reload_all_cogs()
 
-            # Sync to each guild
+                force = True
+
+            # Copy global commands to each guild (local only, no REST calls)
+            payload_hashes = {}
             for guild_id in GUILD_IDS:
                 guild = discord.Object(id=guild_id)
-
-                # Copy global commands to guild
                 self.tree.copy_global_to(guild=guild)
+                payload_hashes[guild_id] = self.command_payload_hash(guild)
 
-                # Sync
-                synced = await self.tree.sync(guild=guild)
-
-                # Get cog info for this guild
-                guild_cogs = GUILD_COGS.get(guild_id, [])
-                cog_info = f" [{len(guild_cogs)} cogs]" if guild_cogs else " [no cogs]"
-
-                logger.info(f'Guild {guild_id}: {len(synced)} commands{cog_info}')
+            stored_hashes = {}
+            if not force and db.pool:
+                try:
+                    stored_hashes = await db.get_command_hashes()
+                except Exception as e:
+                    logger.warning(f'Could not load command sync state, syncing all guilds: {e}')
+
+            to_sync = [guild_id for guild_id in GUILD_IDS
+                       if force or stored_hashes.get(guild_id) != payload_hashes[guild_id]]
+            skipped = len(GUILD_IDS) - len(to_sync)
+
+            results = await asyncio.gather(
+                *(self.sync_guild_commands(guild_id, payload_hashes[guild_id]) for guild_id in to_sync),
+                return_exceptions=True
+            )
+
+            summary = {}
+            failed = 0
+            for guild_id, result in zip(to_sync, results):
+                if isinstance(result, Exception):
+                    failed += 1
+                    summary[guild_id] = f'failed ({result})'
+                    logger.error(f'Guild {guild_id}: command sync failed: {result}')
+                else:
+                    summary[guild_id] = f'{result} commands'
+            for guild_id in GUILD_IDS:
+                summary.setdefault(guild_id, 'unchanged')
 
-                if len(synced) == 0 and guild_cogs:
-                    logger.warning(f'Guild {guild_id} has {len(guild_cogs)} cogs but 0 commands!')
+            logger.info(f'Command sync: {len(to_sync) - failed} synced, {skipped} unchanged, {failed} failed')
+            return summary
 
         except Exception as e:
             logger.error(f'Command sync failed: {e}')
             traceback.print_exc()
+            return {}
 
     async def update_status_channel(self, status: str):
         """Update the status channel name"""
@@ -372,8 +597,12 @@ class Client(commands.Bot):
         if not DEVELOPMENT_MODE:
             await self.update_status_channel('offline')
 
+        await scheduler.stop()
+        loop_monitor.stop()
+        await bloxlink_limiter.checkpoint()
         await db.close()
         await super().close()
+        shutdown_logging()
 
 
 # ========================================
@@ -399,11 +628,10 @@ async def force_sync(ctx):
     await ctx.send("🔄 Force syncing commands...")
 
     try:
-        sync_results = []
-        for guild_id in GUILD_IDS:
-            guild = discord.Object(id=guild_id)
-            synced = await client.tree.sync(guild=guild)
-            sync_results.append(f"{guild_id}: {len(synced)} commands")
+        summary = await client.sync_commands(force=True)
+        if not summary:
+            raise RuntimeError("see logs for details")
+        sync_results = [f"{guild_id}: {status}" for guild_id, status in summary.items()]
 
         result_text = "\n".join(sync_results)
         await ctx.send(f"<:Accepted:1426930333789585509> Synced commands:\n```{result_text}```")
@@ -422,6 +650,48 @@ async def list_cogs(ctx):
     embed = discord.Embed(title="Loaded Cogs", color=discord.Color.blue())
     embed.add_field(name="<:Accepted:1426930333789585509> Loaded", value=loaded, inline=False)
     embed.add_field(name="<:Denied:1426930694633816248> Failed", value=failed, inline=False)
+
+    # Startup timeline: offset from process start, then import / dependency wait / setup
+    if client.cog_timings:
+        timeline = sorted(client.cog_timings.items(), key=lambda item: item[1]['start'])
+        lines = [f"{'cog':<14}{'start':>7}{'import':>8}{'wait':>7}{'setup':>7}"]
+        for cog_name, timing in timeline:
+            marker = '' if timing['status'] == 'loaded' else ' ✗'
+            lines.append(f"{cog_name[:13]:<14}{timing['start']:>6.2f}s{timing['import'] * 1000:>6.0f}ms"
+                         f"{timing['wait'] * 1000:>5.0f}ms{timing['setup'] * 1000:>5.0f}ms{marker}")
+        slowest = max(client.cog_timings.items(), key=lambda item: item[1].get('end', 0))
+        lines.append(f"All cogs ready at {slowest[1].get('end', 0):.2f}s (last: {slowest[0]})")
+
+        text = "\n".join(lines)
+        if len(text) > 1000:
+            text = text[:1000].rsplit("\n", 1)[0] + "\n..."
+        embed.add_field(name="⏱️ Startup Timeline", value=f"```{text}```", inline=False)
+
+    await ctx.send(embed=embed)
+
+
+@client.command(name='jobs')
+@commands.is_owner()
+async def list_jobs(ctx):
+    """Show scheduled job timings (owner only)"""
+    stats = scheduler.get_stats()
+    if not stats:
+        await ctx.send("No scheduled jobs registered.")
+        return
+
+    lines = []
+    for name, entry in sorted(stats.items()):
+        next_run = entry.get('next_run_at')
+        next_text = f"<t:{int(next_run.timestamp())}:R>" if next_run else "n/a"
+        status = " (running)" if entry.get('running') else ""
+        lines.append(
+            f"**{name}**{status} • next {next_text}\n"
+            f"runs {entry.get('runs', 0)} • failures {entry.get('failures', 0)} • "
+            f"last {entry.get('last_duration', 0):.2f}s • lag {entry.get('last_lag', 0):.2f}s "
+            f"(max {entry.get('max_lag', 0):.2f}s)"
+        )
+
+    embed = discord.Embed(title="Scheduled Jobs", description="\n".join(lines)[:4096], color=discord.Color.blue())
     await ctx.send(embed=embed)
 
 
@@ -449,7 +719,7 @@ async def debug_sync(ctx):
 if __name__ == "__main__":
     try:
         logger.info("Starting bot...")
-        client.run(token)
+        client.run(token, log_handler=None)  # discord.* records go through the queued root handler
     except Exception as e:
         logger.critical(f'Fatal error: {e}')
         traceback.print_exc()
\ No newline at end of file
@@ -0,0 +1,170 @@
+import asyncio
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+import discord
+
+
+MEMBER_EDIT_DEBOUNCE_SECONDS = 0.75
+
+# Sentinel for "leave the nickname alone" (None means reset it in discord.py)
+UNSET = object()
+
+NickUpdate = Union[str, None, Callable[[str], Optional[str]]]
+
+
+class PendingEdit:
+    """Edits queued for one member until the debounce window closes"""
+
+    def __init__(self, member: discord.Member):
+        self.member = member
+        self.nick = UNSET
+        self.add_roles = set()
+        self.remove_roles = set()
+        self.reasons = []
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+
+    def merge(self, nick, add_roles: Iterable[int], remove_roles: Iterable[int], reason: Optional[str]):
+        # Later requests win: adding a role cancels an earlier removal and vice versa
+        for role_id in add_roles:
+            self.remove_roles.discard(role_id)
+            self.add_roles.add(role_id)
+        for role_id in remove_roles:
+            self.add_roles.discard(role_id)
+            self.remove_roles.add(role_id)
+        if nick is not UNSET:
+            self.nick = self._chain_nick(self.nick, nick)
+        if reason and reason not in self.reasons:
+            self.reasons.append(reason)
+
+    @staticmethod
+    def _chain_nick(previous, nick):
+        """A nickname function applies on top of whatever nickname is already queued"""
+        if not callable(nick) or previous is UNSET or previous is None:
+            return nick
+
+        if callable(previous):
+            def chained(current):
+                base = previous(current)
+                base = current if base is None else base
+                result = nick(base)
+                return base if result is None else result
+            return chained
+
+        result = nick(previous)
+        return previous if result is None else result
+
+
+class MemberEditCoalescer:
+    """
+    Coalesces nickname and role changes for a member into one member.edit call.
+
+    Callers queue the *changes* they want (roles to add/remove, a nickname or a
+    function of the current nickname). Everything queued for the same member
+    inside the debounce window is merged and applied with a single REST
+    request against the member-edit bucket; a pause/resume toggled inside the
+    window nets out to no request at all.
+    """
+
+    def __init__(self, debounce: float = MEMBER_EDIT_DEBOUNCE_SECONDS):
+        self.debounce = debounce
+        self._pending: Dict[Tuple[int, int], PendingEdit] = {}
+        self.stats = {'queued': 0, 'requests': 0, 'skipped': 0}
+
+    async def apply(self, member: discord.Member, *, nick: NickUpdate = UNSET,
+                    add_roles: Iterable[int] = (), remove_roles: Iterable[int] = (),
+                    reason: str = None, debounce: float = None) -> bool:
+        """
+        Queue edits for a member and wait until they are applied.
+
+        nick may be a string, None (reset) or a callable taking the member's
+        current nickname and returning the new one (or None to leave it).
+        Returns True if Discord accepted the edit (or nothing needed changing).
+        Raises the discord exception if the edit failed.
+        """
+        key = (member.guild.id, member.id)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = PendingEdit(member)
+            self._pending[key] = pending
+            delay = self.debounce if debounce is None else debounce
+            pending.task = asyncio.create_task(self._flush_later(key, pending, delay))
+
+        pending.member = member
+        pending.merge(nick, add_roles, remove_roles, reason)
+        self.stats['queued'] += 1
+
+        return await asyncio.shield(pending.future)
+
+    async def _flush_later(self, key: Tuple[int, int], pending: PendingEdit, delay: float):
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            # New requests after this point start a fresh window
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+
+        try:
+            result = await self._apply(pending)
+        except Exception as e:
+            if not pending.future.done():
+                pending.future.set_exception(e)
+            # Mark retrieved so unawaited failures don't warn at shutdown
+            pending.future.exception()
+        else:
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    @staticmethod
+    def _resolve_changes(pending: PendingEdit) -> dict:
+        member = pending.member
+        changes = {}
+
+        if pending.nick is not UNSET:
+            new_nick = pending.nick
+            if callable(new_nick):
+                current = member.nick or member.name
+                new_nick = new_nick(current)
+                if new_nick is None:
+                    new_nick = member.nick
+            if new_nick != member.nick:
+                changes['nick'] = new_nick
+
+        if pending.add_roles or pending.remove_roles:
+            current_ids = [role.id for role in member.roles if not role.is_default()]
+            final_ids = [role_id for role_id in current_ids if role_id not in pending.remove_roles]
+            final_ids += [role_id for role_id in pending.add_roles if role_id not in current_ids]
+
+            if set(final_ids) != set(current_ids):
+                roles = [member.guild.get_role(role_id) for role_id in final_ids]
+                changes['roles'] = [role for role in roles if role is not None]
+
+        return changes
+
+    async def _apply(self, pending: PendingEdit) -> bool:
+        changes = self._resolve_changes(pending)
+        if not changes:
+            self.stats['skipped'] += 1
+            return True
+
+        reason = '; '.join(pending.reasons) or None
+        member = pending.member
+
+        try:
+            self.stats['requests'] += 1
+            await member.edit(reason=reason, **changes)
+            return True
+        except discord.HTTPException:
+            # A nickname we can't set (hierarchy, length) must not block the role change
+            if len(changes) < 2:
+                raise
+
+        self.stats['requests'] += 1
+        await member.edit(reason=reason, roles=changes['roles'])
+        self.stats['requests'] += 1
+        await member.edit(reason=reason, nick=changes['nick'])
+        return True
+
+
+member_edits = MemberEditCoalescer()
@@ -0,0 +1,491 @@
+import asyncio
+import heapq
+import json
+import os
+import random
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from database import db, ensure_database_connected
+from metrics import metrics
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+JOB_RUN_SECONDS = metrics.histogram('job_run_seconds', 'Scheduled job run time', ['job'])
+JOB_LAG_SECONDS = metrics.histogram('job_lag_seconds', 'Scheduled job start delay past its due time', ['job'])
+JOB_RUNS = metrics.counter('job_runs_total', 'Scheduled job runs by outcome', ['job', 'outcome'])
+
+
+JOB_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS scheduled_jobs
+    (
+        name             TEXT PRIMARY KEY,
+        handler          TEXT,
+        next_run_at      TIMESTAMPTZ NOT NULL,
+        payload          JSONB,
+        locked_by        TEXT,
+        locked_until     TIMESTAMPTZ,
+        last_started_at  TIMESTAMPTZ,
+        last_finished_at TIMESTAMPTZ,
+        last_duration_ms DOUBLE PRECISION,
+        last_lag_ms      DOUBLE PRECISION,
+        last_error       TEXT,
+        run_count        INTEGER DEFAULT 0
+    )
+'''
+
+JOB_INDEX_SQL = '''
+    CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_next_run
+    ON scheduled_jobs (next_run_at)
+'''
+
+# Retry delay when the database is unavailable or a run fails to claim
+RETRY_DELAY_SECONDS = 30
+# Runs later or longer than this get a console warning
+SLOW_JOB_WARN_SECONDS = 5
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Job:
+    """A registered unit of timed work"""
+
+    def __init__(self, name: str, handler: Callable[..., Awaitable[Any]], *,
+                 interval: Optional[float] = None,
+                 next_run: Optional[Callable[[datetime], datetime]] = None,
+                 jitter: float = 0, lock_timeout: float = 600,
+                 max_lag: Optional[float] = None, durable: bool = True,
+                 run_immediately: bool = True, payload: Any = None,
+                 one_off: bool = False, handler_key: Optional[str] = None):
+        self.name = name
+        self.handler = handler
+        self.interval = interval
+        self.next_run = next_run
+        self.jitter = jitter
+        self.lock_timeout = lock_timeout
+        self.max_lag = max_lag
+        self.durable = durable
+        self.run_immediately = run_immediately
+        self.payload = payload
+        self.one_off = one_off
+        self.handler_key = handler_key
+        self.due_at: Optional[datetime] = None
+
+    def compute_next(self, after: datetime) -> datetime:
+        """Next due time after a run (or at registration) including jitter"""
+        if self.next_run:
+            due = self.next_run(after)
+        else:
+            due = after + timedelta(seconds=self.interval or 0)
+
+        if self.jitter:
+            due += timedelta(seconds=random.uniform(0, self.jitter))
+        return due
+
+    @property
+    def metric_label(self) -> str:
+        """One-off names are per user/shift, so their metrics are grouped by handler"""
+        if self.one_off and self.handler_key:
+            return self.handler_key
+        return self.name
+
+
+class JobScheduler:
+    """
+    Durable, single-flight job scheduler shared by all cogs.
+
+    Jobs live in the scheduled_jobs table keyed by name. Each run is claimed
+    with an atomic UPDATE so two bot processes never run the same job at the
+    same time, and next_run_at survives restarts so overdue jobs catch up once
+    on startup. Non-durable jobs (per-process work such as presence updates)
+    are kept in memory only.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self.handlers: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._heap = []  # (due_timestamp, sequence, name)
+        self._sequence = 0
+        self._running: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._table_ready = False
+        self._bot = None
+
+    # === LIFECYCLE ===
+    def start(self, bot=None):
+        """Start the dispatcher (waits for the bot to be ready before running jobs)"""
+        self._bot = bot
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        for task in list(self._running.values()):
+            task.cancel()
+        self._running.clear()
+        self._task = None
+
+    async def _ensure_table(self) -> bool:
+        if self._table_ready:
+            return True
+        if not await ensure_database_connected():
+            return False
+
+        async with db.pool.acquire() as conn:
+            await conn.execute(JOB_TABLE_SQL)
+            await conn.execute(JOB_INDEX_SQL)
+
+        self._table_ready = True
+        return True
+
+    # === REGISTRATION ===
+    async def register(self, name: str, handler: Callable[[], Awaitable[Any]], **options) -> Job:
+        """
+        Register (or replace) a recurring job.
+
+        Options: interval (seconds) or next_run(now) -> datetime, jitter (seconds),
+        lock_timeout, max_lag (skip runs later than this), durable, run_immediately.
+        """
+        job = Job(name, handler, **options)
+        self.jobs[name] = job
+
+        if job.durable and await self._ensure_table():
+            first_due = utcnow() if job.run_immediately else job.compute_next(utcnow())
+            async with db.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    '''INSERT INTO scheduled_jobs (name, next_run_at)
+                       VALUES ($1, $2) ON CONFLICT (name) DO
+                    UPDATE SET name = EXCLUDED.name
+                    RETURNING next_run_at''',
+                    name, first_due
+                )
+            job.due_at = row['next_run_at']
+        else:
+            job.due_at = utcnow() if job.run_immediately else job.compute_next(utcnow())
+
+        self._push(job)
+        return job
+
+    def unregister(self, name: str):
+        """Stop dispatching a job in this process (its DB row is kept)"""
+        self.jobs.pop(name, None)
+        task = self._running.pop(name, None)
+        if task:
+            task.cancel()
+        self._wake()
+
+    async def register_handler(self, handler_key: str, handler: Callable[[Any], Awaitable[Any]]):
+        """Register a handler for one-off jobs and re-arm any that were pending before a restart"""
+        self.handlers[handler_key] = handler
+
+        if not await self._ensure_table():
+            return
+
+        async with db.pool.acquire() as conn:
+            rows = await conn.fetch(
+                'SELECT name, next_run_at, payload FROM scheduled_jobs WHERE handler = $1',
+                handler_key
+            )
+
+        for row in rows:
+            job = Job(row['name'], handler, one_off=True, handler_key=handler_key,
+                      payload=json.loads(row['payload']) if row['payload'] else None)
+            job.due_at = row['next_run_at']
+            self.jobs[job.name] = job
+            self._push(job)
+
+    def unregister_handler(self, handler_key: str):
+        self.handlers.pop(handler_key, None)
+        for name in [n for n, j in self.jobs.items() if j.handler_key == handler_key]:
+            self.unregister(name)
+
+    async def schedule_once(self, name: str, handler_key: str, run_at: datetime, payload: Any = None):
+        """Create or push back a durable one-off job (debounce by reusing the name)"""
+        handler = self.handlers.get(handler_key)
+        if handler is None:
+            raise KeyError(f"No handler registered for {handler_key}")
+
+        if run_at.tzinfo is None:
+            run_at = run_at.replace(tzinfo=timezone.utc)
+
+        if await self._ensure_table():
+            async with db.pool.acquire() as conn:
+                await conn.execute(
+                    '''INSERT INTO scheduled_jobs (name, handler, next_run_at, payload)
+                       VALUES ($1, $2, $3, $4::jsonb) ON CONFLICT (name) DO
+                    UPDATE SET handler = EXCLUDED.handler,
+                        next_run_at = EXCLUDED.next_run_at,
+                        payload = EXCLUDED.payload,
+                        locked_by = NULL,
+                        locked_until = NULL''',
+                    name, handler_key, run_at, json.dumps(payload)
+                )
+
+        job = Job(name, handler, one_off=True, handler_key=handler_key, payload=payload)
+        job.due_at = run_at
+        self.jobs[name] = job
+        self._push(job)
+
+    async def get_payload(self, name: str) -> Any:
+        """Current payload of a pending one-off job, if any"""
+        job = self.jobs.get(name)
+        if job:
+            return job.payload
+        return None
+
+    async def cancel_once(self, name: str):
+        """Drop a pending one-off job"""
+        self.unregister(name)
+        if await self._ensure_table():
+            async with db.pool.acquire() as conn:
+                await conn.execute('DELETE FROM scheduled_jobs WHERE name = $1', name)
+
+    def reschedule(self, name: str, interval: float):
+        """Change a recurring job's interval; takes effect from the next run"""
+        job = self.jobs.get(name)
+        if job:
+            job.interval = interval
+
+    # === DISPATCH ===
+    def _push(self, job: Job):
+        self._sequence += 1
+        heapq.heappush(self._heap, (job.due_at.timestamp(), self._sequence, job.name))
+        self._wake()
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _pop_due(self, now_ts: float):
+        """Pop every job that is due, discarding stale heap entries"""
+        due = []
+        while self._heap:
+            due_ts, _, name = self._heap[0]
+            job = self.jobs.get(name)
+            if job is None or job.due_at is None or job.due_at.timestamp() != due_ts:
+                heapq.heappop(self._heap)
+                continue
+            if due_ts > now_ts:
+                break
+            heapq.heappop(self._heap)
+            due.append(job)
+        return due
+
+    async def _run(self):
+        self._wakeup = asyncio.Event()
+        if self._bot is not None:
+            await self._bot.wait_until_ready()
+
+        while True:
+            self._wakeup.clear()
+            now_ts = time.time()
+
+            for job in self._pop_due(now_ts):
+                if job.name in self._running:
+                    # Still running - try again shortly after it finishes
+                    job.due_at = utcnow() + timedelta(seconds=1)
+                    self._push(job)
+                    continue
+                self._running[job.name] = asyncio.create_task(self._execute(job))
+
+            delay = (self._heap[0][0] - now_ts) if self._heap else None
+            try:
+                if delay is None:
+                    await self._wakeup.wait()
+                elif delay > 0:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self, job: Job) -> Optional[datetime]:
+        """Atomically take the run lock; returns the due time that was claimed"""
+        if not job.durable:
+            return job.due_at
+
+        if not await self._ensure_table():
+            job.due_at = utcnow() + timedelta(seconds=RETRY_DELAY_SECONDS)
+            self._push(job)
+            return None
+
+        async with db.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''UPDATE scheduled_jobs
+                   SET locked_by       = $2,
+                       locked_until    = NOW() + make_interval(secs => $3),
+                       last_started_at = NOW()
+                   WHERE name = $1
+                     AND next_run_at <= NOW()
+                     AND (locked_until IS NULL OR locked_until < NOW())
+                   RETURNING next_run_at''',
+                job.name, self.owner_id, float(job.lock_timeout)
+            )
+            if row:
+                return row['next_run_at']
+
+            # Someone else ran it (or holds the lock) - follow the stored due time
+            current = await conn.fetchrow(
+                'SELECT next_run_at, locked_until FROM scheduled_jobs WHERE name = $1',
+                job.name
+            )
+
+            if current is None and not job.one_off:
+                # Registered while the database was down - create the row and run now
+                await conn.execute(
+                    '''INSERT INTO scheduled_jobs (name, next_run_at)
+                       VALUES ($1, NOW()) ON CONFLICT (name) DO NOTHING''',
+                    job.name
+                )
+                job.due_at = utcnow()
+                self._push(job)
+                return None
+
+        if current is None:
+            # One-off job was cancelled or already run elsewhere
+            self.jobs.pop(job.name, None)
+            return None
+
+        follow = current['next_run_at']
+        if current['locked_until'] and current['locked_until'] > follow:
+            follow = current['locked_until']
+        job.due_at = max(follow, utcnow() + timedelta(seconds=1))
+        self._push(job)
+        return None
+
+    async def _execute(self, job: Job):
+        try:
+            try:
+                claimed_due = await self._claim(job)
+            except Exception as e:
+                logger.warning(f"⚠️ Scheduler could not claim {job.name}: {e}")
+                job.due_at = utcnow() + timedelta(seconds=RETRY_DELAY_SECONDS)
+                self._push(job)
+                return
+
+            if claimed_due is None:
+                return
+
+            started = utcnow()
+            lag = max(0.0, (started - claimed_due).total_seconds())
+            error = None
+            skipped = job.max_lag is not None and lag > job.max_lag
+
+            perf_start = time.perf_counter()
+            if skipped:
+                logger.warning(f"⏭️ Skipping {job.name}: {lag:.0f}s late (max {job.max_lag:.0f}s)")
+            else:
+                try:
+                    if job.one_off:
+                        await job.handler(job.payload)
+                    else:
+                        await job.handler()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    logger.exception(f"❌ Job {job.name} failed: {error}")
+            duration = time.perf_counter() - perf_start
+
+            self._record(job, duration, lag, error, skipped)
+            if not skipped and (lag > SLOW_JOB_WARN_SECONDS or duration > SLOW_JOB_WARN_SECONDS * 12):
+                logger.warning(f"🐢 Job {job.name}: ran {lag:.1f}s late, took {duration:.1f}s")
+
+            await self._finish(job, started, duration, lag, error)
+
+        finally:
+            self._running.pop(job.name, None)
+            self._wake()
+
+    async def _finish(self, job: Job, started: datetime, duration: float, lag: float, error: Optional[str]):
+        """Release the lock and store the next due time"""
+        if job.one_off:
+            if self.jobs.get(job.name) is job:
+                self.jobs.pop(job.name, None)
+            if job.durable and self._table_ready:
+                # Only delete if nobody pushed the job back while it was running
+                async with db.pool.acquire() as conn:
+                    await conn.execute(
+                        'DELETE FROM scheduled_jobs WHERE name = $1 AND locked_by = $2',
+                        job.name, self.owner_id
+                    )
+            return
+
+        if self.jobs.get(job.name) is not job:
+            return  # Unregistered or replaced while running
+
+        job.due_at = job.compute_next(utcnow())
+
+        if job.durable and self._table_ready:
+            try:
+                async with db.pool.acquire() as conn:
+                    await conn.execute(
+                        '''UPDATE scheduled_jobs
+                           SET next_run_at      = $2,
+                               locked_by        = NULL,
+                               locked_until     = NULL,
+                               last_finished_at = NOW(),
+                               last_duration_ms = $3,
+                               last_lag_ms      = $4,
+                               last_error       = $5,
+                               run_count        = COALESCE(run_count, 0) + 1
+                           WHERE name = $1''',
+                        job.name, job.due_at, duration * 1000, lag * 1000, error
+                    )
+            except Exception as e:
+                logger.warning(f"⚠️ Scheduler could not store next run for {job.name}: {e}")
+
+        self._push(job)
+
+    def _record(self, job: Job, duration: float, lag: float, error: Optional[str], skipped: bool):
+        label = job.metric_label
+        if skipped:
+            JOB_RUNS.inc(job=label, outcome='skipped')
+        else:
+            JOB_RUN_SECONDS.observe(duration, job=label)
+            JOB_LAG_SECONDS.observe(max(lag, 0.0), job=label)
+            JOB_RUNS.inc(job=label, outcome='error' if error else 'ok')
+
+        if job.one_off:
+            return  # One-off jobs leave !jobs once they run; per-name stats would only pile up
+
+        stats = self.stats.setdefault(job.name, {
+            'runs': 0, 'failures': 0, 'skipped': 0,
+            'last_duration': 0.0, 'max_duration': 0.0,
+            'last_lag': 0.0, 'max_lag': 0.0,
+            'last_error': None, 'last_run': None
+        })
+        if skipped:
+            stats['skipped'] += 1
+            return
+
+        stats['runs'] += 1
+        stats['last_duration'] = duration
+        stats['max_duration'] = max(stats['max_duration'], duration)
+        stats['last_lag'] = lag
+        stats['max_lag'] = max(stats['max_lag'], lag)
+        stats['last_run'] = utcnow()
+        if error:
+            stats['failures'] += 1
+            stats['last_error'] = error
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-job run statistics for this process, with the next due time"""
+        result = {}
+        for name, job in self.jobs.items():
+            entry = dict(self.stats.get(name, {}))
+            entry['next_run_at'] = job.due_at
+            entry['running'] = name in self._running
+            result[name] = entry
+        return result
+
+
+# === GLOBAL SCHEDULER INSTANCE ===
+scheduler = JobScheduler()
@@ -0,0 +1,189 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from metrics import metrics
+
+
+CONSOLE_FORMAT = '%(asctime)s:%(levelname)s:%(name)s: %(message)s'
+
+# Fraction of INFO/DEBUG records kept for high-volume loggers (prefix match).
+# WARNING and above are never sampled.
+LOG_SAMPLING: Dict[str, float] = {
+    'cogs.autopublish.queue': 0.1,
+    'cogs.callsign.progress': 0.1,
+}
+
+CONTEXT_FIELDS = ('cog', 'guild', 'user', 'latency_ms')
+
+LOG_RECORDS = metrics.counter('log_records_total', 'Log records emitted', ['level'])
+LOG_SAMPLED_OUT = metrics.counter('log_records_sampled_out_total', 'Log records dropped by sampling', ['logger'])
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ts/level/logger always come first (log_reader relies on it)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.utcfromtimestamp(record.created).isoformat(timespec='milliseconds') + 'Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """The familiar console format with any context fields appended"""
+
+    def __init__(self):
+        super().__init__(CONSOLE_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        context = [f'{field}={getattr(record, field)}' for field in CONTEXT_FIELDS[1:]
+                   if getattr(record, field, None) is not None]
+        if context:
+            first_line, _, rest = text.partition('\n')
+            text = f"{first_line} [{' '.join(context)}]" + (f'\n{rest}' if rest else '')
+        return text
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in N low-level records for loggers listed in LOG_SAMPLING"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> Optional[float]:
+        for prefix, rate in self.rates.items():
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        LOG_RECORDS.inc(level=record.levelname)
+        if record.levelno >= logging.WARNING:
+            return True
+
+        rate = self._rate_for(record.name)
+        if rate is None or rate >= 1:
+            return True
+
+        every = max(1, round(1 / rate)) if rate > 0 else 0
+        with self._lock:
+            count = self._counts.get(record.name, 0)
+            self._counts[record.name] = count + 1
+        if every and count % every == 0:
+            return True
+
+        LOG_SAMPLED_OUT.inc(logger=record.name)
+        return False
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread without flattening tracebacks into the message"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class ContextLogger(logging.LoggerAdapter):
+    """
+    Logger adapter accepting guild=, user= and latency= keyword arguments.
+
+    Discord objects are reduced to their IDs and latency (seconds) is stored
+    as latency_ms, so every record carries the same structured fields.
+    """
+
+    def process(self, msg, kwargs):
+        extra = dict(self.extra)
+        for field in ('guild', 'user'):
+            value = kwargs.pop(field, None)
+            if value is not None:
+                extra[field] = getattr(value, 'id', value)
+        latency = kwargs.pop('latency', None)
+        if latency is not None:
+            extra['latency_ms'] = round(latency * 1000, 1)
+        extra.update(kwargs.pop('extra', None) or {})
+        kwargs['extra'] = extra
+        return msg, kwargs
+
+    def child(self, suffix: str) -> 'ContextLogger':
+        """Sub-logger for a high-volume event stream (see LOG_SAMPLING)"""
+        return ContextLogger(self.logger.getChild(suffix), self.extra)
+
+
+def get_logger(name: str) -> ContextLogger:
+    """Logger for a module; records from cogs.<name> carry cog=<name>"""
+    extra = {}
+    if name.startswith('cogs.'):
+        extra['cog'] = name.split('.', 1)[1]
+    return ContextLogger(logging.getLogger(name), extra)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(log_file: str, max_bytes: int, backup_count: int,
+                  level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue so file and console writes happen on a
+    listener thread instead of the event loop. Returns the started listener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    file_handler = logging.handlers.RotatingFileHandler(log_file, encoding='utf-8', maxBytes=max_bytes,
+                                                        backupCount=backup_count)
+    file_handler.setFormatter(JsonFormatter())
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ConsoleFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(LOG_SAMPLING))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
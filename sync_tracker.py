@@ -0,0 +1,95 @@
+import time
+from typing import Dict, Optional, Set
+
+from metrics import metrics
+from structured_logging import get_logger
+
+logger = get_logger(__name__)
+
+FULL_SYNC_INTERVAL_SECONDS = 6 * 3600
+
+SYNC_DIRTY_MEMBERS = metrics.gauge('callsign_sync_dirty_members', 'Members waiting for the next callsign sync pass')
+SYNC_PASSES = metrics.counter('callsign_sync_passes_total', 'Callsign auto-sync passes by mode', ['mode'])
+
+
+class SyncTracker:
+    """
+    Dirty-member tracking for the callsign auto-sync.
+
+    Callsign writes and member events mark Discord IDs dirty; each hourly
+    pass takes the dirty set and reconciles only those members. A full
+    reconcile runs on the first pass, on a slower cadence, when the
+    spreadsheet revision changes (someone edited it by hand) or when
+    explicitly requested (e.g. after a failed pass). The rows the last sheet
+    write produced are kept so a dirty-only pass can skip Sheets entirely
+    when none of its members' rows changed.
+    """
+
+    def __init__(self, full_interval: float = FULL_SYNC_INTERVAL_SECONDS):
+        self.full_interval = full_interval
+        self._dirty: Set[int] = set()
+        self._full_requested = False
+        self.last_full: Optional[float] = None  # Monotonic
+        self.sheet_revision: Optional[str] = None
+        self._sheet_rows: Dict[int, tuple] = {}  # Discord ID -> row as last written to the sheet
+
+    # === MARKING ===
+    def mark(self, *user_ids: int):
+        self._dirty.update(user_ids)
+        SYNC_DIRTY_MEMBERS.set(len(self._dirty))
+
+    def request_full(self, reason: str):
+        if not self._full_requested:
+            logger.info(f"🔄 Full callsign sync requested: {reason}")
+        self._full_requested = True
+
+    # === PASSES ===
+    def full_reason(self, sheet_revision: Optional[str] = None) -> Optional[str]:
+        """Why the next pass must be a full reconcile, or None if a dirty-only pass will do"""
+        if self.last_full is None:
+            return 'first pass since startup'
+        if self._full_requested:
+            return 'requested'
+        if sheet_revision is not None and sheet_revision != self.sheet_revision:
+            return 'spreadsheet edited'
+        if time.monotonic() - self.last_full >= self.full_interval:
+            return 'scheduled'
+        return None
+
+    def take(self) -> Set[int]:
+        """Hand the dirty set to a pass (mark() them again if the pass fails)"""
+        dirty, self._dirty = self._dirty, set()
+        SYNC_DIRTY_MEMBERS.set(0)
+        return dirty
+
+    def full_done(self):
+        self.last_full = time.monotonic()
+        self._full_requested = False
+
+    def sheet_written(self, sheet_revision: Optional[str]):
+        """Record the revision our own write produced so it isn't mistaken for a manual edit"""
+        if sheet_revision is not None:
+            self.sheet_revision = sheet_revision
+
+    def sheet_rows_changed(self, rows: Dict[int, Optional[tuple]]) -> bool:
+        """Whether any of these rows (None = not on the sheet) differ from the last sheet write"""
+        return any(self._sheet_rows.get(user_id) != row for user_id, row in rows.items())
+
+    def sheet_rows_written(self, rows: Optional[Dict[int, tuple]]):
+        """Remember the rows a sheet write produced (None forgets them, e.g. after a failed write)"""
+        self._sheet_rows = dict(rows or {})
+
+    def record_pass(self, mode: str):
+        SYNC_PASSES.inc(mode=mode)
+
+    def stats(self) -> dict:
+        return {
+            'dirty': len(self._dirty),
+            'full_requested': self._full_requested,
+            'seconds_since_full': None if self.last_full is None else round(time.monotonic() - self.last_full),
+            'sheet_revision': self.sheet_revision,
+        }
+
+
+# === GLOBAL SYNC TRACKER INSTANCE ===
+sync_tracker = SyncTracker()